@@ -0,0 +1,144 @@
+"""pytest-benchmark suite for the LME calendar engine in `date_calc_funcs`,
+each benchmark computes its dates as of midday on every day of 2023 through
+2025 against the non-prompts and holidays of the date calculation tests.
+
+Needs `pytest-benchmark`, `testpaths` keeps files here out of the main test
+run, compare against the stored baseline from the repository root with:
+    python -m pytest benchmarks --no-cov \
+        --benchmark-compare=benchmarks/baselines/date_calc_funcs.json \
+        --benchmark-compare-fail=mean:25%
+
+and after an intended change re-save the baseline with:
+    python -m pytest benchmarks --no-cov \
+        --benchmark-json=benchmarks/baselines/date_calc_funcs.json
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+import pytest
+from zoneinfo import ZoneInfo
+
+from prep.lme import batch_date_calc_funcs, date_calc_funcs
+from tests.lme.test_lme_date_calculation_functions import (
+    LME_2023_THROUGH_2025_NON_PROMPTS,
+    MOCK_HOLIDAYS,
+)
+
+pytest.importorskip("pytest_benchmark")
+
+FIRST_BENCHMARK_DATE = date(2023, 1, 1)
+LAST_BENCHMARK_DATE = date(2025, 12, 31)
+# the full curve is slow enough that auto-calibrated rounds take minutes
+POPULATE_CURVE_ROUNDS = 3
+
+
+@pytest.fixture(scope="module")
+def as_of_datetimes() -> List[datetime]:
+    return [
+        datetime.combine(
+            FIRST_BENCHMARK_DATE + timedelta(days=day_offset),
+            datetime.min.time().replace(hour=12),
+            tzinfo=ZoneInfo("Europe/London"),
+        )
+        for day_offset in range((LAST_BENCHMARK_DATE - FIRST_BENCHMARK_DATE).days + 1)
+    ]
+
+
+@pytest.fixture(scope="module")
+def lme_prompt_maps(as_of_datetimes: List[datetime]) -> List[Dict[date, date]]:
+    return [
+        date_calc_funcs.get_lme_prompt_map(
+            LME_2023_THROUGH_2025_NON_PROMPTS, _current_datetime=as_of_datetime
+        )
+        for as_of_datetime in as_of_datetimes
+    ]
+
+
+@pytest.fixture(params=["holidays", "holiday_calendar"])
+def product_holidays(request):
+    if request.param == "holiday_calendar":
+        return date_calc_funcs.LMEHolidayCalendar(MOCK_HOLIDAYS)
+    return MOCK_HOLIDAYS
+
+
+def test_bench_get_lme_prompt_map(benchmark, as_of_datetimes):
+    benchmark.group = "get_lme_prompt_map"
+
+    def get_lme_prompt_maps():
+        for as_of_datetime in as_of_datetimes:
+            date_calc_funcs.get_lme_prompt_map(
+                LME_2023_THROUGH_2025_NON_PROMPTS, _current_datetime=as_of_datetime
+            )
+
+    benchmark(get_lme_prompt_maps)
+
+
+def test_bench_get_3m_datetime(benchmark, as_of_datetimes, lme_prompt_maps):
+    benchmark.group = "get_3m_datetime"
+
+    def get_3m_datetimes():
+        for as_of_datetime, lme_prompt_map in zip(as_of_datetimes, lme_prompt_maps):
+            date_calc_funcs.get_3m_datetime(as_of_datetime, lme_prompt_map)
+
+    benchmark(get_3m_datetimes)
+
+
+def test_bench_get_cash_datetime(benchmark, as_of_datetimes, product_holidays):
+    benchmark.group = "get_cash_datetime"
+
+    def get_cash_datetimes():
+        for as_of_datetime in as_of_datetimes:
+            date_calc_funcs.get_cash_datetime(as_of_datetime, product_holidays)
+
+    benchmark(get_cash_datetimes)
+
+
+def test_bench_get_tom_datetime(benchmark, as_of_datetimes, product_holidays):
+    benchmark.group = "get_tom_datetime"
+
+    def get_tom_datetimes():
+        for as_of_datetime in as_of_datetimes:
+            date_calc_funcs.get_tom_datetime(as_of_datetime, product_holidays)
+
+    benchmark(get_tom_datetimes)
+
+
+def test_bench_get_all_valid_weekly_prompts(
+    benchmark, as_of_datetimes, lme_prompt_maps
+):
+    benchmark.group = "get_all_valid_weekly_prompts"
+
+    def get_all_valid_weekly_prompts():
+        for as_of_datetime, lme_prompt_map in zip(as_of_datetimes, lme_prompt_maps):
+            date_calc_funcs.get_all_valid_weekly_prompts(as_of_datetime, lme_prompt_map)
+
+    benchmark(get_all_valid_weekly_prompts)
+
+
+def test_bench_populate_primary_curve_datetimes(
+    benchmark, as_of_datetimes, product_holidays
+):
+    benchmark.group = "populate_primary_curve_datetimes"
+
+    def populate_primary_curves():
+        for as_of_datetime in as_of_datetimes:
+            date_calc_funcs.populate_primary_curve_datetimes(
+                LME_2023_THROUGH_2025_NON_PROMPTS,
+                product_holidays,
+                _current_datetime=as_of_datetime,
+            )
+
+    benchmark.pedantic(populate_primary_curves, rounds=POPULATE_CURVE_ROUNDS)
+
+
+def test_bench_get_primary_prompt_days_as_of(
+    benchmark, as_of_datetimes, product_holidays
+):
+    # batch equivalent of the TOM, cash, and 3M dates of the curves above
+    benchmark.group = "populate_primary_curve_datetimes"
+    benchmark(
+        batch_date_calc_funcs.get_primary_prompt_days_as_of,
+        as_of_datetimes,
+        LME_2023_THROUGH_2025_NON_PROMPTS,
+        product_holidays,
+    )
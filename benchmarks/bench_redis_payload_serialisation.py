@@ -0,0 +1,77 @@
+"""Micro-benchmark of redis curve payload serialisation, comparing the
+previous row by row `itertuples` loop against `redis_payload_utils` for
+18 months of daily points.
+
+Run from the repository root with:
+    python -m benchmarks.bench_redis_payload_serialisation
+"""
+import timeit
+
+import numpy as np
+import pandas as pd
+import ujson
+
+from prep.helpers import redis_payload_utils
+
+NUM_REPEATS = 7
+NUM_CALLS_PER_REPEAT = 50
+
+
+def build_curve_df(num_months=18) -> pd.DataFrame:
+    curve_index = pd.date_range(
+        "2023-09-29", pd.Timestamp("2023-09-29") + pd.DateOffset(months=num_months)
+    )
+    rng = np.random.default_rng(2023)
+    return pd.DataFrame(
+        {"interp_cont_rate": 0.05 + rng.normal(0.0, 1e-3, len(curve_index))},
+        index=curve_index,
+    )
+
+
+def serialise_legacy_and_new_with_itertuples(curve_df: pd.DataFrame):
+    legacy_curve_data = {}
+    new_curve_data = {}
+    for row in curve_df.itertuples():
+        legacy_curve_data[row.Index.strftime(r"%Y%m%d")] = {
+            "Interest Rate": row.interp_cont_rate
+        }
+        new_curve_data[row.Index.strftime(r"%Y%m%d")] = row.interp_cont_rate
+    return ujson.dumps(legacy_curve_data), ujson.dumps(new_curve_data)
+
+
+def serialise_legacy_and_new_vectorised(curve_df: pd.DataFrame):
+    return redis_payload_utils.serialise_legacy_and_new_curve_payloads(
+        curve_df.index,  # type: ignore
+        curve_df["interp_cont_rate"].to_numpy(),
+        "Interest Rate",
+    )
+
+
+def main():
+    curve_df = build_curve_df()
+    assert serialise_legacy_and_new_with_itertuples(
+        curve_df
+    ) == serialise_legacy_and_new_vectorised(curve_df)
+
+    print(f"Serialising {len(curve_df)} daily points to legacy and new payloads")
+    timings = {}
+    for name, serialiser in [
+        ("itertuples", serialise_legacy_and_new_with_itertuples),
+        ("vectorised", serialise_legacy_and_new_vectorised),
+    ]:
+        timings[name] = (
+            min(
+                timeit.repeat(
+                    lambda: serialiser(curve_df),
+                    repeat=NUM_REPEATS,
+                    number=NUM_CALLS_PER_REPEAT,
+                )
+            )
+            / NUM_CALLS_PER_REPEAT
+        )
+        print(f"{name:>12}: {timings[name] * 1e6:9.1f} us per curve")
+    print(f"{'speedup':>12}: {timings['itertuples'] / timings['vectorised']:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Micro-benchmark of filtering sol3 CME redis keys, comparing the previous
+regex, `strptime` and list membership check per key against the cached key
+parsing of `sol3_redis_ingestion`, over 100k synthetic keys.
+
+Run from the repository root with:
+    python -m benchmarks.bench_sol3_key_filter
+"""
+import random
+import re
+import timeit
+from datetime import datetime
+from typing import List
+
+from prep.cme import sol3_redis_ingestion
+
+NUM_KEYS = 100_000
+NUM_REPEATS = 7
+NUM_CALLS_PER_REPEAT = 5
+LEGACY_CME_SYMBOLS = [
+    "AX",
+    "HXE",
+    "H1W",
+    "H1E",
+    "H1M",
+    "H2E",
+    "H2M",
+    "H2W",
+    "H3E",
+    "H3M",
+    "H3W",
+    "H4E",
+    "H4M",
+    "H4W",
+    "H1E",
+    "H1M",
+    "H2E",
+    "H2M",
+    "H2W",
+    "H3E",
+    "H3M",
+    "H3W",
+    "H4E",
+    "H4M",
+    "H4W",
+    "H5E",
+    "H5M",
+    "H5W",
+]
+
+
+def build_keys(num_keys=NUM_KEYS) -> List[str]:
+    # a mix of symbols of interest and not, and of expired and live months
+    rng = random.Random(2024)
+    symbols = sorted(set(LEGACY_CME_SYMBOLS)) + ["ABC", "GE", "ZN", "ES", "NQ"]
+    current_year = datetime.now().year
+    return [
+        f"sol3:XCME:{rng.choice(symbols)}-"
+        f"{rng.randint(current_year - 2, current_year + 3)}-{rng.randint(1, 12):02}"
+        for _ in range(num_keys)
+    ]
+
+
+def filter_with_strptime(strings: List[str]) -> List[str]:
+    current_date = datetime.now()
+    date_pattern = re.compile(r"-(\d{4}-\d{2})$")
+    filtered_strings = []
+    for string in strings:
+        match = date_pattern.search(string)
+        if match:
+            date_obj = datetime.strptime(match.group(1), "%Y-%m")
+            if date_obj.year > current_date.year or (
+                date_obj.year == current_date.year
+                and date_obj.month >= current_date.month
+            ):
+                instrument_symbol = string.split(":")[2].split("-")[0]
+                if instrument_symbol in LEGACY_CME_SYMBOLS:
+                    filtered_strings.append(string)
+    return filtered_strings
+
+
+def main():
+    keys = build_keys()
+    num_distinct_keys = len(set(keys))
+    assert filter_with_strptime(keys) == (
+        sol3_redis_ingestion.filter_for_valid_redis_keys(keys)
+    )
+
+    print(f"Filtering {len(keys)} sol3 keys, {num_distinct_keys} distinct")
+    timings = {}
+    for name, key_filter in [
+        ("strptime", filter_with_strptime),
+        ("cached parse", sol3_redis_ingestion.filter_for_valid_redis_keys),
+    ]:
+        timings[name] = (
+            min(
+                timeit.repeat(
+                    lambda: key_filter(keys),
+                    repeat=NUM_REPEATS,
+                    number=NUM_CALLS_PER_REPEAT,
+                )
+            )
+            / NUM_CALLS_PER_REPEAT
+        )
+        print(f"{name:>14}: {timings[name] * 1e3:8.2f} ms per call")
+    print(f"{'speedup':>14}: {timings['strptime'] / timings['cached parse']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Micro-benchmark of parsing sol3 strike/vol payloads, comparing the
+previous `json.loads` and per-strike `float()` loop against the columnar
+parsing of `sol3_redis_ingestion.process_CME_redis_data`, over 100
+instruments of 500 strikes each.
+
+Run from the repository root with:
+    python -m benchmarks.bench_sol3_payload_parse
+"""
+import json
+import random
+import timeit
+from datetime import datetime
+from typing import List, Tuple
+
+from prep.cme import sol3_redis_ingestion
+
+NUM_INSTRUMENTS = 100
+NUM_STRIKES = 500
+NUM_REPEATS = 7
+NUM_CALLS_PER_REPEAT = 5
+
+
+def build_payloads() -> List[Tuple[str, str]]:
+    rng = random.Random(2024)
+    payloads = []
+    for instrument_num in range(NUM_INSTRUMENTS):
+        strike_data = {}
+        for strike_num in range(NUM_STRIKES):
+            strike_values = {"v": rng.uniform(0.1, 0.6), "dvds": rng.gauss(0, 1e-3)}
+            # sol3 omits fields now and then
+            if rng.random() > 0.1:
+                strike_values["d2vd2s"] = rng.gauss(0, 1e-5)
+            strike_data[f"{2000 + strike_num * 5:.1f}"] = strike_values
+        payloads.append(
+            (f"sol3:XCME:HXE-{2030 + instrument_num}-01", json.dumps(strike_data))
+        )
+    return payloads
+
+
+def process_with_json_loop(key: str, raw_data: str):
+    data = json.loads(raw_data)
+    strikes = []
+    volatilities = []
+    dvds_list = []
+    d2vd2s_list = []
+    for strike, values in data.items():
+        strikes.append(float(strike))
+        volatilities.append(float(values.get("v", 0)))
+        dvds_list.append(float(values.get("dvds", 0)))
+        d2vd2s_list.append(float(values.get("d2vd2s", 0)))
+    if sum(volatilities) == 0:
+        return None
+    return {
+        "date_ingested": datetime.now().date(),
+        "instrument_symbol": key.split(":")[2],
+        "strikes": strikes,
+        "volatilities": volatilities,
+        "dvds": dvds_list,
+        "d2vd2s": d2vd2s_list,
+    }
+
+
+def main():
+    payloads = build_payloads()
+    # payload strikes are already in order so both produce the same curves
+    assert [process_with_json_loop(*payload) for payload in payloads] == [
+        sol3_redis_ingestion.process_CME_redis_data(*payload) for payload in payloads
+    ]
+
+    print(
+        f"Parsing {NUM_INSTRUMENTS} sol3 payloads of {NUM_STRIKES} strikes, "
+        f"orjson available: {sol3_redis_ingestion.ORJSON_AVAILABLE}"
+    )
+    timings = {}
+    for name, payload_parser in [
+        ("json loop", process_with_json_loop),
+        ("columnar", sol3_redis_ingestion.process_CME_redis_data),
+    ]:
+        timings[name] = (
+            min(
+                timeit.repeat(
+                    lambda: [payload_parser(*payload) for payload in payloads],
+                    repeat=NUM_REPEATS,
+                    number=NUM_CALLS_PER_REPEAT,
+                )
+            )
+            / NUM_CALLS_PER_REPEAT
+        )
+        print(f"{name:>10}: {timings[name] * 1e3:8.2f} ms per run")
+    print(f"{'speedup':>10}: {timings['json loop'] / timings['columnar']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,7 @@ from zoneinfo import ZoneInfo
 import prep.nightly as nightly_funcs
 from prep import handy_dandy_variables
 from prep.cme import sol3_redis_ingestion
-from prep.lme import contract_db_gen, date_calc_funcs
+from prep.lme import calendar_table, contract_db_gen
 
 app = func.FunctionApp()
 
@@ -127,14 +127,16 @@ def update_lme_important_dates(timer: func.TimerRequest):
         lme_ali_orm = session.get(upestatic.Product, "xlme-lad-usd")
         if lme_ali_orm is None:
             raise ValueError("Unable to find xlme-lad-usd in database products")
-        non_prompts = [holiday.holiday_date for holiday in lme_ali_orm.holidays]
         forward_months = 18
         current_datetime = datetime.now(tz=ZoneInfo("Europe/London"))
-        prompt_curve = date_calc_funcs.populate_primary_curve_datetimes(
-            non_prompts,
-            lme_ali_orm.holidays,
-            forward_months,
-            _current_datetime=current_datetime,
+        (
+            lme_calendar_table,
+            current_session_date,
+        ) = calendar_table.get_lme_calendar_table(
+            lme_ali_orm.holidays, current_datetime=current_datetime
+        )
+        prompt_curve = lme_calendar_table.get_session(
+            current_session_date, forward_months=forward_months
         )
 
     lme_3m_datetime = prompt_curve.three_month
@@ -273,6 +275,22 @@ def send_eur_product_cache_update():
     use_monitor=True,
 )
 def redis_data_pusher(timer: func.TimerRequest):
+    if sol3_redis_ingestion.SOL3_KEYSPACE_INGESTION:
+        # the listener replaces polling, each run only keeps it alive
+        keyspace_listener = sol3_redis_ingestion.get_sol3_keyspace_listener(
+            redis_conn, pg_engine
+        )
+        if keyspace_listener.start():
+            logging.info("Started listening for sol3 xcme keyspace notifications")
+        keyspace_ingestion_result = keyspace_listener.take_result()
+        logging.info(
+            "Wrote %s sol3 xcme curves from %s keys touched, in %s batches, "
+            "since the last run",
+            keyspace_ingestion_result.curves_written,
+            keyspace_ingestion_result.keys_touched,
+            keyspace_ingestion_result.batches_written,
+        )
+        return
     logging.info("Pulling redis keys with pattern `sol3:XCME*`")
     status = sol3_redis_ingestion.push_redis_data_to_postgres(redis_conn, pg_engine)
     logging.info("Completed pulling sol3 xcme data with status `%s`", status)
@@ -1,7 +1,9 @@
-import re, json
-from typing import List
-from datetime import datetime
+import re, json, os, functools, hashlib, importlib.util, logging, threading, time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from datetime import date, datetime
 
+import numpy as np
 import redis
 import sqlalchemy
 import sqlalchemy.orm
@@ -9,103 +11,660 @@ from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from prep import handy_dandy_variables
 
+ORJSON_AVAILABLE = importlib.util.find_spec("orjson") is not None
+if ORJSON_AVAILABLE:
+    import orjson
+else:
+    import ujson
+
 
 redis_dev_key_append = handy_dandy_variables.redis_key_append
 
+SOL3_CME_KEY_PATTERN = "sol3:XCME*"
+_SOL3_CURVE_FIELD_NAMES = ("v", "dvds", "d2vd2s")
+# keys examined per SCAN call, the default of 10 costs a round trip per handful
+# of keys across the whole keyspace
+SOL3_REDIS_SCAN_COUNT = int(os.getenv("SOL3_REDIS_SCAN_COUNT", "1000"))
+# keys fetched per MGET, all chunks are sent together in a single pipeline
+SOL3_REDIS_MGET_CHUNK_SIZE = int(os.getenv("SOL3_REDIS_MGET_CHUNK_SIZE", "500"))
+# only parse and upsert curves whose payload changed since they were last written
+SOL3_PAYLOAD_CHANGE_DETECTION = os.getenv(
+    "SOL3_PAYLOAD_CHANGE_DETECTION", "true"
+).lower() in ("t", "true", "y", "yes", "1")
+# instruments of interest to us, overridden with a comma separated list
+SOL3_CME_SYMBOLS = frozenset(
+    symbol.strip()
+    for symbol in os.getenv(
+        "SOL3_CME_SYMBOLS",
+        "AX,HXE,H1E,H1M,H1W,H2E,H2M,H2W,H3E,H3M,H3W,H4E,H4M,H4W,H5E,H5M,H5W",
+    ).split(",")
+    if symbol.strip() != ""
+)
+# distinct keys whose parsed form is cached, comfortably more than are active
+SOL3_KEY_PARSE_CACHE_SIZE = int(os.getenv("SOL3_KEY_PARSE_CACHE_SIZE", "16384"))
+# listen for keyspace notifications on sol3 CME keys on a long running
+# background thread, writing touched curves in micro-batches, in place of
+# polling every minute. Needs `notify-keyspace-events` to include at least
+# `K$` on the redis server
+SOL3_KEYSPACE_INGESTION = os.getenv("SOL3_KEYSPACE_INGESTION", "false").lower() in (
+    "t",
+    "true",
+    "y",
+    "yes",
+    "1",
+)
+SOL3_KEYSPACE_MAX_BATCH_LATENCY_SECONDS = float(
+    os.getenv("SOL3_KEYSPACE_MAX_BATCH_LATENCY_SECONDS", "1")
+)
+SOL3_KEYSPACE_MAX_BATCH_SIZE = int(os.getenv("SOL3_KEYSPACE_MAX_BATCH_SIZE", "200"))
+# wait before resubscribing after the listener loses its connection or fails
+SOL3_KEYSPACE_RETRY_SECONDS = float(os.getenv("SOL3_KEYSPACE_RETRY_SECONDS", "5"))
+# longest the listener blocks on its subscription before checking to stop
+_KEYSPACE_WAKE_SECONDS = 1.0
+# a subscribed connection only reads, so is pinged to notice it has dropped
+_KEYSPACE_PING_SECONDS = 30.0
+# redis hash of the payload hashes last written, so a cold started worker
+# doesn't have to rewrite every curve
+SOL3_PAYLOAD_HASHES_KEY = (
+    os.getenv("SOL3_PAYLOAD_HASHES_KEY", "prep:sol3_payload_hashes")
+    + redis_dev_key_append
+)
+
 
 # nightly function to scan for sol3:XCME keys, filter for expired keys, pull remaining and publish to db
 def push_redis_data_to_postgres(
-    redis_conn: redis.Redis, engine: sqlalchemy.Engine, first_run=False
+    redis_conn: redis.Redis,
+    engine: sqlalchemy.Engine,
+    first_run=False,
+    detect_changes=SOL3_PAYLOAD_CHANGE_DETECTION,
 ):
-    # first scan pull all keys matching pattern
-    cme_keys = [key for key in redis_conn.scan_iter("sol3:XCME*")]
+    # scan for active keys and pull their values in pipelined chunks
+    active_cme_redis_data = fetch_active_cme_redis_data(redis_conn)
+    curves_written = write_cme_redis_data_to_postgres(
+        redis_conn,
+        engine,
+        active_cme_redis_data,
+        active_keys=[key for key, _ in active_cme_redis_data],
+        detect_changes=detect_changes,
+    )
+    if curves_written == 0:
+        return "No changed data to push to Postgres"
+    return f"Data for {curves_written} curves pushed to Postgres successfully!"
 
-    # filter those for expired keys
-    active_cme_keys = filter_for_valid_redis_keys(cme_keys)
 
-    entries_to_publish = []
+def write_cme_redis_data_to_postgres(
+    redis_conn: redis.Redis,
+    engine: sqlalchemy.Engine,
+    cme_redis_data: List[Tuple[str, Optional[str]]],
+    active_keys: Optional[List[str]] = None,
+    detect_changes=SOL3_PAYLOAD_CHANGE_DETECTION,
+) -> int:
+    """Parses and upserts the curves of the sol3 keys given into
+    `cme_vol_curves`, skipping those unchanged since last written where
+    `detect_changes` is set.
 
-    for key in active_cme_keys:
-        raw_data = redis_conn.get(key)
+    :param redis_conn: Redis connection to record payload hashes through
+    :type redis_conn: redis.Redis
+    :param engine: Engine to write the curves through
+    :type engine: sqlalchemy.Engine
+    :param cme_redis_data: Each key with its value
+    :type cme_redis_data: List[Tuple[str, Optional[str]]]
+    :param active_keys: Every currently active key, when known, so the
+    payload hashes of any others can be dropped, defaults to None
+    :type active_keys: Optional[List[str]], optional
+    :param detect_changes: Whether to skip unchanged payloads, defaults to
+    SOL3_PAYLOAD_CHANGE_DETECTION
+    :type detect_changes: bool, optional
+    :return: Number of curves written
+    :rtype: int
+    """
+    date_ingested = datetime.now().date()
+    if detect_changes:
+        payload_hash_cache = get_sol3_payload_hash_cache()
+        (
+            changed_cme_redis_data,
+            changed_payload_hashes,
+        ) = payload_hash_cache.get_changed_redis_data(
+            redis_conn, cme_redis_data, date_ingested
+        )
+    else:
+        changed_cme_redis_data, changed_payload_hashes = cme_redis_data, {}
+
+    entries_to_publish = []
+    for key, raw_data in changed_cme_redis_data:
         if raw_data is not None:
             data = process_CME_redis_data(key, raw_data)
             if data is not None:
                 entries_to_publish.append(data)
 
-    cme_vol_curves_table = sqlalchemy.Table(
-        "cme_vol_curves", sqlalchemy.MetaData(), autoload_with=engine
+    if len(entries_to_publish) > 0:
+        cme_vol_curves_table = sqlalchemy.Table(
+            "cme_vol_curves", sqlalchemy.MetaData(), autoload_with=engine
+        )
+
+        # send to db with upsert
+        with engine.connect() as connection:
+            stmt = pg_insert(cme_vol_curves_table).values(entries_to_publish)
+
+            update_dict = {
+                col: stmt.excluded[col] for col in entries_to_publish[0].keys()
+            }
+
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["date_ingested", "instrument_symbol"], set_=update_dict
+            )
+
+            connection.execute(stmt)
+            connection.commit()
+
+    if detect_changes:
+        # only recorded once written, so a failed write is retried next run
+        payload_hash_cache.record_payload_hashes(
+            redis_conn, changed_payload_hashes, active_keys
+        )
+    return len(entries_to_publish)
+
+
+@dataclass(frozen=True)
+class KeyspaceIngestionResult:
+    batches_written: int
+    keys_touched: int
+    curves_written: int
+
+
+def _decode(value: Union[str, bytes]) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class Sol3KeyspaceListener:
+    """Listens, on a background thread for as long as the worker lives, to
+    keyspace notifications of writes to `sol3:XCME*` keys, coalescing the keys
+    touched into micro-batches that are pulled and written as soon as
+    `max_batch_size` keys are pending or the first has waited
+    `max_batch_latency_seconds`.
+
+    Notifications aren't delivered while unsubscribed, so every time the
+    listener (re)subscribes it polls all active keys once, after the
+    subscription is confirmed, so writes made before starting or across a
+    dropped connection are still picked up. The redis server's
+    `notify-keyspace-events` must include at least `K$`.
+    """
+
+    def __init__(
+        self,
+        redis_conn: redis.Redis,
+        engine: sqlalchemy.Engine,
+        max_batch_latency_seconds=SOL3_KEYSPACE_MAX_BATCH_LATENCY_SECONDS,
+        max_batch_size=SOL3_KEYSPACE_MAX_BATCH_SIZE,
+        detect_changes=SOL3_PAYLOAD_CHANGE_DETECTION,
+        retry_seconds=SOL3_KEYSPACE_RETRY_SECONDS,
+    ) -> None:
+        self.redis_conn = redis_conn
+        self.engine = engine
+        self.max_batch_latency_seconds = max_batch_latency_seconds
+        self.max_batch_size = max_batch_size
+        self.detect_changes = detect_changes
+        self.retry_seconds = retry_seconds
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._batches_written = 0
+        self._keys_touched = 0
+        self._curves_written = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        """Starts listening on a background thread, unless already running.
+
+        :return: Whether the listener was started
+        :rtype: bool
+        """
+        with self._lock:
+            if self.is_running:
+                return False
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="sol3-keyspace-listener", daemon=True
+            )
+            self._thread.start()
+            return True
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stops listening, writing any keys still pending first.
+
+        :param timeout: Longest to wait for the thread to finish, defaults to
+        None to wait indefinitely
+        :type timeout: Optional[float], optional
+        """
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def take_result(self) -> KeyspaceIngestionResult:
+        """Returns the counts of what has been written since last taken.
+
+        :return: Counts of the batches written, keys touched and curves
+        written
+        :rtype: KeyspaceIngestionResult
+        """
+        with self._lock:
+            keyspace_ingestion_result = KeyspaceIngestionResult(
+                self._batches_written, self._keys_touched, self._curves_written
+            )
+            self._batches_written = 0
+            self._keys_touched = 0
+            self._curves_written = 0
+        return keyspace_ingestion_result
+
+    def _write_batch(
+        self,
+        cme_redis_data: List[Tuple[str, Optional[str]]],
+        active_keys: Optional[List[str]] = None,
+    ):
+        curves_written = write_cme_redis_data_to_postgres(
+            self.redis_conn,
+            self.engine,
+            cme_redis_data,
+            active_keys=active_keys,
+            detect_changes=self.detect_changes,
+        )
+        with self._lock:
+            self._batches_written += 1
+            self._keys_touched += len(cme_redis_data)
+            self._curves_written += curves_written
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.listen()
+            except Exception:
+                logging.exception(
+                    "sol3 keyspace listener failed, resubscribing in %ss",
+                    self.retry_seconds,
+                )
+                self._stop_event.wait(self.retry_seconds)
+
+    def listen(self):
+        """Subscribes, polls every active key once and then writes the keys
+        touched until stopped, on the calling thread.
+        """
+        redis_db = self.redis_conn.connection_pool.connection_kwargs.get("db", 0)
+        channel_prefix = f"__keyspace@{redis_db}__:"
+        pubsub = self.redis_conn.pubsub()
+        try:
+            pubsub.psubscribe(channel_prefix + SOL3_CME_KEY_PATTERN)
+            while True:
+                if self._stop_event.is_set():
+                    return
+                message = pubsub.get_message(timeout=_KEYSPACE_WAKE_SECONDS)
+                if message is not None and message["type"] == "psubscribe":
+                    break
+            # only once subscribed, so a write between the two isn't missed
+            active_cme_redis_data = fetch_active_cme_redis_data(self.redis_conn)
+            self._write_batch(
+                active_cme_redis_data,
+                active_keys=[key for key, _ in active_cme_redis_data],
+            )
+            logging.info(
+                "Subscribed to sol3 keyspace notifications, caught up %s keys",
+                len(active_cme_redis_data),
+            )
+
+            # insertion ordered set of the keys touched since the last write
+            pending_keys: Dict[str, None] = {}
+            batch_deadline = float("inf")
+            ping_deadline = time.monotonic() + _KEYSPACE_PING_SECONDS
+            while True:
+                stopping = self._stop_event.is_set()
+                now = time.monotonic()
+                if len(pending_keys) > 0 and (
+                    stopping
+                    or now >= batch_deadline
+                    or len(pending_keys) >= self.max_batch_size
+                ):
+                    self._write_batch(
+                        fetch_cme_redis_data(self.redis_conn, list(pending_keys))
+                    )
+                    pending_keys.clear()
+                    batch_deadline = float("inf")
+                    continue
+                if stopping:
+                    return
+                if now >= ping_deadline:
+                    pubsub.ping()
+                    ping_deadline = now + _KEYSPACE_PING_SECONDS
+
+                message = pubsub.get_message(
+                    timeout=max(
+                        min(batch_deadline, now + _KEYSPACE_WAKE_SECONDS) - now, 0.0
+                    )
+                )
+                if message is None or message["type"] != "pmessage":
+                    continue
+                key = _decode(message["channel"])[len(channel_prefix) :]
+                # only plain `SET`s leave a new payload to pull
+                if _decode(message["data"]) != "set" or not is_valid_redis_key(
+                    key, datetime.now()
+                ):
+                    continue
+                if len(pending_keys) == 0:
+                    batch_deadline = time.monotonic() + self.max_batch_latency_seconds
+                pending_keys[key] = None
+        finally:
+            pubsub.close()
+
+
+_sol3_keyspace_listener: Optional[Sol3KeyspaceListener] = None
+_sol3_keyspace_listener_lock = threading.Lock()
+
+
+def get_sol3_keyspace_listener(
+    redis_conn: redis.Redis, engine: sqlalchemy.Engine
+) -> Sol3KeyspaceListener:
+    """Returns the process wide keyspace listener, created on first call.
+
+    :param redis_conn: Redis connection to subscribe and pull through
+    :type redis_conn: redis.Redis
+    :param engine: Engine to write the curves through
+    :type engine: sqlalchemy.Engine
+    :return: The keyspace listener, not necessarily started
+    :rtype: Sol3KeyspaceListener
+    """
+    global _sol3_keyspace_listener
+    with _sol3_keyspace_listener_lock:
+        if _sol3_keyspace_listener is None:
+            _sol3_keyspace_listener = Sol3KeyspaceListener(redis_conn, engine)
+        return _sol3_keyspace_listener
+
+
+def fetch_active_cme_redis_data(
+    redis_conn: redis.Redis,
+    scan_count=SOL3_REDIS_SCAN_COUNT,
+    mget_chunk_size=SOL3_REDIS_MGET_CHUNK_SIZE,
+) -> List[Tuple[str, Optional[str]]]:
+    """Scans for `sol3:XCME*` keys, filtering out expired and irrelevant keys
+    as they stream in, and pulls the values of those remaining as
+    `fetch_cme_redis_data`.
+
+    :param redis_conn: Redis connection to scan and pull through
+    :type redis_conn: redis.Redis
+    :param scan_count: Number of keys examined per `SCAN` call, defaults to
+    SOL3_REDIS_SCAN_COUNT
+    :type scan_count: int, optional
+    :param mget_chunk_size: Number of keys fetched per `MGET`, defaults to
+    SOL3_REDIS_MGET_CHUNK_SIZE
+    :type mget_chunk_size: int, optional
+    :return: Each active key with its value, None where the key has since
+    been removed
+    :rtype: List[Tuple[str, Optional[str]]]
+    """
+    current_date = datetime.now()
+    # SCAN can return a key more than once, which would then conflict with
+    # itself in the upsert
+    active_cme_keys = list(
+        dict.fromkeys(
+            key
+            for key in redis_conn.scan_iter(SOL3_CME_KEY_PATTERN, count=scan_count)
+            if is_valid_redis_key(key, current_date)
+        )
+    )
+    return fetch_cme_redis_data(
+        redis_conn, active_cme_keys, mget_chunk_size=mget_chunk_size
     )
 
-    # send to db with upsert
-    with engine.connect() as connection:
-        stmt = pg_insert(cme_vol_curves_table).values(entries_to_publish)
 
-        update_dict = {col: stmt.excluded[col] for col in entries_to_publish[0].keys()}
+def fetch_cme_redis_data(
+    redis_conn: redis.Redis,
+    cme_keys: List[str],
+    mget_chunk_size=SOL3_REDIS_MGET_CHUNK_SIZE,
+) -> List[Tuple[str, Optional[str]]]:
+    """Pulls the values of `cme_keys` with `MGET`s of `mget_chunk_size` keys,
+    sent together in one non-transactional pipeline.
 
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["date_ingested", "instrument_symbol"], set_=update_dict
+    :param redis_conn: Redis connection to pull through
+    :type redis_conn: redis.Redis
+    :param cme_keys: Keys to pull the values of
+    :type cme_keys: List[str]
+    :param mget_chunk_size: Number of keys fetched per `MGET`, defaults to
+    SOL3_REDIS_MGET_CHUNK_SIZE
+    :type mget_chunk_size: int, optional
+    :return: Each key with its value, None where the key doesn't exist
+    :rtype: List[Tuple[str, Optional[str]]]
+    """
+    if len(cme_keys) == 0:
+        return []
+
+    pipeline = redis_conn.pipeline(transaction=False)
+    for chunk_start in range(0, len(cme_keys), mget_chunk_size):
+        pipeline.mget(cme_keys[chunk_start : chunk_start + mget_chunk_size])
+    raw_data_chunks: Iterable[List[Optional[str]]] = pipeline.execute()
+
+    return list(
+        zip(
+            cme_keys,
+            (
+                raw_data
+                for raw_data_chunk in raw_data_chunks
+                for raw_data in raw_data_chunk
+            ),
         )
+    )
+
+
+def get_payload_hash(raw_data: Union[str, bytes], date_ingested: date) -> str:
+    """Hashes a sol3 payload along with the date it's ingested on, as curves
+    are written once per day even when unchanged.
+
+    :param raw_data: Raw payload from redis
+    :type raw_data: Union[str, bytes]
+    :param date_ingested: Date the payload is ingested on
+    :type date_ingested: date
+    :return: Hex digest of the payload and date
+    :rtype: str
+    """
+    if isinstance(raw_data, str):
+        raw_data = raw_data.encode()
+    payload_hash = hashlib.blake2b(date_ingested.isoformat().encode(), digest_size=16)
+    payload_hash.update(raw_data)
+    return payload_hash.hexdigest()
+
+
+class Sol3PayloadHashCache:
+    """Hashes of the sol3 payloads last written for each key, kept in process
+    and mirrored to a redis hash that's loaded on a cold start, so unchanged
+    curves aren't parsed or written again.
+    """
+
+    def __init__(self, redis_hash_key: str = SOL3_PAYLOAD_HASHES_KEY) -> None:
+        self.redis_hash_key = redis_hash_key
+        self._payload_hashes: Optional[Dict[str, str]] = None
+        self._lock = threading.Lock()
+
+    def _get_payload_hashes(self, redis_conn: redis.Redis) -> Dict[str, str]:
+        if self._payload_hashes is None:
+            try:
+                self._payload_hashes = {
+                    (key.decode() if isinstance(key, bytes) else key): (
+                        payload_hash.decode()
+                        if isinstance(payload_hash, bytes)
+                        else payload_hash
+                    )
+                    for key, payload_hash in redis_conn.hgetall(
+                        self.redis_hash_key
+                    ).items()  # type: ignore
+                }
+            except redis.RedisError:
+                logging.warning(
+                    "Unable to load sol3 payload hashes from `%s`, writing all curves",
+                    self.redis_hash_key,
+                    exc_info=True,
+                )
+                self._payload_hashes = {}
+        return self._payload_hashes
+
+    def get_changed_redis_data(
+        self,
+        redis_conn: redis.Redis,
+        cme_redis_data: List[Tuple[str, Optional[str]]],
+        date_ingested: date,
+    ) -> Tuple[List[Tuple[str, Optional[str]]], Dict[str, str]]:
+        """Filters `cme_redis_data` down to the keys whose payload has changed
+        since last recorded.
+
+        :param redis_conn: Redis connection to load recorded hashes through
+        on a cold start
+        :type redis_conn: redis.Redis
+        :param cme_redis_data: Each key with its value
+        :type cme_redis_data: List[Tuple[str, Optional[str]]]
+        :param date_ingested: Date the payloads are ingested on
+        :type date_ingested: date
+        :return: Each changed key with its value, and the hash of each
+        changed payload to record once written
+        :rtype: Tuple[List[Tuple[str, Optional[str]]], Dict[str, str]]
+        """
+        changed_cme_redis_data = []
+        changed_payload_hashes = {}
+        with self._lock:
+            payload_hashes = self._get_payload_hashes(redis_conn)
+            for key, raw_data in cme_redis_data:
+                if raw_data is None:
+                    continue
+                payload_hash = get_payload_hash(raw_data, date_ingested)
+                if payload_hashes.get(key) != payload_hash:
+                    changed_cme_redis_data.append((key, raw_data))
+                    changed_payload_hashes[key] = payload_hash
+        logging.debug(
+            "%s of %s sol3 payloads changed",
+            len(changed_cme_redis_data),
+            len(cme_redis_data),
+        )
+        return changed_cme_redis_data, changed_payload_hashes
+
+    def record_payload_hashes(
+        self,
+        redis_conn: redis.Redis,
+        changed_payload_hashes: Dict[str, str],
+        active_keys: Optional[List[str]] = None,
+    ):
+        """Records the hashes of the payloads written, dropping those of keys
+        no longer active where `active_keys` is given.
+
+        :param redis_conn: Redis connection to mirror the hashes through
+        :type redis_conn: redis.Redis
+        :param changed_payload_hashes: Hash of each payload written
+        :type changed_payload_hashes: Dict[str, str]
+        :param active_keys: Every key currently active, defaults to None
+        :type active_keys: Optional[List[str]], optional
+        """
+        with self._lock:
+            payload_hashes = self._get_payload_hashes(redis_conn)
+            payload_hashes.update(changed_payload_hashes)
+            inactive_keys = (
+                payload_hashes.keys() - set(active_keys)
+                if active_keys is not None
+                else set()
+            )
+            for inactive_key in inactive_keys:
+                del payload_hashes[inactive_key]
+        if len(changed_payload_hashes) == 0 and len(inactive_keys) == 0:
+            return
+        try:
+            pipeline = redis_conn.pipeline(transaction=False)
+            if len(changed_payload_hashes) > 0:
+                pipeline.hset(self.redis_hash_key, mapping=changed_payload_hashes)
+            if len(inactive_keys) > 0:
+                pipeline.hdel(self.redis_hash_key, *inactive_keys)
+            pipeline.execute()
+        except redis.RedisError:
+            logging.warning(
+                "Unable to record sol3 payload hashes to `%s`",
+                self.redis_hash_key,
+                exc_info=True,
+            )
 
-        connection.execute(stmt)
-        connection.commit()
-    return "Data pushed to Postgres successfully!"
+    def clear(self):
+        with self._lock:
+            self._payload_hashes = None
+
+
+_sol3_payload_hash_cache = Sol3PayloadHashCache()
+
+
+def get_sol3_payload_hash_cache() -> Sol3PayloadHashCache:
+    return _sol3_payload_hash_cache
 
 
 # function to filter out expired and irrelevant keys
 def filter_for_valid_redis_keys(strings: List[str]) -> List[str]:
-    cme_symbols = [
-        "AX",
-        "HXE",
-        "H1W",
-        "H1E",
-        "H1M",
-        "H2E",
-        "H2M",
-        "H2W",
-        "H3E",
-        "H3M",
-        "H3W",
-        "H4E",
-        "H4M",
-        "H4W",
-        "H1E",
-        "H1M",
-        "H2E",
-        "H2M",
-        "H2W",
-        "H3E",
-        "H3M",
-        "H3W",
-        "H4E",
-        "H4M",
-        "H4W",
-        "H5E",
-        "H5M",
-        "H5W",
-    ]
     current_date = datetime.now()
+    return [string for string in strings if is_valid_redis_key(string, current_date)]
+
+
+# regex to match the date pattern on sol3 cme keys (format: sol3:XCME:HXE-2021-01)
+_SOL3_KEY_DATE_PATTERN = re.compile(r"-(\d{4})-(\d{2})$")
+
+
+def _get_expiry_month_index(year: int, month: int) -> int:
+    return year * 12 + month
+
+
+# function to parse sol3 cme keys, cached as the same keys are seen every minute
+@functools.lru_cache(maxsize=SOL3_KEY_PARSE_CACHE_SIZE)
+def parse_sol3_cme_key(key: str) -> Optional[Tuple[str, int]]:
+    """Parses a sol3 CME key into its instrument symbol and the month index,
+    `year * 12 + month`, of its expiry.
 
-    # regex to match the date pattern on sol3 cme keys (format: sol3:XCME:HXE-2021-01)
-    date_pattern = re.compile(r"-(\d{4}-\d{2})$")
-
-    filtered_strings = []
-
-    for string in strings:
-        match = date_pattern.search(string)
-        if match:
-            date_str = match.group(1)
-            # convert the extracted date string to a datetime object
-            date_obj = datetime.strptime(date_str, "%Y-%m")
-            # compare with the current date
-            if date_obj.year > current_date.year or (
-                date_obj.year == current_date.year
-                and date_obj.month >= current_date.month
-            ):
-                # now check if instrument is of interest to us, dictacted by the cme_symbols list
-                instrument_symbol = string.split(":")[2].split("-")[0]
-                if instrument_symbol in cme_symbols:
-                    filtered_strings.append(string)
-    return filtered_strings
+    :param key: Sol3 CME key, e.g. `sol3:XCME:HXE-2021-01`
+    :type key: str
+    :return: Instrument symbol and expiry month index, None where the key
+    isn't in the expected format
+    :rtype: Optional[Tuple[str, int]]
+    """
+    match = _SOL3_KEY_DATE_PATTERN.search(key)
+    key_parts = key.split(":")
+    if match is None or len(key_parts) < 3:
+        return None
+    key_year, key_month = int(match.group(1)), int(match.group(2))
+    if not 1 <= key_month <= 12:
+        return None
+    instrument_symbol = key_parts[2].split("-")[0]
+    return instrument_symbol, _get_expiry_month_index(key_year, key_month)
+
+
+def is_valid_redis_key(key: str, current_date: datetime) -> bool:
+    """Checks a sol3 CME key is for an instrument in `SOL3_CME_SYMBOLS` and
+    hasn't expired as of `current_date`.
+
+    :param key: Sol3 CME key, e.g. `sol3:XCME:HXE-2021-01`
+    :type key: str
+    :param current_date: Date to check expiry against
+    :type current_date: datetime
+    :return: Whether the key is valid
+    :rtype: bool
+    """
+    parsed_key = parse_sol3_cme_key(key)
+    if parsed_key is None:
+        return False
+    instrument_symbol, expiry_month_index = parsed_key
+    return (
+        expiry_month_index
+        >= _get_expiry_month_index(current_date.year, current_date.month)
+        and instrument_symbol in SOL3_CME_SYMBOLS
+    )
+
+
+def _loads_sol3_payload(raw_data: Union[str, bytes]) -> Dict[str, Dict[str, Any]]:
+    try:
+        if ORJSON_AVAILABLE:
+            return orjson.loads(raw_data)
+        return ujson.loads(raw_data)
+    except ValueError:
+        # orjson rejects the `NaN` and `Infinity` tokens the stdlib accepts
+        return json.loads(raw_data)
 
 
 # function to format raw data from redis for database entry
@@ -116,29 +675,33 @@ def process_CME_redis_data(key: str, raw_data):
     # process key into instrument name
     instrument_symbol = key.split(":")[2]
 
-    data = json.loads(raw_data)
-    strikes = []
-    volatilities = []
-    dvds_list = []
-    d2vd2s_list = []
+    data = _loads_sol3_payload(raw_data)
+    num_strikes = len(data)
+    strike_values = list(data.values())
 
     date_ingested = datetime.now().date()
 
-    for strike, values in data.items():
-        strikes.append(float(strike))
-        volatilities.append(float(values.get("v", 0)))
-        dvds_list.append(float(values.get("dvds", 0)))
-        d2vd2s_list.append(float(values.get("d2vd2s", 0)))
+    # one column per field, strike strings are parsed by numpy in one go
+    strikes = np.array(list(data.keys()), dtype=np.float64)
+    volatilities, dvds, d2vd2s = (
+        np.fromiter(
+            [values.get(field_name, 0) for values in strike_values],
+            dtype=np.float64,
+            count=num_strikes,
+        )
+        for field_name in _SOL3_CURVE_FIELD_NAMES
+    )
 
     # handle valid key, empty data case
-    if sum(volatilities) == 0:
+    if not volatilities.any():
         return None
 
+    strike_order = np.argsort(strikes, kind="stable")
     return {
         "date_ingested": date_ingested,
         "instrument_symbol": instrument_symbol,
-        "strikes": strikes,
-        "volatilities": volatilities,
-        "dvds": dvds_list,
-        "d2vd2s": d2vd2s_list,
+        "strikes": strikes[strike_order].tolist(),
+        "volatilities": volatilities[strike_order].tolist(),
+        "dvds": dvds[strike_order].tolist(),
+        "d2vd2s": d2vd2s[strike_order].tolist(),
     }
@@ -0,0 +1,136 @@
+import functools
+import re
+import string
+from typing import Any, Callable, List, Mapping
+
+import upedata.template_language.parser as upeparse
+import upedata.template_language.utils as upeutils
+
+_FIELD_REFERENCE_REGEX = re.compile(r"<(?:option|future)>(?:\.\w+)+")
+_FUNCTION_CALL_REGEX = re.compile(r"(?P<func_name>\w+)\((?P<args>.*)\)")
+
+# upedata has no public registry of the functions its parser accepts, it's
+# pinned to the 0.6.4 wheel in pyproject.toml and the shape of this private
+# one is checked by the tests so an upgrade changing it fails loudly
+_TEMPLATE_FUNCTIONS = upeutils._LOCAL_FUNCTIONS
+
+TemplatePart = Callable[[Mapping[str, Any]], str]
+
+
+def _get_raw_part(raw_string: str) -> TemplatePart:
+    def render_raw(field_values: Mapping[str, Any]) -> str:
+        return raw_string
+
+    return render_raw
+
+
+def _get_field_part(field_reference: str) -> TemplatePart:
+    def render_field(field_values: Mapping[str, Any]) -> str:
+        field_value = field_values[field_reference]
+        if field_value is None:
+            raise upeparse.BadInputObject(
+                f"Field `{field_reference}` lacked replacement data"
+            )
+        return str(field_value)
+
+    return render_field
+
+
+def _get_function_part(
+    local_func: Callable[..., str], field_references: List[str]
+) -> TemplatePart:
+    def render_function(field_values: Mapping[str, Any]) -> str:
+        return local_func(
+            *(field_values[field_reference] for field_reference in field_references)
+        )
+
+    return render_function
+
+
+def _get_generation_time_part(statement: str) -> TemplatePart:
+    statement_body = statement[2:-2]
+    if _FIELD_REFERENCE_REGEX.fullmatch(statement_body):
+        return _get_field_part(statement_body)
+
+    function_call_match = _FUNCTION_CALL_REGEX.fullmatch(statement_body)
+    if function_call_match is not None:
+        # the same functions, and argument format, as the upedata parser accepts
+        local_func_data = _TEMPLATE_FUNCTIONS.get(
+            function_call_match.group("func_name")
+        )
+        field_references = function_call_match.group("args").split(", ")
+        if (
+            local_func_data is not None
+            and len(field_references) == len(local_func_data["signature"][0])
+            and all(
+                _FIELD_REFERENCE_REGEX.fullmatch(field_reference)
+                for field_reference in field_references
+            )
+        ):
+            return _get_function_part(local_func_data["callable"], field_references)
+
+    raise upeparse.BadTemplateStatement(
+        f"Unable to compile generation time statement `{statement}`"
+    )
+
+
+class CompiledDisplayNameTemplate:
+    """Display name template, in the language described by
+    `upedata.template_language.parser.tokenize`, parsed once so generation
+    time statements can be substituted from plain field values without
+    building ORM objects or matching regexes per contract.
+
+    Late evaluation statements are left in place, as they are by
+    `substitute_derivative_generation_time`.
+    """
+
+    def __init__(self, template: str):
+        self.template = template
+        self._parts: List[TemplatePart] = []
+        tokenized_template = upeparse.tokenize(template)
+        # statements are held on dicts shared by every `TokenizedString`, so
+        # are copied before anything else is tokenized
+        generation_time_statements = dict(tokenized_template.generation_time_operations)
+        late_evaluation_statements = dict(
+            tokenized_template.late_evaluation_dynamic_stmts
+        )
+        for raw_string, statement_key, _, _ in string.Formatter().parse(
+            tokenized_template.subtracted_string
+        ):
+            if raw_string != "":
+                self._parts.append(_get_raw_part(raw_string))
+            if statement_key is None:
+                continue
+            if statement_key in generation_time_statements:
+                self._parts.append(
+                    _get_generation_time_part(generation_time_statements[statement_key])
+                )
+            else:
+                # late evaluation statements pass straight through
+                self._parts.append(
+                    _get_raw_part(late_evaluation_statements[statement_key])
+                )
+
+    def render_generation_time(self, field_values: Mapping[str, Any]) -> str:
+        """Substitutes generation time statements in the template.
+
+        :param field_values: Values of the fields referenced by the template,
+        keyed as referenced, e.g. `<option>.product.short_name`
+        :type field_values: Mapping[str, Any]
+        :return: Display name with generation time statements substituted
+        :rtype: str
+        """
+        return "".join(part(field_values) for part in self._parts)
+
+
+@functools.lru_cache(maxsize=32)
+def compile_display_name_template(template: str) -> CompiledDisplayNameTemplate:
+    """Returns the compiled form of `template`, compiling each distinct
+    template only once per process.
+
+    :param template: Display name template
+    :type template: str
+    :return: Compiled display name template
+    :rtype: CompiledDisplayNameTemplate
+    """
+    return CompiledDisplayNameTemplate(template)
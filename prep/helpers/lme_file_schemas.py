@@ -0,0 +1,186 @@
+import importlib.util
+from dataclasses import dataclass, field
+from typing import IO, Any, Callable, Dict, Optional, Tuple, Union
+
+import pandas as pd
+
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+RowFilter = Callable[[pd.DataFrame], pd.Series]
+
+
+@dataclass(frozen=True)
+class LMEFileSchema:
+    """Parsing profile for one type of LME overnight file, restricting the
+    columns read to those actually used downstream and pinning their dtypes so
+    pandas doesn't have to infer them.
+
+    Column names are as they appear in the file header, i.e. before they're
+    normalised to lower snake case.
+    """
+
+    file_type: str
+    usecols: Tuple[str, ...]
+    dtypes: Dict[str, str] = field(default_factory=dict)
+    categorical_columns: Tuple[str, ...] = ()
+    date_columns: Tuple[str, ...] = ()
+    date_format: str = r"%Y%m%d"
+
+    def get_read_csv_kwargs(self, engine: Optional[str] = None) -> Dict[str, Any]:
+        if engine is None:
+            engine = "pyarrow" if PYARROW_AVAILABLE else "c"
+        column_dtypes: Dict[str, str] = {
+            date_column: "string" for date_column in self.date_columns
+        }
+        column_dtypes.update(self.dtypes)
+        column_dtypes.update(
+            {
+                categorical_column: "category"
+                for categorical_column in self.categorical_columns
+            }
+        )
+        return {
+            "sep": ",",
+            "engine": engine,
+            "usecols": list(self.usecols),
+            "dtype": column_dtypes,
+        }
+
+    def read_csv(
+        self, lme_file: Union[str, IO], engine: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Reads an LME overnight file according to this schema, date
+        columns are parsed with the fixed `date_format`.
+
+        :param lme_file: Path or binary file object of the LME file
+        :type lme_file: Union[str, IO]
+        :param engine: `read_csv` engine to use, defaults to pyarrow where it's
+        installed, else the C engine
+        :type engine: Optional[str], optional
+        :return: Parsed file data, with normalised column names
+        :rtype: pd.DataFrame
+        """
+        file_dataframe = pd.read_csv(lme_file, **self.get_read_csv_kwargs(engine))
+        return self._parse_date_columns(normalise_column_names(file_dataframe))
+
+    def read_csv_filtered(
+        self, lme_file: Union[str, IO], row_filter: RowFilter, chunksize: int
+    ) -> pd.DataFrame:
+        """Reads an LME overnight file according to this schema in chunks,
+        keeping only the rows matching `row_filter` from each chunk as it's
+        read, so memory use is bounded by the size of the filtered result.
+
+        `row_filter` is given each chunk with normalised column names, but before
+        any date columns have been parsed, dates are only parsed for kept rows.
+
+        :param lme_file: Path or binary file object of the LME file
+        :type lme_file: Union[str, IO]
+        :param row_filter: Returns a boolean mask of the rows in a chunk to keep
+        :type row_filter: RowFilter
+        :param chunksize: Number of rows to read per chunk
+        :type chunksize: int
+        :return: Filtered file data, with normalised column names
+        :rtype: pd.DataFrame
+        """
+        # pyarrow doesn't support chunked reads
+        filtered_chunks = []
+        with pd.read_csv(
+            lme_file, chunksize=chunksize, **self.get_read_csv_kwargs(engine="c")
+        ) as file_chunk_reader:
+            for file_chunk in file_chunk_reader:
+                file_chunk = normalise_column_names(file_chunk)
+                filtered_chunks.append(file_chunk.loc[row_filter(file_chunk)])
+        file_dataframe = pd.concat(filtered_chunks, ignore_index=True)
+        # each chunk has its own categories so concatenation falls back to object
+        for categorical_column in self.categorical_columns:
+            categorical_column = normalise_column_name(categorical_column)
+            file_dataframe[categorical_column] = file_dataframe[
+                categorical_column
+            ].astype("category")
+        return self._parse_date_columns(file_dataframe)
+
+    def _parse_date_columns(self, file_dataframe: pd.DataFrame) -> pd.DataFrame:
+        for date_column in self.date_columns:
+            date_column = normalise_column_name(date_column)
+            file_dataframe[date_column] = pd.to_datetime(
+                file_dataframe[date_column], format=self.date_format
+            )
+        return file_dataframe
+
+
+def normalise_column_name(column_name: str) -> str:
+    return column_name.lower().strip().replace(" ", "_")
+
+
+def normalise_column_names(file_dataframe: pd.DataFrame) -> pd.DataFrame:
+    file_dataframe.columns = (
+        file_dataframe.columns.str.lower().str.strip().str.replace(" ", "_")
+    )
+    return file_dataframe
+
+
+LME_FILE_SCHEMAS: Dict[str, LMEFileSchema] = {
+    "INR": LMEFileSchema(
+        file_type="INR",
+        usecols=("REPORT_DATE", "CURRENCY", "FORWARD_DATE", "INTEREST_RATE"),
+        dtypes={"INTEREST_RATE": "float64"},
+        categorical_columns=("CURRENCY",),
+        date_columns=("REPORT_DATE", "FORWARD_DATE"),
+    ),
+    "EXR": LMEFileSchema(
+        file_type="EXR",
+        usecols=("REPORT_DATE", "CURRENCY_PAIR", "FORWARD_DATE", "EXCHANGE_RATE"),
+        dtypes={"EXCHANGE_RATE": "float64"},
+        categorical_columns=("CURRENCY_PAIR",),
+        date_columns=("REPORT_DATE", "FORWARD_DATE"),
+    ),
+    "FCP": LMEFileSchema(
+        file_type="FCP",
+        usecols=(
+            "REPORT_DATE",
+            "PRICE_TYPE",
+            "UNDERLYING",
+            "CURRENCY",
+            "FORWARD_DATE",
+            "PRICE",
+        ),
+        dtypes={"PRICE": "float64"},
+        categorical_columns=("PRICE_TYPE", "UNDERLYING", "CURRENCY"),
+        date_columns=("REPORT_DATE", "FORWARD_DATE"),
+    ),
+    # forward rows make up the bulk of the file but only option rows are
+    # ingested, so their `UNDERLYING` and `FORWARD_DATE` columns are dropped
+    "CLO": LMEFileSchema(
+        file_type="CLO",
+        usecols=(
+            "REPORT_DATE",
+            "CONTRACT",
+            "CONTRACT_TYPE",
+            "SUB_CONTRACT_TYPE",
+            "FORWARD_MONTH",
+            "STRIKE",
+            "PRICE",
+            "PRICE_TYPE",
+            "VOLATILITY",
+            "DELTA",
+        ),
+        dtypes={
+            "FORWARD_MONTH": "Int64",
+            "STRIKE": "float64",
+            "PRICE": "float64",
+            "VOLATILITY": "float64",
+            "DELTA": "float64",
+        },
+        categorical_columns=(
+            "CONTRACT",
+            "CONTRACT_TYPE",
+            "SUB_CONTRACT_TYPE",
+            "PRICE_TYPE",
+        ),
+        date_columns=("REPORT_DATE",),
+    ),
+}
+
+
+def get_lme_file_schema(file_type: str) -> Optional[LMEFileSchema]:
+    return LME_FILE_SCHEMAS.get(file_type.upper())
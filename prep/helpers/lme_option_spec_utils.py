@@ -0,0 +1,234 @@
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import upedata.enums as upeenums
+from upedata.static_data.option import strike_unpacker
+
+LME_OPTION_SPEC_PATH = os.path.join(
+    os.path.dirname(__file__), "data_files", "lme_option_base_data.json"
+)
+
+
+@dataclass(frozen=True)
+class LMEVolSurfaceSpec:
+    model_type: str
+    params: Mapping[str, float]
+
+
+@dataclass(frozen=True)
+class LMEOptionProductSpec:
+    """Option specification of a single LME product, with the `shared`
+    specification already merged in and the strike grid unpacked from
+    `strike_intervals` once, rather than by every caller needing strikes.
+    """
+
+    product_symbol: str
+    time_type: upeenums.TimeType
+    vol_type: upeenums.VolType
+    display_name: str
+    multiplier: int
+    strike_intervals: Tuple[Tuple[int, int], ...]
+    vol_surface: LMEVolSurfaceSpec
+    strikes: Tuple[float, ...]
+
+    @classmethod
+    def from_dict(
+        cls, product_symbol: str, option_data: Mapping[str, Any]
+    ) -> "LMEOptionProductSpec":
+        """Parses and validates the option specification of a product.
+
+        :param product_symbol: Symbol of the product
+        :type product_symbol: str
+        :param option_data: Option specification of the product, as found
+        under `specific` merged with `shared` in the specification file
+        :type option_data: Mapping[str, Any]
+        :raises ValueError: On a missing field or malformed `strike_intervals`
+        :return: Parsed option specification
+        :rtype: LMEOptionProductSpec
+        """
+        try:
+            strike_intervals = tuple(
+                (int(strike_interval_start), int(strike_interval_stepwidth))
+                for strike_interval_start, strike_interval_stepwidth in option_data[
+                    "strike_intervals"
+                ]
+            )
+            vol_surface = LMEVolSurfaceSpec(
+                model_type=str(option_data["vol_surface"]["model_type"]),
+                params=MappingProxyType(
+                    {
+                        param_name: float(param_value)
+                        for param_name, param_value in option_data["vol_surface"][
+                            "params"
+                        ].items()
+                    }
+                ),
+            )
+            option_product_spec = cls(
+                product_symbol=product_symbol,
+                time_type=upeenums.TimeType(option_data["time_type"]),
+                vol_type=upeenums.VolType(option_data["vol_type"]),
+                display_name=str(option_data["display_name"]),
+                multiplier=int(option_data["multiplier"]),
+                strike_intervals=strike_intervals,
+                vol_surface=vol_surface,
+                strikes=tuple(strike_unpacker(strike_intervals)),  # type: ignore
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(
+                f"Invalid option specification for `{product_symbol}`: {e!r}"
+            ) from e
+
+        if len(strike_intervals) == 0 or strike_intervals[-1][1] >= 0:
+            raise ValueError(
+                f"`strike_intervals` of `{product_symbol}` must end with a "
+                "negative sentinel step width"
+            )
+        if any(
+            strike_interval_stepwidth <= 0
+            for _, strike_interval_stepwidth in strike_intervals[:-1]
+        ) or any(
+            strike_interval[0] >= next_strike_interval[0]
+            for strike_interval, next_strike_interval in zip(
+                strike_intervals, strike_intervals[1:]
+            )
+        ):
+            raise ValueError(
+                f"`strike_intervals` of `{product_symbol}` must be increasing "
+                "with positive step widths"
+            )
+        return option_product_spec
+
+    def get_strike_intervals(self) -> List[List[int]]:
+        """Returns `strike_intervals` in the nested list form stored in static
+        data.
+
+        :return: Packed strike interval construct
+        :rtype: List[List[int]]
+        """
+        return [list(strike_interval) for strike_interval in self.strike_intervals]
+
+
+@dataclass(frozen=True)
+class LMEOptionSpec:
+    products: Mapping[str, LMEOptionProductSpec]
+    mtime_ns: int
+
+    @classmethod
+    def from_dict(cls, option_spec_data: Dict[str, Any], mtime_ns=0) -> "LMEOptionSpec":
+        """Parses and validates the contents of an option specification file,
+        merging the `shared` specification into that of each product.
+
+        :param option_spec_data: Parsed option specification file
+        :type option_spec_data: Dict[str, Any]
+        :param mtime_ns: Modification time of the file, defaults to 0
+        :type mtime_ns: int, optional
+        :raises ValueError: On a malformed specification
+        :return: Parsed option specification
+        :rtype: LMEOptionSpec
+        """
+        if not isinstance(option_spec_data.get("specific"), dict):
+            raise ValueError("Option specification has no `specific` products")
+        shared_option_data = option_spec_data.get("shared", {})
+        return cls(
+            products=MappingProxyType(
+                {
+                    product_symbol: LMEOptionProductSpec.from_dict(
+                        product_symbol, {**product_option_data, **shared_option_data}
+                    )
+                    for product_symbol, product_option_data in option_spec_data[
+                        "specific"
+                    ].items()
+                }
+            ),
+            mtime_ns=mtime_ns,
+        )
+
+
+class LMEOptionSpecLoader:
+    """Loads the LME option specification file once, reloading it only when
+    its modification time changes, so callers across invocations of a warm
+    worker share a single parsed specification.
+    """
+
+    def __init__(self, path: str = LME_OPTION_SPEC_PATH) -> None:
+        self.path = path
+        self._option_spec: Optional[LMEOptionSpec] = None
+        self._raw_option_spec_data: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _reload_if_modified(self):
+        mtime_ns = os.stat(self.path).st_mtime_ns
+        if self._option_spec is not None and self._option_spec.mtime_ns == mtime_ns:
+            return
+        logging.debug("Loading LME option specification from `%s`", self.path)
+        with open(self.path, "r") as fp:
+            raw_option_spec_data = json.load(fp)
+        self._option_spec = LMEOptionSpec.from_dict(raw_option_spec_data, mtime_ns)
+        self._raw_option_spec_data = raw_option_spec_data
+
+    def get_option_spec(self) -> LMEOptionSpec:
+        """Returns the parsed option specification, reloading the file first
+        if it has been modified since last loaded.
+
+        :return: Parsed option specification
+        :rtype: LMEOptionSpec
+        """
+        with self._lock:
+            self._reload_if_modified()
+            return self._option_spec  # type: ignore
+
+    def get_raw_option_spec_data(self) -> Dict[str, Any]:
+        """Returns a copy of the option specification file contents, as
+        parsed from JSON, reloading the file first if it has been modified
+        since last loaded.
+
+        :return: Option specification file contents
+        :rtype: Dict[str, Any]
+        """
+        with self._lock:
+            self._reload_if_modified()
+            # round trip rather than deepcopy, the contents are plain JSON
+            return json.loads(json.dumps(self._raw_option_spec_data))
+
+
+_lme_option_spec_loaders: Dict[str, LMEOptionSpecLoader] = {}
+_lme_option_spec_loaders_lock = threading.Lock()
+
+
+def get_lme_option_spec_loader(
+    path: str = LME_OPTION_SPEC_PATH,
+) -> LMEOptionSpecLoader:
+    """Returns the process wide loader of the option specification at `path`.
+
+    :param path: Path of the option specification file, defaults to
+    LME_OPTION_SPEC_PATH
+    :type path: str, optional
+    :return: Loader of the option specification
+    :rtype: LMEOptionSpecLoader
+    """
+    path = os.path.abspath(path)
+    with _lme_option_spec_loaders_lock:
+        lme_option_spec_loader = _lme_option_spec_loaders.get(path)
+        if lme_option_spec_loader is None:
+            lme_option_spec_loader = LMEOptionSpecLoader(path)
+            _lme_option_spec_loaders[path] = lme_option_spec_loader
+        return lme_option_spec_loader
+
+
+def get_lme_option_spec(path: str = LME_OPTION_SPEC_PATH) -> LMEOptionSpec:
+    """Returns the parsed LME option specification, loaded once per process
+    and reloaded when the file is modified.
+
+    :param path: Path of the option specification file, defaults to
+    LME_OPTION_SPEC_PATH
+    :type path: str, optional
+    :return: Parsed option specification
+    :rtype: LMEOptionSpec
+    """
+    return get_lme_option_spec_loader(path).get_option_spec()
@@ -1,4 +1,3 @@
-import json
 import logging
 from dataclasses import dataclass, field
 from datetime import date, datetime, time
@@ -8,8 +7,7 @@ import numpy as np
 import pandas as pd
 import sqlalchemy.orm
 import upedata.enums as upe_enums
-from dateutil.relativedelta import WE, relativedelta
-from sqlalchemy.dialects.postgresql import insert as pg_insert
+from dateutil.relativedelta import relativedelta
 from upedata.dynamic_data import (
     ExchangeRate,
     FutureClosingPrice,
@@ -18,7 +16,7 @@ from upedata.dynamic_data import (
 )
 from zoneinfo import ZoneInfo
 
-from prep.helpers import rjo_sftp_utils
+from prep.helpers import lme_option_spec_utils, pg_copy_utils, rjo_sftp_utils
 
 LME_PRODUCT_NAMES = ["AHD", "CAD", "PBD", "ZSD", "NID"]
 LME_METAL_NAMES = ["aluminium", "copper", "lead", "zinc", "nickel"]
@@ -48,6 +46,9 @@ LME_PRODUCT_NAME_MAP = {
     for lme_product_name, lme_metal_name in zip(LME_PRODUCT_NAMES, LME_METAL_NAMES)
 }
 _DEFAULT_FORWARD_MONTHS = 18
+_PUT_OR_CALL_LOOKUP = np.array(
+    [upe_enums.CallOrPut.PUT, upe_enums.CallOrPut.CALL], dtype=object
+)
 
 
 @dataclass
@@ -105,11 +106,20 @@ class LMEFuturesCurve:
 
 
 def fetch_lme_option_specification_data(
-    path="./prep/helpers/data_files/lme_option_base_data.json",
+    path=lme_option_spec_utils.LME_OPTION_SPEC_PATH,
 ) -> Dict:
-    with open(path, "r") as fp:
-        option_spec_data = json.load(fp)
-    return option_spec_data
+    """Returns a copy of the LME option specification file contents, the file
+    itself only being read once per process and again when modified.
+
+    :param path: Path of the option specification file, defaults to
+    `lme_option_spec_utils.LME_OPTION_SPEC_PATH`
+    :type path: str, optional
+    :return: Option specification file contents
+    :rtype: Dict
+    """
+    return lme_option_spec_utils.get_lme_option_spec_loader(
+        path
+    ).get_raw_option_spec_data()
 
 
 def pull_lme_exchange_rates(
@@ -120,7 +130,6 @@ def pull_lme_exchange_rates(
     exchange_rate_datetimes, exchange_rate_dfs = rjo_sftp_utils.get_lme_overnight_data(
         "EXR",
         num_recent_or_since_dt=num_data_dates_to_pull,
-        date_cols_to_parse=["REPORT_DATE", "FORWARD_DATE"],
     )
     if len(exchange_rate_datetimes) == 0:
         return datetime(1970, 1, 1), []
@@ -182,8 +191,9 @@ def update_lme_exchange_rate_data(
     for exr_obj in exchange_rates:
         exr_list_of_dicts.append(exr_obj.to_dict())
     if len(exr_list_of_dicts) > 0:
-        stmt = pg_insert(ExchangeRate).on_conflict_do_nothing()
-        sqla_session.execute(stmt, exr_list_of_dicts)
+        pg_copy_utils.copy_insert_on_conflict_do_nothing(
+            sqla_session, ExchangeRate, exr_list_of_dicts
+        )
 
     return df_dt
 
@@ -203,7 +213,6 @@ def pull_lme_interest_rate_curve(
         ) = rjo_sftp_utils.get_lme_overnight_data(
             "INR",
             num_recent_or_since_dt=num_data_dates_to_pull,
-            date_cols_to_parse=["REPORT_DATE", "FORWARD_DATE"],
         )
         if len(interest_rate_datetimes) == 0:
             return datetime(1970, 1, 1), set(), []
@@ -259,7 +268,7 @@ def pull_lme_interest_rate_curve(
 def update_lme_interest_rate_static_data(
     sqla_session: sqlalchemy.orm.Session,
     most_recent_datetime: Union[int, datetime],
-) -> Tuple[datetime, Set[str]]:
+) -> Tuple[datetime, Set[str], List[InterestRate]]:
     LME_CURRENCY_DATA = {"USD": "usd", "EUR": "eur", "GBP": "gbp", "JPY": "jpy"}
     df_dt, updated_currencies, interest_rates = pull_lme_interest_rate_curve(
         LME_CURRENCY_DATA, num_data_dates_to_pull=most_recent_datetime
@@ -269,75 +278,214 @@ def update_lme_interest_rate_static_data(
         interest_rate_list_of_dicts.append(interest_rate_obj.to_dict())
 
     if len(interest_rates) > 0:
-        stmt = pg_insert(InterestRate).on_conflict_do_nothing()
-        sqla_session.execute(stmt, interest_rate_list_of_dicts)
+        pg_copy_utils.copy_insert_on_conflict_do_nothing(
+            sqla_session, InterestRate, interest_rate_list_of_dicts
+        )
     else:
         pass
 
-    return df_dt, updated_currencies
+    return df_dt, updated_currencies, interest_rates
 
 
-def pull_lme_options_closing_price_data(
+def build_most_recent_interest_rate_curves(
+    interest_rates: List[InterestRate], from_date: date
+) -> pd.DataFrame:
+    """Builds the most recently published curve for each currency from
+    interest rates that have just been parsed, mirroring the latest curve query
+    run against `interest_rates` but without the round trip.
+
+    Rates are rounded to the scale of the `continuous_rate` column so the
+    curves match those read back from the database.
+
+    :param interest_rates: Interest rates pulled from LME INR files
+    :type interest_rates: List[InterestRate]
+    :param from_date: Earliest `to_date` to include in the curves
+    :type from_date: date
+    :return: Frame of `currency_symbol`, `to_date` and `continuous_rate`
+    :rtype: pd.DataFrame
+    """
+    interest_rate_df = pd.DataFrame.from_records(
+        [
+            (
+                interest_rate.currency_symbol,
+                interest_rate.to_date,
+                interest_rate.published_date,
+                interest_rate.continuous_rate,
+            )
+            for interest_rate in interest_rates
+        ],
+        columns=["currency_symbol", "to_date", "published_date", "continuous_rate"],
+    )
+    interest_rate_df["to_date"] = pd.to_datetime(interest_rate_df["to_date"])
+    interest_rate_df["published_date"] = pd.to_datetime(
+        interest_rate_df["published_date"]
+    )
+    interest_rate_df = interest_rate_df.loc[
+        interest_rate_df["to_date"] >= pd.Timestamp(from_date)
+    ]
+    interest_rate_df = interest_rate_df.sort_values(
+        ["currency_symbol", "to_date", "published_date"]
+    ).drop_duplicates(["currency_symbol", "to_date"], keep="last")
+    interest_rate_df["continuous_rate"] = (
+        interest_rate_df["continuous_rate"]
+        .astype(float)
+        .round(InterestRate.__table__.columns["continuous_rate"].type.scale)
+    )
+    return interest_rate_df.loc[
+        :, ["currency_symbol", "to_date", "continuous_rate"]
+    ].reset_index(drop=True)
+
+
+def is_lme_option_closing_row(closing_price_df: pd.DataFrame) -> pd.Series:
+    """Row filter for CLO files selecting only option closing prices for
+    the contracts we trade.
+
+    :param closing_price_df: Chunk of a CLO file with normalised column names
+    :type closing_price_df: pd.DataFrame
+    :return: Boolean mask of the rows to keep
+    :rtype: pd.Series
+    """
+    return (
+        (closing_price_df["contract_type"].str.upper() == "LMEOPTION")
+        & (closing_price_df["price_type"].str.upper() == "CLOSING")
+        & (closing_price_df["contract"].str.upper().isin(LME_PRODUCT_NAMES))
+    )
+
+
+def get_first_wednesday_expiries(forward_months: pd.Series) -> pd.Series:
+    """Maps `YYYYMM` forward months to the first Wednesday of each month, the
+    LME option expiry convention, computing each distinct month only once.
+
+    :param forward_months: Integer `YYYYMM` forward months
+    :type forward_months: pd.Series
+    :return: First Wednesday of each forward month, aligned with the input
+    :rtype: pd.Series
+    """
+    unique_months = pd.unique(forward_months.dropna().astype("int64"))
+    if len(unique_months) == 0:
+        return pd.Series(index=forward_months.index, dtype="datetime64[ns]")
+    first_days = pd.to_datetime(
+        pd.DataFrame(
+            {"year": unique_months // 100, "month": unique_months % 100, "day": 1}
+        )
+    )
+    first_wednesdays = first_days + pd.to_timedelta(
+        (2 - first_days.dt.weekday) % 7, unit="D"
+    )
+    month_to_expiry = pd.Series(first_wednesdays.to_numpy(), index=unique_months)
+    return forward_months.map(month_to_expiry).astype("datetime64[ns]")
+
+
+def build_lme_option_closing_price_columns(
+    closing_price_dt: datetime,
+    closing_price_df: pd.DataFrame,
+    current_dt: datetime,
+) -> pd.DataFrame:
+    """Builds insert-ready option closing price columns from a (filtered) CLO
+    file without going through `OptionClosingPrice` objects, only options
+    expiring between the file date and the end of the default forward window
+    are kept.
+
+    :param closing_price_dt: Datetime of the CLO file
+    :type closing_price_dt: datetime
+    :param closing_price_df: Option closing rows of the CLO file
+    :type closing_price_df: pd.DataFrame
+    :param current_dt: Datetime the forward window is calculated from
+    :type current_dt: datetime
+    :return: Frame with one column per `option_closing_prices` table column
+    :rtype: pd.DataFrame
+    """
+    expiry_dates = get_first_wednesday_expiries(closing_price_df["forward_month"])
+    within_forward_window = expiry_dates.between(
+        np.datetime64(closing_price_dt, "ns"),
+        np.datetime64(
+            current_dt + relativedelta(months=_DEFAULT_FORWARD_MONTHS - 1), "ns"
+        ),
+    )
+    closing_price_df = closing_price_df.loc[within_forward_window]
+    expiry_dates = expiry_dates.loc[within_forward_window]
+
+    option_symbols = (
+        "xlme-"
+        + closing_price_df["contract"]
+        .astype(str)
+        .str.upper()
+        .map(LME_PRODUCT_IDENTIFIER_MAP)
+        + "-usd o "
+        + expiry_dates.dt.strftime(r"%y-%m-%d")
+        + " a"
+    )
+    # indexing into an object array keeps the enum members, numpy would otherwise
+    # collapse them down to plain ints
+    call_or_put = _PUT_OR_CALL_LOOKUP[
+        (closing_price_df["sub_contract_type"] == "C").to_numpy().astype(np.intp)
+    ]
+    return pd.DataFrame(
+        {
+            "close_date": closing_price_df["report_date"].dt.date.to_numpy(),
+            "option_symbol": option_symbols.to_numpy(),
+            "option_strike": closing_price_df["strike"].astype(float).to_numpy(),
+            "call_or_put": call_or_put,
+            "close_price": closing_price_df["price"].to_numpy(),
+            "close_volatility": closing_price_df["volatility"].to_numpy(),
+            "close_delta": closing_price_df["delta"].to_numpy(),
+        }
+    )
+
+
+def pull_lme_options_closing_price_columns(
     num_data_dates_to_pull: Union[int, datetime],
-) -> Tuple[datetime, pd.DataFrame, List[OptionClosingPrice]]:
+) -> Tuple[datetime, pd.DataFrame, pd.DataFrame]:
+    """Pulls LME option closing prices as insert-ready columns, see
+    `build_lme_option_closing_price_columns`.
+
+    :param num_data_dates_to_pull: Number of files to count back (n <= 0 -> all files),
+    or datetime in which case files with a datetime more recent than it will be pulled
+    :type num_data_dates_to_pull: Union[int, datetime]
+    :return: Datetime of the most recent file, its (filtered) data, and the closing
+    price columns from all files pulled
+    :rtype: Tuple[datetime, pd.DataFrame, pd.DataFrame]
+    """
     current_dt = datetime.now(tz=ZoneInfo("Europe/London")).replace(hour=19)
     closing_price_datetimes, closing_price_dfs = rjo_sftp_utils.get_lme_overnight_data(
         "CLO",
         num_recent_or_since_dt=num_data_dates_to_pull,
-        date_cols_to_parse=["REPORT_DATE", "FORWARD_DATE"],
+        # filters for just those within the contracts we trade that are option
+        # closing prices as the file is read
+        row_filter=is_lme_option_closing_row,
     )
     if len(closing_price_datetimes) == 0:
-        return (datetime(1970, 1, 1), pd.DataFrame(), [])
+        return (datetime(1970, 1, 1), pd.DataFrame(), pd.DataFrame())
 
-    bulk_closing_prices: List[OptionClosingPrice] = []
-    for closing_price_dt, closing_price_df in zip(
-        closing_price_datetimes, closing_price_dfs
-    ):
-        # filters for just those within the contracts we trade that are option
-        # closing prices
-        closing_price_df = closing_price_df[
-            (closing_price_df["contract_type"].str.upper() == "LMEOPTION")
-            & (closing_price_df["price_type"].str.upper() == "CLOSING")
-            & (closing_price_df["contract"].str.upper().isin(LME_PRODUCT_NAMES))
-        ]
-        pd.options.mode.chained_assignment = None
-        closing_price_df.loc[:, "expiry_date"] = closing_price_df.loc[
-            :, "forward_month"
-        ].apply(
-            lambda yyyy_mm_int: np.datetime64(
-                datetime.strptime(f"{str(int(yyyy_mm_int))}01", r"%Y%m%d")
-                + relativedelta(weekday=WE(1)),
-                "ns",
+    closing_price_columns = pd.concat(
+        [
+            build_lme_option_closing_price_columns(
+                closing_price_dt, closing_price_df, current_dt
             )
-        )
-        pd.options.mode.chained_assignment = "warn"
-        for row in closing_price_df.loc[
-            closing_price_df["expiry_date"].between(
-                np.datetime64(closing_price_dt, "ns"),
-                np.datetime64(
-                    current_dt + relativedelta(months=_DEFAULT_FORWARD_MONTHS - 1), "ns"
-                ),
-            )
-        ].itertuples(index=False):
-            option_internal_identifier = LME_PRODUCT_IDENTIFIER_MAP[
-                row.contract.upper()
-            ]
-            bulk_closing_prices.append(
-                OptionClosingPrice(
-                    close_date=row.report_date.date(),
-                    option_symbol=f"xlme-{option_internal_identifier}-usd o {row.expiry_date.strftime(r'%y-%m-%d')} a",
-                    option_strike=float(row.strike),
-                    call_or_put=upe_enums.CallOrPut.CALL
-                    if row.sub_contract_type == "C"
-                    else upe_enums.CallOrPut.PUT,
-                    close_price=row.price,
-                    close_volatility=row.volatility,
-                    close_delta=row.delta,
-                )
+            for closing_price_dt, closing_price_df in zip(
+                closing_price_datetimes, closing_price_dfs
             )
-    logging.info("Found %s option closing prices", len(bulk_closing_prices))
+        ],
+        ignore_index=True,
+    )
+    logging.info("Found %s option closing prices", len(closing_price_columns))
 
-    return closing_price_datetimes[0], closing_price_dfs[0], bulk_closing_prices
+    return closing_price_datetimes[0], closing_price_dfs[0], closing_price_columns
+
+
+def pull_lme_options_closing_price_data(
+    num_data_dates_to_pull: Union[int, datetime],
+) -> Tuple[datetime, pd.DataFrame, List[OptionClosingPrice]]:
+    (
+        most_recent_dt,
+        most_recent_df,
+        closing_price_columns,
+    ) = pull_lme_options_closing_price_columns(num_data_dates_to_pull)
+    bulk_closing_prices = [
+        OptionClosingPrice(**closing_price_row._asdict())
+        for closing_price_row in closing_price_columns.itertuples(index=False)
+    ]
+    return most_recent_dt, most_recent_df, bulk_closing_prices
 
 
 def pull_lme_futures_closing_price_data(
@@ -347,7 +495,6 @@ def pull_lme_futures_closing_price_data(
     closing_price_datetimes, closing_price_dfs = rjo_sftp_utils.get_lme_overnight_data(
         "FCP",
         num_recent_or_since_dt=num_data_dates_to_pull,
-        date_cols_to_parse=["REPORT_DATE", "FORWARD_DATE"],
     )
     if len(closing_price_datetimes) == 0:
         return datetime(1970, 1, 1), pd.DataFrame(), []
@@ -402,8 +549,9 @@ def update_lme_futures_closing_price_data(
     for fcp_obj in future_closing_prices:
         fcp_list_of_dicts.append(fcp_obj.to_dict())
     if len(fcp_list_of_dicts) > 0:
-        stmt = pg_insert(FutureClosingPrice).on_conflict_do_nothing()
-        sqla_session.execute(stmt, fcp_list_of_dicts)
+        pg_copy_utils.copy_insert_on_conflict_do_nothing(
+            sqla_session, FutureClosingPrice, fcp_list_of_dicts
+        )
 
     return most_recent_dt, most_recent_df
 
@@ -415,13 +563,13 @@ def update_lme_options_closing_price_data(
     (
         most_recent_dt,
         most_recent_df,
-        option_closing_prices,
-    ) = pull_lme_options_closing_price_data(num_data_dates_to_pull=most_recent_datetime)
-    clo_list_of_dicts: List[Dict[str, Any]] = []
-    for clo_obj in option_closing_prices:
-        clo_list_of_dicts.append(clo_obj.to_dict())
-    if len(clo_list_of_dicts) > 0:
-        stmt = pg_insert(OptionClosingPrice).on_conflict_do_nothing()
-        sqla_session.execute(stmt, clo_list_of_dicts)
+        closing_price_columns,
+    ) = pull_lme_options_closing_price_columns(
+        num_data_dates_to_pull=most_recent_datetime
+    )
+    if len(closing_price_columns) > 0:
+        pg_copy_utils.copy_insert_on_conflict_do_nothing(
+            sqla_session, OptionClosingPrice, closing_price_columns
+        )
 
     return most_recent_dt, most_recent_df
@@ -0,0 +1,268 @@
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+import pandas as pd
+import sqlalchemy
+import sqlalchemy.orm
+from psycopg import sql
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+BulkRows = Union[pd.DataFrame, Sequence[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class BulkInsertResult:
+    table_name: str
+    rows_staged: int
+    rows_inserted: int
+
+    @property
+    def rows_skipped(self) -> int:
+        return self.rows_staged - self.rows_inserted
+
+
+def _is_null(value: Any) -> bool:
+    return value is None or value is pd.NaT or value is pd.NA
+
+
+def _to_date(value: Any) -> Any:
+    if _is_null(value):
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return pd.Timestamp(value).date()
+
+
+def _to_datetime(value: Any) -> Any:
+    if _is_null(value):
+        return None
+    return pd.Timestamp(value).to_pydatetime()
+
+
+def _to_float(value: Any) -> Any:
+    return None if _is_null(value) else float(value)
+
+
+def _to_decimal(value: Any) -> Any:
+    if _is_null(value):
+        return None
+    if isinstance(value, Decimal):
+        return value
+    # via `str` so floats are staged as their shortest repr rather than their
+    # exact binary expansion, e.g. `2150.1` and not `2150.09999...`
+    return Decimal(str(value))
+
+
+def _to_int(value: Any) -> Any:
+    return None if _is_null(value) else int(value)
+
+
+def _to_bool(value: Any) -> Any:
+    return None if _is_null(value) else bool(value)
+
+
+def _to_text(value: Any) -> Any:
+    return None if _is_null(value) else str(value)
+
+
+def _get_enum_label_converter(
+    enum_class: Optional[Type[Enum]],
+) -> Callable[[Any], Any]:
+    # sqlalchemy persists python enums by member name, pandas will happily
+    # turn an `IntEnum` column back into plain ints so map those too
+    def _to_enum_label(value: Any) -> Any:
+        if _is_null(value):
+            return None
+        if isinstance(value, Enum):
+            return value.name
+        if enum_class is not None and not isinstance(value, str):
+            return enum_class(value).name
+        return str(value)
+
+    return _to_enum_label
+
+
+def get_staging_column_type(
+    column: sqlalchemy.Column,
+) -> Tuple[str, Callable[[Any], Any]]:
+    """Returns the Postgres type used to stage values for `column` in a
+    binary COPY, and the function converting python values to it.
+
+    Numeric columns are staged as `numeric` so no precision is lost on the
+    way in, floats as `float8`, and enums as `text`, all being cast to the
+    real column type when moved out of the staging table.
+
+    :param column: Column of the table being loaded into
+    :type column: sqlalchemy.Column
+    :return: Staging Postgres type name and value converter
+    :rtype: Tuple[str, Callable[[Any], Any]]
+    """
+    column_type = column.type
+    if isinstance(column_type, sqlalchemy.Enum):
+        return "text", _get_enum_label_converter(column_type.enum_class)
+    if isinstance(column_type, sqlalchemy.DateTime):
+        return ("timestamptz" if column_type.timezone else "timestamp"), _to_datetime
+    if isinstance(column_type, sqlalchemy.Date):
+        return "date", _to_date
+    if isinstance(column_type, sqlalchemy.Float):
+        return "float8", _to_float
+    if isinstance(column_type, sqlalchemy.Numeric):
+        return "numeric", _to_decimal
+    if isinstance(column_type, sqlalchemy.Integer):
+        return "int8", _to_int
+    if isinstance(column_type, sqlalchemy.Boolean):
+        return "bool", _to_bool
+    if isinstance(column_type, sqlalchemy.String):
+        return "text", _to_text
+    raise ValueError(
+        f"Unable to stage column `{column.name}` of type `{column_type}` for COPY"
+    )
+
+
+def _get_column_names(table: sqlalchemy.Table, rows: BulkRows) -> List[str]:
+    if isinstance(rows, pd.DataFrame):
+        present_columns = set(rows.columns)
+    else:
+        present_columns = set(rows[0].keys())
+    return [column.name for column in table.columns if column.name in present_columns]
+
+
+def _iter_row_values(rows: BulkRows, column_names: List[str]) -> Iterable[Tuple]:
+    if isinstance(rows, pd.DataFrame):
+        return zip(*(rows[column_name].to_numpy() for column_name in column_names))
+    return (tuple(row[column_name] for column_name in column_names) for row in rows)
+
+
+def copy_insert_on_conflict_do_nothing(
+    sqla_session: sqlalchemy.orm.Session,
+    orm_class: Any,
+    rows: BulkRows,
+) -> BulkInsertResult:
+    """Bulk inserts `rows` into the table of `orm_class`, skipping any that
+    conflict with rows already present.
+
+    Rows are streamed into a temporary staging table with a binary
+    `COPY ... FROM STDIN` and then moved across in a single
+    `INSERT ... SELECT ... ON CONFLICT DO NOTHING`, which is far quicker than
+    an executemany for the tens of thousands of rows in a multi-day backfill.
+    Runs within the session's current transaction.
+
+    :param sqla_session: Session to insert through
+    :type sqla_session: sqlalchemy.orm.Session
+    :param orm_class: Mapped class of the table being inserted into
+    :type orm_class: Any
+    :param rows: Frame or list of dicts keyed by column name, any columns not
+    provided are left to their defaults
+    :type rows: BulkRows
+    :return: Counts of the rows staged and actually inserted
+    :rtype: BulkInsertResult
+    """
+    table: sqlalchemy.Table = orm_class.__table__
+    if len(rows) == 0:
+        return BulkInsertResult(table.name, 0, 0)
+    column_names = _get_column_names(table, rows)
+    sqla_connection = sqla_session.connection()
+
+    if sqla_connection.dialect.driver != "psycopg":
+        # COPY needs psycopg 3, anything else gets the plain executemany
+        if isinstance(rows, pd.DataFrame):
+            rows = rows.loc[:, column_names].to_dict("records")
+        insert_result = sqla_session.execute(
+            pg_insert(table).on_conflict_do_nothing(), rows
+        )
+        return BulkInsertResult(table.name, len(rows), max(insert_result.rowcount, 0))  # type: ignore
+
+    staging_types: List[str] = []
+    value_converters: List[Callable[[Any], Any]] = []
+    target_types: List[str] = []
+    for column_name in column_names:
+        staging_type, value_converter = get_staging_column_type(
+            table.columns[column_name]
+        )
+        staging_types.append(staging_type)
+        value_converters.append(value_converter)
+        target_types.append(
+            table.columns[column_name].type.compile(dialect=postgresql.dialect())
+        )
+
+    table_identifier = (
+        sql.Identifier(table.schema, table.name)
+        if table.schema is not None
+        else sql.Identifier(table.name)
+    )
+    staging_identifier = sql.Identifier(f"_staging_{table.name}_{uuid.uuid4().hex[:8]}")
+    column_identifiers = sql.SQL(", ").join(map(sql.Identifier, column_names))
+
+    psycopg_connection = sqla_connection.connection.driver_connection
+    with psycopg_connection.cursor() as cursor:  # type: ignore
+        cursor.execute(
+            sql.SQL("CREATE TEMP TABLE {} ({}) ON COMMIT DROP").format(
+                staging_identifier,
+                sql.SQL(", ").join(
+                    sql.SQL("{} {}").format(
+                        sql.Identifier(column_name), sql.SQL(staging_type)
+                    )
+                    for column_name, staging_type in zip(column_names, staging_types)
+                ),
+            )
+        )
+        rows_staged = 0
+        with cursor.copy(
+            sql.SQL("COPY {} ({}) FROM STDIN (FORMAT BINARY)").format(
+                staging_identifier, column_identifiers
+            )
+        ) as copy:
+            copy.set_types(staging_types)
+            for row_values in _iter_row_values(rows, column_names):
+                copy.write_row(
+                    [
+                        value_converter(value)
+                        for value_converter, value in zip(value_converters, row_values)
+                    ]
+                )
+                rows_staged += 1
+        cursor.execute(
+            sql.SQL(
+                "INSERT INTO {} ({}) SELECT {} FROM {} ON CONFLICT DO NOTHING"
+            ).format(
+                table_identifier,
+                column_identifiers,
+                sql.SQL(", ").join(
+                    sql.SQL("CAST({} AS {})").format(
+                        sql.Identifier(column_name), sql.SQL(target_type)
+                    )
+                    for column_name, target_type in zip(column_names, target_types)
+                ),
+                staging_identifier,
+            )
+        )
+        rows_inserted = max(cursor.rowcount, 0)
+        cursor.execute(sql.SQL("DROP TABLE {}").format(staging_identifier))
+
+    bulk_insert_result = BulkInsertResult(table.name, rows_staged, rows_inserted)
+    logging.info(
+        "Bulk inserted %s rows into `%s`, skipped %s already present",
+        bulk_insert_result.rows_inserted,
+        bulk_insert_result.table_name,
+        bulk_insert_result.rows_skipped,
+    )
+    return bulk_insert_result
@@ -0,0 +1,96 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import ujson
+
+
+def format_curve_dates(curve_index: pd.DatetimeIndex) -> List[str]:
+    """Formats curve dates as `%Y%m%d` strings, built from the integer date
+    fields as `DatetimeIndex.strftime` formats each date individually.
+
+    :param curve_index: Dates of the curve
+    :type curve_index: pd.DatetimeIndex
+    :return: Dates formatted as `%Y%m%d`
+    :rtype: List[str]
+    """
+    curve_dates_Ymd = (
+        curve_index.year.to_numpy() * 10000
+        + curve_index.month.to_numpy() * 100
+        + curve_index.day.to_numpy()
+    )
+    return list(map(str, curve_dates_Ymd.tolist()))
+
+
+def _get_curve_dates_and_values(
+    curve_index: pd.DatetimeIndex,
+    curve_values: np.ndarray,
+    value_decimals: Optional[int],
+) -> Tuple[list, list]:
+    if len(curve_index) != len(curve_values):
+        raise ValueError(
+            f"Curve has {len(curve_index)} dates but {len(curve_values)} values"
+        )
+    curve_values_list = np.asarray(curve_values, dtype=np.float64).tolist()
+    if value_decimals is not None:
+        # `np.round` scales then rounds, so can land the other side of a half
+        # to python's correctly rounded `round`, which payloads have always used
+        curve_values_list = [
+            round(curve_value, value_decimals) for curve_value in curve_values_list
+        ]
+    return format_curve_dates(curve_index), curve_values_list
+
+
+def serialise_curve_payload(
+    curve_index: pd.DatetimeIndex,
+    curve_values: np.ndarray,
+    value_decimals: Optional[int] = None,
+) -> str:
+    """Serialises a daily curve to the `{"%Y%m%d": value}` JSON stored in
+    redis, formatting all the dates in one go rather than row by row.
+
+    :param curve_index: Dates of the curve
+    :type curve_index: pd.DatetimeIndex
+    :param curve_values: Value of the curve on each date
+    :type curve_values: np.ndarray
+    :param value_decimals: Decimal places to round values to, defaults to None
+    :type value_decimals: Optional[int], optional
+    :return: JSON curve payload
+    :rtype: str
+    """
+    curve_dates, curve_values_list = _get_curve_dates_and_values(
+        curve_index, curve_values, value_decimals
+    )
+    return ujson.dumps(dict(zip(curve_dates, curve_values_list)))
+
+
+def serialise_legacy_and_new_curve_payloads(
+    curve_index: pd.DatetimeIndex,
+    curve_values: np.ndarray,
+    legacy_value_key: str,
+    value_decimals: Optional[int] = None,
+) -> Tuple[str, str]:
+    """Serialises a daily curve to both the legacy
+    `{"%Y%m%d": {legacy_value_key: value}}` and new `{"%Y%m%d": value}` JSON
+    payloads stored in redis, in a single pass over the curve.
+
+    :param curve_index: Dates of the curve
+    :type curve_index: pd.DatetimeIndex
+    :param curve_values: Value of the curve on each date
+    :type curve_values: np.ndarray
+    :param legacy_value_key: Key each value is nested under in the legacy payload
+    :type legacy_value_key: str
+    :param value_decimals: Decimal places to round values to, defaults to None
+    :type value_decimals: Optional[int], optional
+    :return: Legacy and new JSON curve payloads
+    :rtype: Tuple[str, str]
+    """
+    curve_dates, curve_values_list = _get_curve_dates_and_values(
+        curve_index, curve_values, value_decimals
+    )
+    legacy_curve_data = {}
+    new_curve_data = {}
+    for curve_date, curve_value in zip(curve_dates, curve_values_list):
+        legacy_curve_data[curve_date] = {legacy_value_key: curve_value}
+        new_curve_data[curve_date] = curve_value
+    return ujson.dumps(legacy_curve_data), ujson.dumps(new_curve_data)
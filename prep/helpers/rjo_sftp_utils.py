@@ -1,10 +1,65 @@
+import paramiko
 import paramiko.client
 import pandas
 
-from typing import Tuple, List, Union, Optional
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import (
+    IO,
+    Callable,
+    Dict,
+    Iterator,
+    Tuple,
+    List,
+    TypeVar,
+    Union,
+    Optional,
+)
 from datetime import datetime
+import hashlib
+import io
 import logging
 import os
+import re
+import tempfile
+import threading
+import time
+
+from prep.helpers.lme_file_schemas import (
+    LMEFileSchema,
+    RowFilter,
+    get_lme_file_schema,
+    normalise_column_names,
+)
+
+LME_PRICES_DIRECTORY = "/LMEPrices"
+RJO_SFTP_MAX_IDLE_SESSIONS = int(os.getenv("RJO_SFTP_MAX_IDLE_SESSIONS", "2"))
+RJO_SFTP_IDLE_TIMEOUT_SECONDS = float(os.getenv("RJO_SFTP_IDLE_TIMEOUT_SECONDS", "900"))
+RJO_SFTP_KEEPALIVE_SECONDS = int(os.getenv("RJO_SFTP_KEEPALIVE_SECONDS", "30"))
+# the file type timers are staggered by 7-10 minutes, so anything much longer than
+# this will start delaying pickup of newly published files by a polling cycle
+LME_DIRECTORY_INDEX_TTL_SECONDS = float(
+    os.getenv("LME_DIRECTORY_INDEX_TTL_SECONDS", "120")
+)
+RJO_FILE_CACHE_DIRECTORY = os.getenv(
+    "RJO_FILE_CACHE_DIRECTORY",
+    os.path.join(tempfile.gettempdir(), "prep_rjo_file_cache"),
+)
+# a value <= 0 disables the local file cache entirely
+RJO_FILE_CACHE_MAX_BYTES = int(
+    os.getenv("RJO_FILE_CACHE_MAX_BYTES", str(512 * 2**20))
+)
+# number of files fetched at once, each over its own SFTP channel on the pooled
+# connection, and the number of processes to parse them in. Parsing defaults to
+# the fetching threads as forking the functions worker process isn't free
+LME_FETCH_CONCURRENCY = int(os.getenv("LME_FETCH_CONCURRENCY", "4"))
+LME_PARSE_PROCESSES = int(os.getenv("LME_PARSE_PROCESSES", "0"))
+# rows read per chunk when filtering rows as files are streamed in
+LME_STREAMING_CHUNKSIZE = int(os.getenv("LME_STREAMING_CHUNKSIZE", "2000"))
+LME_FILENAME_PATTERN = re.compile(r"^(\d{8})_([A-Z]+)_r\.csv$")
+
+T = TypeVar("T")
 
 
 def get_rjo_ssh_client() -> paramiko.client.SSHClient:
@@ -24,10 +79,667 @@ def get_rjo_ssh_client() -> paramiko.client.SSHClient:
     return ssh_client
 
 
+@dataclass
+class _RJOSFTPSession:
+    ssh_client: paramiko.client.SSHClient
+    sftp_client: paramiko.SFTPClient
+    last_used: float = field(default_factory=time.monotonic)
+
+    def is_alive(self) -> bool:
+        transport = self.ssh_client.get_transport()
+        return transport is not None and transport.is_active()
+
+    def close(self):
+        # the server may well have hung up on us already, at which point
+        # there's nothing useful to do with any errors raised here
+        try:
+            self.sftp_client.close()
+        except Exception:
+            pass
+        try:
+            self.ssh_client.close()
+        except Exception:
+            pass
+
+
+class RJOSFTPSessionPool:
+    """Keeps authenticated RJO SFTP sessions alive between calls so a warm
+    function host only pays for the SSH handshake once, rather than on every
+    poll of every LME file type.
+
+    Sessions are health-checked when borrowed, dropped once they've sat idle
+    for longer than `idle_timeout` seconds, and kept alive in the meantime with
+    SSH keepalive packets. Operations run through `run` are retried once on a
+    fresh session if the pooled one turns out to have died underneath us.
+    """
+
+    def __init__(
+        self,
+        client_factory: Optional[Callable[[], paramiko.client.SSHClient]] = None,
+        max_idle_sessions: int = RJO_SFTP_MAX_IDLE_SESSIONS,
+        idle_timeout: float = RJO_SFTP_IDLE_TIMEOUT_SECONDS,
+        keepalive_interval: int = RJO_SFTP_KEEPALIVE_SECONDS,
+    ) -> None:
+        self._client_factory = client_factory
+        self.max_idle_sessions = max_idle_sessions
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        self._idle_sessions: List[_RJOSFTPSession] = []
+        self._lock = threading.Lock()
+
+    def _open_session(self) -> _RJOSFTPSession:
+        # looked up at call time so patching `get_rjo_ssh_client` still works
+        client_factory = self._client_factory or get_rjo_ssh_client
+        ssh_client = client_factory()
+        transport = ssh_client.get_transport()
+        if transport is not None and self.keepalive_interval > 0:
+            transport.set_keepalive(self.keepalive_interval)
+        try:
+            sftp_client = ssh_client.open_sftp()
+        except Exception:
+            ssh_client.close()
+            raise
+        logging.debug("Opened new pooled RJO SFTP session")
+        return _RJOSFTPSession(ssh_client, sftp_client)
+
+    def _acquire(self) -> Tuple[_RJOSFTPSession, bool]:
+        stale_sessions: List[_RJOSFTPSession] = []
+        session = None
+        with self._lock:
+            while self._idle_sessions:
+                candidate = self._idle_sessions.pop()
+                if (
+                    time.monotonic() - candidate.last_used < self.idle_timeout
+                    and candidate.is_alive()
+                ):
+                    session = candidate
+                    break
+                stale_sessions.append(candidate)
+        for stale_session in stale_sessions:
+            logging.debug("Dropping stale pooled RJO SFTP session")
+            stale_session.close()
+        if session is not None:
+            return session, True
+        return self._open_session(), False
+
+    def _release(self, session: _RJOSFTPSession):
+        if session.is_alive():
+            session.last_used = time.monotonic()
+            with self._lock:
+                if len(self._idle_sessions) < self.max_idle_sessions:
+                    self._idle_sessions.append(session)
+                    return
+        session.close()
+
+    @contextmanager
+    def borrow(self) -> Iterator[paramiko.SFTPClient]:
+        """Borrows an SFTP client from the pool for the duration of the
+        `with` block, returning it afterwards if it's still usable.
+
+        :yield: Connected RJO SFTP client
+        :rtype: Iterator[paramiko.SFTPClient]
+        """
+        session, _ = self._acquire()
+        try:
+            yield session.sftp_client
+        finally:
+            self._release(session)
+
+    def run(self, sftp_operation: Callable[[paramiko.SFTPClient], T]) -> T:
+        """Runs `sftp_operation` against a pooled SFTP client, if a reused
+        session is found to have dropped during the operation it will be
+        discarded and the operation retried once against a new session.
+
+        :param sftp_operation: Callable taking the borrowed SFTP client
+        :type sftp_operation: Callable[[paramiko.SFTPClient], T]
+        :return: Whatever `sftp_operation` returns
+        :rtype: T
+        """
+        while True:
+            session, was_reused = self._acquire()
+            try:
+                result = sftp_operation(session.sftp_client)
+            except Exception:
+                if session.is_alive() or not was_reused:
+                    self._release(session)
+                    raise
+                logging.warning(
+                    "Pooled RJO SFTP session dropped mid-operation, reconnecting"
+                )
+                session.close()
+                continue
+            self._release(session)
+            return result
+
+    def close_all(self):
+        with self._lock:
+            idle_sessions = self._idle_sessions
+            self._idle_sessions = []
+        for session in idle_sessions:
+            session.close()
+
+
+_rjo_sftp_session_pool = RJOSFTPSessionPool()
+
+
+def get_rjo_sftp_session_pool() -> RJOSFTPSessionPool:
+    return _rjo_sftp_session_pool
+
+
+@dataclass(frozen=True)
+class LMEFileEntry:
+    file_datetime: datetime
+    file_type: str
+    filename: str
+    size: int
+    mtime: int
+
+
+class LMEDirectoryIndex:
+    """Typed listing of the LME overnight files in the RJO SFTP directory,
+    shared between every file type so a single `listdir_attr` serves the
+    INR, FCP, CLO, and EXR lookups made within `ttl` seconds of each other.
+
+    Filenames are only parsed the first time they're seen, so once warm the
+    cost of a refresh is the listing itself plus whatever files are new.
+    """
+
+    def __init__(
+        self,
+        ttl: float = LME_DIRECTORY_INDEX_TTL_SECONDS,
+        directory: str = LME_PRICES_DIRECTORY,
+    ) -> None:
+        self.ttl = ttl
+        self.directory = directory
+        self._parsed_filenames: Dict[str, Optional[Tuple[datetime, str]]] = {}
+        self._files_by_type: Dict[str, List[LMEFileEntry]] = {}
+        self._listed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _parse_filename(self, filename: str) -> Optional[Tuple[datetime, str]]:
+        try:
+            return self._parsed_filenames[filename]
+        except KeyError:
+            pass
+        parsed_filename = None
+        filename_match = LME_FILENAME_PATTERN.match(filename)
+        if filename_match is not None:
+            try:
+                parsed_filename = (
+                    datetime.strptime(filename_match.group(1), r"%Y%m%d"),
+                    filename_match.group(2),
+                )
+            except ValueError:
+                pass
+        self._parsed_filenames[filename] = parsed_filename
+        return parsed_filename
+
+    def is_stale(self) -> bool:
+        return self._listed_at is None or time.monotonic() - self._listed_at >= self.ttl
+
+    def refresh(self, rjo_sftp_client: paramiko.SFTPClient):
+        """Relists the directory and rebuilds the per file type index,
+        most recent file first.
+
+        :param rjo_sftp_client: Connected RJO SFTP client
+        :type rjo_sftp_client: paramiko.SFTPClient
+        """
+        file_attrs = rjo_sftp_client.listdir_attr(self.directory)
+        files_by_type: Dict[str, List[LMEFileEntry]] = {}
+        with self._lock:
+            for file_attr in file_attrs:
+                parsed_filename = self._parse_filename(file_attr.filename)
+                if parsed_filename is None:
+                    continue
+                file_datetime, file_type = parsed_filename
+                files_by_type.setdefault(file_type, []).append(
+                    LMEFileEntry(
+                        file_datetime,
+                        file_type,
+                        file_attr.filename,
+                        file_attr.st_size or 0,
+                        file_attr.st_mtime or 0,
+                    )
+                )
+            for type_entries in files_by_type.values():
+                type_entries.sort(key=lambda entry: entry.file_datetime, reverse=True)
+            self._files_by_type = files_by_type
+            self._listed_at = time.monotonic()
+        logging.debug(
+            "Indexed %s LME files in `%s`",
+            sum(len(type_entries) for type_entries in files_by_type.values()),
+            self.directory,
+        )
+
+    def get_files(
+        self, rjo_sftp_client: paramiko.SFTPClient, file_type: str
+    ) -> List[LMEFileEntry]:
+        """Returns the indexed files of the given type, most recent first,
+        relisting the directory first if the index has gone stale.
+
+        :param rjo_sftp_client: Connected RJO SFTP client
+        :type rjo_sftp_client: paramiko.SFTPClient
+        :param file_type: The base name of the file, `INR`, `FCP`, and `CLO` are all examples.
+        :type file_type: str
+        :return: Index entries for files of `file_type`, most recent first
+        :rtype: List[LMEFileEntry]
+        """
+        if self.is_stale():
+            self.refresh(rjo_sftp_client)
+        return list(self._files_by_type.get(file_type, []))
+
+    def invalidate(self):
+        self._listed_at = None
+
+
+_lme_directory_index = LMEDirectoryIndex()
+
+
+def get_lme_directory_index() -> LMEDirectoryIndex:
+    return _lme_directory_index
+
+
+class _CachingSFTPReader(io.RawIOBase):
+    """Raw reader over an SFTP file that copies everything read from it into
+    `cache_fp`, letting a file be parsed as it arrives while it's also cached.
+    """
+
+    def __init__(self, sftp_file: IO, cache_fp: IO) -> None:
+        super().__init__()
+        self._sftp_file = sftp_file
+        self._cache_fp = cache_fp
+        self.reached_eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        file_data = self._sftp_file.read(len(buffer))
+        if not file_data:
+            self.reached_eof = True
+            return 0
+        num_bytes_read = len(file_data)
+        buffer[:num_bytes_read] = file_data
+        self._cache_fp.write(file_data)
+        return num_bytes_read
+
+
+class LMEFileCache:
+    """On-disk cache of downloaded RJO files, keyed by the filename, size, and
+    modification time reported by the SFTP server so a republished file is
+    never served stale.
+
+    Least recently used files are evicted once the total size of the cache
+    exceeds `max_bytes`, recency being tracked through the cached files'
+    modification times so it survives host restarts.
+    """
+
+    def __init__(
+        self,
+        cache_directory: str = RJO_FILE_CACHE_DIRECTORY,
+        max_bytes: int = RJO_FILE_CACHE_MAX_BYTES,
+    ) -> None:
+        self.cache_directory = cache_directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get_cache_path(self, file_entry: LMEFileEntry) -> str:
+        cache_key = hashlib.sha256(
+            f"{file_entry.filename}:{file_entry.size}:{file_entry.mtime}".encode()
+        ).hexdigest()[:32]
+        return os.path.join(self.cache_directory, f"{cache_key}_{file_entry.filename}")
+
+    def get(self, file_entry: LMEFileEntry) -> Optional[str]:
+        """Returns the local path of the cached copy of `file_entry`, if
+        there is one.
+
+        :param file_entry: Index entry of the remote file
+        :type file_entry: LMEFileEntry
+        :return: Path to the cached file, or None on a cache miss
+        :rtype: Optional[str]
+        """
+        cache_path = self.get_cache_path(file_entry)
+        try:
+            os.utime(cache_path)
+        except FileNotFoundError:
+            return None
+        return cache_path
+
+    def fetch(
+        self,
+        rjo_sftp_client: paramiko.SFTPClient,
+        remote_directory: str,
+        file_entry: LMEFileEntry,
+    ) -> str:
+        """Returns the local path of `file_entry`, downloading it into the
+        cache first if it isn't already there.
+
+        :param rjo_sftp_client: Connected RJO SFTP client
+        :type rjo_sftp_client: paramiko.SFTPClient
+        :param remote_directory: Directory on the SFTP server containing the file
+        :type remote_directory: str
+        :param file_entry: Index entry of the remote file
+        :type file_entry: LMEFileEntry
+        :return: Path to the cached file
+        :rtype: str
+        """
+        cache_path = self.get(file_entry)
+        if cache_path is not None:
+            logging.debug("RJO file cache hit for `%s`", file_entry.filename)
+            return cache_path
+
+        cache_path = self.get_cache_path(file_entry)
+        os.makedirs(self.cache_directory, exist_ok=True)
+        # download alongside the final location and then move into place so
+        # a half-written file can never be picked up as a cache hit
+        download_fd, download_path = tempfile.mkstemp(
+            dir=self.cache_directory, suffix=".part"
+        )
+        try:
+            with os.fdopen(download_fd, "wb") as download_fp:
+                rjo_sftp_client.getfo(
+                    f"{remote_directory}/{file_entry.filename}", download_fp
+                )
+            os.replace(download_path, cache_path)
+        except Exception:
+            if os.path.exists(download_path):
+                os.remove(download_path)
+            raise
+        logging.debug("RJO file cache stored `%s`", file_entry.filename)
+        self.evict()
+        return cache_path
+
+    @contextmanager
+    def open_streaming(
+        self,
+        rjo_sftp_client: paramiko.SFTPClient,
+        remote_directory: str,
+        file_entry: LMEFileEntry,
+    ) -> Iterator[IO]:
+        """Opens `file_entry` for reading, from the cache if it's there,
+        otherwise straight off the SFTP server with everything read also being
+        written into the cache. The file is only added to the cache if it was
+        read through to the end.
+
+        :param rjo_sftp_client: Connected RJO SFTP client
+        :type rjo_sftp_client: paramiko.SFTPClient
+        :param remote_directory: Directory on the SFTP server containing the file
+        :type remote_directory: str
+        :param file_entry: Index entry of the remote file
+        :type file_entry: LMEFileEntry
+        :yield: Binary file object for the file
+        :rtype: Iterator[IO]
+        """
+        cache_path = self.get(file_entry)
+        if cache_path is not None:
+            logging.debug("RJO file cache hit for `%s`", file_entry.filename)
+            with open(cache_path, "rb") as cached_file:
+                yield cached_file
+            return
+
+        os.makedirs(self.cache_directory, exist_ok=True)
+        download_fd, download_path = tempfile.mkstemp(
+            dir=self.cache_directory, suffix=".part"
+        )
+        try:
+            with os.fdopen(download_fd, "wb") as download_fp, rjo_sftp_client.open(
+                f"{remote_directory}/{file_entry.filename}", "rb"
+            ) as sftp_file:
+                sftp_file.prefetch()
+                caching_reader = _CachingSFTPReader(sftp_file, download_fp)
+                yield io.BufferedReader(caching_reader)
+            if caching_reader.reached_eof:
+                os.replace(download_path, self.get_cache_path(file_entry))
+                logging.debug("RJO file cache stored `%s`", file_entry.filename)
+                self.evict()
+        finally:
+            if os.path.exists(download_path):
+                os.remove(download_path)
+
+    def evict(self):
+        """Removes the least recently used files from the cache until its
+        total size is within `max_bytes`.
+        """
+        with self._lock:
+            cached_files: List[Tuple[float, int, str]] = []
+            with os.scandir(self.cache_directory) as cache_dir_entries:
+                for cache_dir_entry in cache_dir_entries:
+                    if not cache_dir_entry.is_file() or cache_dir_entry.name.endswith(
+                        ".part"
+                    ):
+                        continue
+                    cache_file_stat = cache_dir_entry.stat()
+                    cached_files.append(
+                        (
+                            cache_file_stat.st_mtime,
+                            cache_file_stat.st_size,
+                            cache_dir_entry.path,
+                        )
+                    )
+            total_bytes = sum(file_size for _, file_size, _ in cached_files)
+            for _, file_size, file_path in sorted(cached_files):
+                if total_bytes <= self.max_bytes:
+                    break
+                try:
+                    os.remove(file_path)
+                except FileNotFoundError:
+                    pass
+                total_bytes -= file_size
+                logging.debug("Evicted `%s` from RJO file cache", file_path)
+
+
+_lme_file_cache = LMEFileCache()
+
+
+def get_lme_file_cache() -> LMEFileCache:
+    return _lme_file_cache
+
+
+@contextmanager
+def open_lme_file(
+    rjo_sftp_client: paramiko.SFTPClient, file_entry: LMEFileEntry
+) -> Iterator[IO]:
+    """Opens an LME overnight file for reading, through the local file cache
+    if it's enabled, else straight off the SFTP server.
+
+    :param rjo_sftp_client: Connected RJO SFTP client
+    :type rjo_sftp_client: paramiko.SFTPClient
+    :param file_entry: Index entry of the file to open
+    :type file_entry: LMEFileEntry
+    :yield: Binary file object for the LME file
+    :rtype: Iterator[IO]
+    """
+    lme_file_cache = get_lme_file_cache()
+    if lme_file_cache.enabled:
+        with lme_file_cache.open_streaming(
+            rjo_sftp_client, LME_PRICES_DIRECTORY, file_entry
+        ) as lme_file:
+            yield lme_file
+    else:
+        with rjo_sftp_client.open(
+            f"{LME_PRICES_DIRECTORY}/{file_entry.filename}", "rb"
+        ) as sftp_file:
+            sftp_file.prefetch()
+            yield sftp_file
+
+
+def open_sftp_channel(rjo_sftp_client: paramiko.SFTPClient) -> paramiko.SFTPClient:
+    """Opens an additional SFTP channel over the same SSH connection as
+    `rjo_sftp_client`, avoiding a second handshake.
+
+    :param rjo_sftp_client: Connected RJO SFTP client
+    :type rjo_sftp_client: paramiko.SFTPClient
+    :return: New SFTP client on its own channel
+    :rtype: paramiko.SFTPClient
+    """
+    sftp_channel = paramiko.SFTPClient.from_transport(
+        rjo_sftp_client.get_channel().get_transport()  # type: ignore
+    )
+    if sftp_channel is None:
+        raise paramiko.SSHException("Unable to open additional RJO SFTP channel")
+    return sftp_channel
+
+
+def download_lme_file(
+    rjo_sftp_client: paramiko.SFTPClient, file_entry: LMEFileEntry
+) -> Union[str, bytes]:
+    """Retrieves an LME overnight file, returning the path of the cached copy
+    if the local file cache is enabled, else the raw file contents.
+
+    :param rjo_sftp_client: Connected RJO SFTP client
+    :type rjo_sftp_client: paramiko.SFTPClient
+    :param file_entry: Index entry of the file to download
+    :type file_entry: LMEFileEntry
+    :return: Local path or contents of the file
+    :rtype: Union[str, bytes]
+    """
+    lme_file_cache = get_lme_file_cache()
+    if lme_file_cache.enabled:
+        return lme_file_cache.fetch(rjo_sftp_client, LME_PRICES_DIRECTORY, file_entry)
+    with rjo_sftp_client.open(
+        f"{LME_PRICES_DIRECTORY}/{file_entry.filename}", "rb"
+    ) as sftp_file:
+        sftp_file.prefetch()
+        return sftp_file.read()
+
+
+def parse_lme_file(
+    lme_file: Union[str, bytes, IO],
+    date_cols_to_parse: Optional[List[str]],
+    file_schema: Optional[LMEFileSchema] = None,
+    row_filter: Optional[RowFilter] = None,
+    chunksize: int = LME_STREAMING_CHUNKSIZE,
+) -> pandas.DataFrame:
+    """Parses an LME overnight CSV file into a dataframe with normalised
+    (lower, snake case) column names.
+
+    :param lme_file: Path, contents, or open file object of the LME file
+    :type lme_file: Union[str, bytes, IO]
+    :param date_cols_to_parse: Columns to parse as dates, using their original names,
+    ignored if a `file_schema` is given
+    :type date_cols_to_parse: Optional[List[str]]
+    :param file_schema: Parsing profile for the file type, if there is one, otherwise all
+    columns will be read with inferred dtypes, defaults to None
+    :type file_schema: Optional[LMEFileSchema], optional
+    :param row_filter: If given, the file is read in chunks of `chunksize` rows and only
+    rows for which this returns True are kept, defaults to None
+    :type row_filter: Optional[RowFilter], optional
+    :param chunksize: Rows per chunk when filtering, defaults to `LME_STREAMING_CHUNKSIZE`
+    :type chunksize: int, optional
+    :return: Parsed file data
+    :rtype: pandas.DataFrame
+    """
+    if isinstance(lme_file, bytes):
+        lme_file = io.BytesIO(lme_file)
+    if file_schema is not None:
+        if row_filter is not None:
+            return file_schema.read_csv_filtered(lme_file, row_filter, chunksize)
+        return file_schema.read_csv(lme_file)
+    if row_filter is None:
+        file_dataframe = pandas.read_csv(lme_file, sep=",", parse_dates=date_cols_to_parse)  # type: ignore
+        return normalise_column_names(file_dataframe)
+
+    filtered_chunks: List[pandas.DataFrame] = []
+    with pandas.read_csv(
+        lme_file, sep=",", parse_dates=date_cols_to_parse, chunksize=chunksize  # type: ignore
+    ) as file_chunk_reader:
+        for file_chunk in file_chunk_reader:
+            file_chunk = normalise_column_names(file_chunk)
+            filtered_chunks.append(file_chunk.loc[row_filter(file_chunk)])
+    return pandas.concat(filtered_chunks, ignore_index=True)
+
+
+def fetch_lme_files_concurrently(
+    rjo_sftp_client: paramiko.SFTPClient,
+    file_entries: List[LMEFileEntry],
+    date_cols_to_parse: Optional[List[str]],
+    max_concurrency: int = LME_FETCH_CONCURRENCY,
+    parse_processes: int = LME_PARSE_PROCESSES,
+    file_schema: Optional[LMEFileSchema] = None,
+    row_filter: Optional[RowFilter] = None,
+) -> List[pandas.DataFrame]:
+    """Downloads and parses several LME overnight files at once, each worker
+    thread downloading over its own SFTP channel on the same connection as
+    `rjo_sftp_client`.
+
+    :param rjo_sftp_client: Connected RJO SFTP client
+    :type rjo_sftp_client: paramiko.SFTPClient
+    :param file_entries: Index entries of the files to fetch
+    :type file_entries: List[LMEFileEntry]
+    :param date_cols_to_parse: Columns to parse as dates, using their original names
+    :type date_cols_to_parse: Optional[List[str]]
+    :param max_concurrency: Maximum number of files downloaded at once
+    :type max_concurrency: int, optional
+    :param parse_processes: Number of processes to parse files in, if <= 0
+    files will be parsed on the downloading threads
+    :type parse_processes: int, optional
+    :param file_schema: Parsing profile for the file type, defaults to None
+    :type file_schema: Optional[LMEFileSchema], optional
+    :param row_filter: Predicate for rows to keep, must be picklable if
+    `parse_processes` > 0, defaults to None
+    :type row_filter: Optional[RowFilter], optional
+    :return: Parsed file data, in the same order as `file_entries`
+    :rtype: List[pandas.DataFrame]
+    """
+    worker_state = threading.local()
+    opened_channels: List[paramiko.SFTPClient] = []
+    opened_channels_lock = threading.Lock()
+
+    def download_on_worker_channel(file_entry: LMEFileEntry) -> Union[str, bytes]:
+        sftp_channel = getattr(worker_state, "sftp_channel", None)
+        if sftp_channel is None:
+            sftp_channel = open_sftp_channel(rjo_sftp_client)
+            worker_state.sftp_channel = sftp_channel
+            with opened_channels_lock:
+                opened_channels.append(sftp_channel)
+        return download_lme_file(sftp_channel, file_entry)
+
+    def download_and_parse(file_entry: LMEFileEntry) -> pandas.DataFrame:
+        return parse_lme_file(
+            download_on_worker_channel(file_entry),
+            date_cols_to_parse,
+            file_schema,
+            row_filter,
+        )
+
+    num_workers = max(1, min(max_concurrency, len(file_entries)))
+    try:
+        with ThreadPoolExecutor(max_workers=num_workers) as download_executor:
+            if parse_processes <= 0:
+                return list(download_executor.map(download_and_parse, file_entries))
+            with ProcessPoolExecutor(
+                max_workers=min(parse_processes, len(file_entries))
+            ) as parse_executor:
+                download_futures = [
+                    download_executor.submit(download_on_worker_channel, file_entry)
+                    for file_entry in file_entries
+                ]
+                parse_futures: List[Future] = [
+                    parse_executor.submit(
+                        parse_lme_file,
+                        download_future.result(),
+                        date_cols_to_parse,
+                        file_schema,
+                        row_filter,
+                    )
+                    for download_future in download_futures
+                ]
+                return [parse_future.result() for parse_future in parse_futures]
+    finally:
+        for sftp_channel in opened_channels:
+            sftp_channel.close()
+
+
 def get_lme_overnight_data(
     base_file_name: str,
     num_recent_or_since_dt: Union[int, datetime],
     date_cols_to_parse: Optional[List[str]] = [],
+    max_concurrency: int = LME_FETCH_CONCURRENCY,
+    row_filter: Optional[RowFilter] = None,
 ) -> Tuple[List[datetime], List[pandas.DataFrame]]:
     """Fetches and sorts a list of datetimes and associated dataframes
     of LME overnight data files that are found in the RJO SFTP server.
@@ -39,69 +751,92 @@ def get_lme_overnight_data(
     :param num_recent_or_since_dt: Number of files to count back (n <= 0 -> all files),
     or datetime in which case files with a datetime more recent than it will be pulled
     :type num_recent_or_since_dt: Union[int, datetime]
+    :param date_cols_to_parse: Columns to parse as dates, using their original names,
+    only used for file types without a registered `LMEFileSchema`, for those the
+    schema's date columns are used and any given here must be among them
+    :type date_cols_to_parse: Optional[List[str]], optional
+    :param max_concurrency: Maximum number of files downloaded at once when more than
+    one file is to be fetched, defaults to `LME_FETCH_CONCURRENCY`
+    :type max_concurrency: int, optional
+    :param row_filter: Given each chunk of rows as it's read with normalised column names,
+    returning a boolean mask of the rows to keep. Files are streamed in and filtered
+    chunk by chunk so only matching rows are ever held in memory, defaults to None
+    :type row_filter: Optional[RowFilter], optional
     :return: A tuple containing a list of datetimes and a list of the
         data contained in each of the files found associated with the given
         datetime
     :rtype: Tuple[List[datetime], List[pandas.DataFrame]]
+    :raises ValueError: If `date_cols_to_parse` has columns the file type's
+    `LMEFileSchema` doesn't parse as dates
     """
-    file_datetimes: List[datetime] = []
-    file_dfs: List[pandas.DataFrame] = []
     logging.info(
         "Searching for `%s` LME files, either dated after or for total count of: %s",
         base_file_name,
         num_recent_or_since_dt,
     )
-    with get_rjo_ssh_client() as rjo_ssh:
-        with rjo_ssh.open_sftp() as rjo_sftp_client:
-            rjo_sftp_client.chdir("/LMEPrices")
-            sftp_files: List[Tuple[datetime, str]] = []
-            filename_pattern = f"%Y%m%d_{base_file_name}_r.csv"
-            for filename in rjo_sftp_client.listdir():
-                try:
-                    file_datetime = datetime.strptime(filename, filename_pattern)
-                    sftp_files.append((file_datetime, filename))
-                except ValueError:
-                    pass
-            sorted_sftp_files = sorted(
-                sftp_files, key=lambda file_tuple: file_tuple[0], reverse=True
+    file_schema = get_lme_file_schema(base_file_name)
+    if file_schema is not None and date_cols_to_parse:
+        ignored_date_cols = set(date_cols_to_parse) - set(file_schema.date_columns)
+        if ignored_date_cols:
+            raise ValueError(
+                f"`{base_file_name}` files are parsed by their schema, which only "
+                f"parses {list(file_schema.date_columns)} as dates, so "
+                f"{sorted(ignored_date_cols)} would be ignored"
             )
-            if isinstance(num_recent_or_since_dt, int):
-                num_recent_or_since_dt = (
-                    num_recent_or_since_dt
-                    if num_recent_or_since_dt < len(sorted_sftp_files)
-                    else len(sorted_sftp_files)
-                )
-                if (
-                    num_recent_or_since_dt > len(sorted_sftp_files)
-                    or num_recent_or_since_dt < 1
-                ):
-                    num_recent_or_since_dt = len(sorted_sftp_files)
-            elif isinstance(num_recent_or_since_dt, datetime):
-                base_end_index = 0
-                current_file_dt = datetime(
-                    2400, 1, 1
-                )  # placeholder to get into the for loop :)
-                num_sorted_files = len(sorted_sftp_files)
-                while (
-                    current_file_dt.date() >= num_recent_or_since_dt.date()
-                    and base_end_index < num_sorted_files
-                ):
-                    current_file_dt = sorted_sftp_files[base_end_index][0]
-                    base_end_index += 1
-                # if base_end_index ==
-                num_recent_or_since_dt = base_end_index
-
-            for file_dt, filename in sorted_sftp_files[0:num_recent_or_since_dt]:
-                with rjo_sftp_client.open(filename) as sftp_file:
-                    sftp_file.prefetch()
-                    file_dataframe = pandas.read_csv(sftp_file, sep=",", parse_dates=date_cols_to_parse)  # type: ignore
-                    file_dataframe.columns = (
-                        file_dataframe.columns.str.lower()
-                        .str.strip()
-                        .str.replace(" ", "_")
+
+    def fetch_files(
+        rjo_sftp_client: paramiko.SFTPClient,
+    ) -> Tuple[List[datetime], List[pandas.DataFrame]]:
+        num_files_to_fetch = num_recent_or_since_dt
+        sorted_sftp_files = get_lme_directory_index().get_files(
+            rjo_sftp_client, base_file_name
+        )
+        if isinstance(num_files_to_fetch, int):
+            num_files_to_fetch = (
+                num_files_to_fetch
+                if num_files_to_fetch < len(sorted_sftp_files)
+                else len(sorted_sftp_files)
+            )
+            if num_files_to_fetch > len(sorted_sftp_files) or num_files_to_fetch < 1:
+                num_files_to_fetch = len(sorted_sftp_files)
+        elif isinstance(num_files_to_fetch, datetime):
+            base_end_index = 0
+            current_file_dt = datetime(
+                2400, 1, 1
+            )  # placeholder to get into the for loop :)
+            num_sorted_files = len(sorted_sftp_files)
+            while (
+                current_file_dt.date() >= num_files_to_fetch.date()
+                and base_end_index < num_sorted_files
+            ):
+                current_file_dt = sorted_sftp_files[base_end_index].file_datetime
+                base_end_index += 1
+            # if base_end_index ==
+            num_files_to_fetch = base_end_index
+
+        files_to_fetch = sorted_sftp_files[0:num_files_to_fetch]
+        file_datetimes = [file_entry.file_datetime for file_entry in files_to_fetch]
+        if max_concurrency > 1 and len(files_to_fetch) > 1:
+            file_dfs = fetch_lme_files_concurrently(
+                rjo_sftp_client,
+                files_to_fetch,
+                date_cols_to_parse,
+                max_concurrency=max_concurrency,
+                file_schema=file_schema,
+                row_filter=row_filter,
+            )
+        else:
+            file_dfs = []
+            for file_entry in files_to_fetch:
+                with open_lme_file(rjo_sftp_client, file_entry) as lme_file:
+                    file_dfs.append(
+                        parse_lme_file(
+                            lme_file, date_cols_to_parse, file_schema, row_filter
+                        )
                     )
-                    file_dfs.append(file_dataframe)
-                    file_datetimes.append(file_dt)
+        return file_datetimes, file_dfs
+
+    file_datetimes, file_dfs = get_rjo_sftp_session_pool().run(fetch_files)
 
     if len(file_datetimes) == 0:
         logging.warning(
@@ -1,4 +1,5 @@
 import pandas.core.dtypes.common
+import numpy as np
 import pandas as pd
 
 
@@ -27,3 +28,64 @@ def interpolate_on_time_series_df(
         .interpolate(method="time", **interpolation_kwargs)
     )
     return new_df
+
+
+def interpolate_on_grouped_time_series_df(
+    base_dataframe: pd.DataFrame,
+    group_column_name: str,
+    data_column_name: str,
+    output_column_name: str,
+    frequency="D",
+) -> pd.DataFrame:
+    """Time-weighted interpolation of several series at once, each group in
+    `group_column_name` is reindexed onto its own `frequency` grid between its
+    first and last dates, and interpolated with a single pass over all groups.
+
+    :param base_dataframe: Data to interpolate, with a DatetimeIndex
+    :type base_dataframe: pd.DataFrame
+    :param group_column_name: Column identifying which series each row is in
+    :type group_column_name: str
+    :param data_column_name: Column holding the values to interpolate
+    :type data_column_name: str
+    :param output_column_name: Column to write interpolated values to
+    :type output_column_name: str
+    :param frequency: Frequency of the interpolation grid, defaults to "D"
+    :type frequency: str, optional
+    :return: Interpolated data with a (group, DatetimeIndex) MultiIndex
+    :rtype: pd.DataFrame
+    """
+    if not pandas.core.dtypes.common.needs_i8_conversion(base_dataframe.index.dtype):
+        raise ValueError(
+            "time-weighted interpolation only works on Series or DataFrames with DatetimeIndex"
+        )
+    base_dataframe = base_dataframe.set_index(group_column_name, append=True)
+    base_dataframe = base_dataframe.reorder_levels([1, 0]).sort_index()
+    group_date_bounds = (
+        base_dataframe.index.to_frame(index=False)
+        .groupby(group_column_name, sort=True)
+        .agg(["min", "max"])
+        .droplevel(0, axis=1)
+    )
+    new_interpolation_index = pd.MultiIndex.from_tuples(
+        [
+            (group_key, interpolation_dt)
+            for group_key, min_dt, max_dt in group_date_bounds.itertuples()
+            for interpolation_dt in pd.date_range(min_dt, max_dt, freq=frequency)
+        ],
+        names=base_dataframe.index.names,
+    )
+    new_df = base_dataframe.reindex(new_interpolation_index)
+
+    # each group starts and ends on a known value so a single interpolation
+    # can't bleed between groups, provided the time axis keeps increasing
+    # across group boundaries, hence offsetting each group well past the last
+    group_codes = new_interpolation_index.codes[0].astype(np.float64)
+    group_ns = new_interpolation_index.get_level_values(1).asi8.astype(np.float64)
+    group_ns = group_ns - group_ns.min()
+    time_axis = group_ns + group_codes * 2.0 * (group_ns.max() + 86400e9)
+    data_values = new_df[data_column_name].to_numpy(dtype=float)
+    is_known = ~np.isnan(data_values)
+    new_df[output_column_name] = np.interp(
+        time_axis, time_axis[is_known], data_values[is_known]
+    )
+    return new_df
@@ -0,0 +1,213 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Iterable, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from upedata.static_data import Holiday
+
+from prep.lme import date_calc_funcs
+
+AsOfDatetimes = Union[Iterable[datetime], pd.DatetimeIndex, np.ndarray]
+
+# matches the day limit on the loops of `get_cash_datetime` and `get_tom_datetime`
+_MAX_DAYS_SEARCHED = 25
+# `np.busdaycalendar` weekmask, Monday first
+_WEEKDAYS_WEEKMASK = "1111100"
+# matches the limit on stepping back in `get_3m_datetime`
+_MAX_3M_STEPS_BACK = 10
+
+
+@dataclass(frozen=True)
+class LMEPrimaryPromptDays:
+    """TOM, cash, and 3M prompt days for each as-of datetime queried, as
+    `datetime64[D]` arrays aligned with the query. Sessions with no TOM
+    prompt hold `NaT`, all prompts expire at 19:00 London time.
+    """
+
+    tom: np.ndarray
+    cash: np.ndarray
+    three_month: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.cash)
+
+
+def _to_london_wall_clock(as_of_datetimes: AsOfDatetimes) -> pd.DatetimeIndex:
+    as_of_index = pd.DatetimeIndex(as_of_datetimes)
+    if as_of_index.tz is not None:
+        as_of_index = as_of_index.tz_convert("Europe/London").tz_localize(None)
+    return as_of_index
+
+
+def _get_next_good_friday_days(as_of_days: np.ndarray) -> np.ndarray:
+    # same choice of Good Friday as `LMEPromptMap`
+    as_of_years = as_of_days.astype("datetime64[Y]").astype(np.int64) + 1970
+    good_friday_by_year = {
+        year: np.datetime64(date_calc_funcs.get_good_friday_date(year), "D")
+        for year in np.unique(np.concatenate([as_of_years, as_of_years + 1])).tolist()
+    }
+    this_year_good_fridays = np.array(
+        [good_friday_by_year[year] for year in as_of_years.tolist()],
+        dtype="datetime64[D]",
+    )
+    next_year_good_fridays = np.array(
+        [good_friday_by_year[year + 1] for year in as_of_years.tolist()],
+        dtype="datetime64[D]",
+    )
+    return np.where(
+        as_of_days > this_year_good_fridays,
+        next_year_good_fridays,
+        this_year_good_fridays,
+    )
+
+
+def _roll_to_lme_prompt_days(
+    dates_to_roll: np.ndarray,
+    non_prompt_days: np.ndarray,
+    good_friday_days: np.ndarray,
+) -> np.ndarray:
+    prompt_days = np.empty_like(dates_to_roll)
+    for good_friday_day in np.unique(good_friday_days):
+        is_good_friday_group = good_friday_days == good_friday_day
+        prompt_days[is_good_friday_group] = date_calc_funcs.roll_to_lme_prompt_dates(
+            dates_to_roll[is_good_friday_group],
+            non_prompt_days,
+            good_friday_day.astype(date),
+        )
+    return prompt_days
+
+
+def _get_months(days: np.ndarray) -> np.ndarray:
+    return days.astype("datetime64[M]")
+
+
+def get_3m_days(
+    as_of_index: pd.DatetimeIndex,
+    non_prompt_days: np.ndarray,
+) -> np.ndarray:
+    """Vectorised `get_3m_datetime`, for as-of datetimes on the London wall
+    clock.
+
+    :param as_of_index: Naive as-of datetimes on the London wall clock
+    :type as_of_index: pd.DatetimeIndex
+    :param non_prompt_days: LME non-prompt dates
+    :type non_prompt_days: np.ndarray
+    :return: 3M prompt day of each as-of datetime
+    :rtype: np.ndarray
+    """
+    guess_3m_days = (
+        (as_of_index + pd.DateOffset(months=3) + pd.Timedelta(hours=4, minutes=29))
+        .to_numpy()
+        .astype("datetime64[D]")
+    )
+    good_friday_days = _get_next_good_friday_days(
+        as_of_index.to_numpy().astype("datetime64[D]")
+    )
+    mapped_guess_3m_days = _roll_to_lme_prompt_days(
+        guess_3m_days, non_prompt_days, good_friday_days
+    )
+    guess_3m_months = _get_months(guess_3m_days)
+    for days_back in range(1, _MAX_3M_STEPS_BACK + 1):
+        is_rolled_out_of_month = (
+            _get_months(mapped_guess_3m_days) != guess_3m_months
+        ) & (mapped_guess_3m_days > guess_3m_days)
+        if not is_rolled_out_of_month.any():
+            break
+        mapped_guess_3m_days[is_rolled_out_of_month] = _roll_to_lme_prompt_days(
+            guess_3m_days[is_rolled_out_of_month] - days_back,
+            non_prompt_days,
+            good_friday_days[is_rolled_out_of_month],
+        )
+    return mapped_guess_3m_days
+
+
+def get_cash_and_tom_days(
+    session_days: np.ndarray,
+    holiday_calendar: date_calc_funcs.LMEHolidayCalendar,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorised `get_cash_datetime` and `get_tom_datetime`, taking the
+    first calendar day of each session, i.e. the as-of datetime plus 4h29m.
+
+    Cash is the first Settlement Business Day on or after the third Business
+    Day from the start of the session, TOM the second Business Day from it
+    when that is a Settlement Business Day.
+
+    :param session_days: First calendar day of each session
+    :type session_days: np.ndarray
+    :param holiday_calendar: Product holiday calendar
+    :type holiday_calendar: date_calc_funcs.LMEHolidayCalendar
+    :return: Cash and TOM prompt days, `NaT` where there's no TOM
+    :rtype: Tuple[np.ndarray, np.ndarray]
+    """
+    business_day_calendar = np.busdaycalendar(
+        weekmask=_WEEKDAYS_WEEKMASK,
+        holidays=holiday_calendar.closure_days,
+    )
+    settlement_day_calendar = np.busdaycalendar(
+        weekmask=_WEEKDAYS_WEEKMASK,
+        holidays=holiday_calendar.holiday_days,
+    )
+    days_searched_limits = session_days + _MAX_DAYS_SEARCHED
+
+    third_business_days = np.busday_offset(
+        session_days, 2, roll="forward", busdaycal=business_day_calendar
+    )
+    cash_days = np.busday_offset(
+        third_business_days, 0, roll="forward", busdaycal=settlement_day_calendar
+    )
+    cash_days = np.where(
+        cash_days < days_searched_limits, cash_days, days_searched_limits
+    )
+
+    second_business_days = np.busday_offset(
+        session_days, 1, roll="forward", busdaycal=business_day_calendar
+    )
+    tom_days = np.where(
+        np.is_busday(second_business_days, busdaycal=settlement_day_calendar)
+        & (second_business_days < days_searched_limits),
+        second_business_days,
+        np.datetime64("NaT", "D"),
+    )
+    return cash_days, tom_days
+
+
+def get_primary_prompt_days_as_of(
+    as_of_datetimes: AsOfDatetimes,
+    non_prompts: Union[List[date], date_calc_funcs.LMEHolidayCalendar],
+    product_holidays: Union[List[Holiday], date_calc_funcs.LMEHolidayCalendar],
+) -> LMEPrimaryPromptDays:
+    """Batch equivalent of the TOM, cash, and 3M dates given by
+    `populate_primary_curve_datetimes` with `_current_datetime` set to each
+    of `as_of_datetimes`, for back-testing and re-deriving historical prompts
+    without generating a curve per datetime.
+
+    :param as_of_datetimes: Datetimes to find the prompts as of, either all
+    naive, taken as London time, or all timezone aware
+    :type as_of_datetimes: AsOfDatetimes
+    :param non_prompts: List of all LME non-prompt dates, or a holiday calendar
+    whose holidays are the non-prompts
+    :type non_prompts: Union[List[date], LMEHolidayCalendar]
+    :param product_holidays: List of all product holidays, or their calendar
+    :type product_holidays: Union[List[Holiday], LMEHolidayCalendar]
+    :return: TOM, cash, and 3M prompt days aligned with `as_of_datetimes`
+    :rtype: LMEPrimaryPromptDays
+    """
+    as_of_index = _to_london_wall_clock(as_of_datetimes)
+    if isinstance(non_prompts, date_calc_funcs.LMEHolidayCalendar):
+        non_prompt_days = non_prompts.holiday_days
+    else:
+        non_prompt_days = np.unique(np.array(list(non_prompts), dtype="datetime64[D]"))
+    holiday_calendar = date_calc_funcs.get_lme_holiday_calendar(product_holidays)
+
+    session_days = (
+        (as_of_index + pd.Timedelta(hours=4, minutes=29))
+        .to_numpy()
+        .astype("datetime64[D]")
+    )
+    cash_days, tom_days = get_cash_and_tom_days(session_days, holiday_calendar)
+    return LMEPrimaryPromptDays(
+        tom=tom_days,
+        cash=cash_days,
+        three_month=get_3m_days(as_of_index, non_prompt_days),
+    )
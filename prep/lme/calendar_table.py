@@ -0,0 +1,429 @@
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from dateutil import relativedelta
+from upedata.static_data import Holiday
+from zoneinfo import ZoneInfo
+
+from prep.lme import date_calc_funcs
+
+# must be on durable storage to survive worker recycling, e.g. under the
+# `/home` share of the function app rather than the temp dir, left unset the
+# table is only held in memory and synced from cold by every new worker
+LME_CALENDAR_TABLE_PATH = os.getenv("LME_CALENDAR_TABLE_PATH")
+LME_CALENDAR_TABLE_YEARS = int(os.getenv("LME_CALENDAR_TABLE_YEARS", "3"))
+LME_CALENDAR_TABLE_FORWARD_MONTHS = int(
+    os.getenv("LME_CALENDAR_TABLE_FORWARD_MONTHS", "20")
+)
+
+_CALENDAR_TABLE_FORMAT_VERSION = 1
+# a holiday can only move prompts for sessions whose prompt map (four months
+# forward, rolling up to a couple of weeks either way) or cash/TOM search
+# (25 days forward) reach it, so sessions from this far before it
+_HOLIDAY_INVALIDATION_SESSIONS_BEFORE = relativedelta.relativedelta(months=4, days=21)
+# through this far after it
+_HOLIDAY_INVALIDATION_SESSIONS_AFTER = relativedelta.relativedelta(days=21)
+
+_EUROPE_LONDON_TZ = ZoneInfo("Europe/London")
+_PROMPT_TIME = time(19, 0, tzinfo=_EUROPE_LONDON_TZ)
+
+
+def _day_to_prompt_datetime(prompt_day: np.datetime64) -> datetime:
+    return datetime.combine(prompt_day.item(), _PROMPT_TIME)
+
+
+def _prompt_datetimes_to_days(prompt_datetimes: Iterable[datetime]) -> np.ndarray:
+    return np.array(
+        [prompt_datetime.date() for prompt_datetime in prompt_datetimes],
+        dtype="datetime64[D]",
+    )
+
+
+def get_session_open_datetime(session_date: date) -> datetime:
+    """Returns the datetime a trading session's calendar is generated for,
+    just after the 19:30 cutoff on the evening opening the session, the same
+    point the nightly jobs run at.
+
+    :param session_date: Date of the trading session
+    :type session_date: date
+    :return: Datetime opening the session
+    :rtype: datetime
+    """
+    return datetime.combine(
+        session_date - timedelta(days=1), time(19, 31, tzinfo=_EUROPE_LONDON_TZ)
+    )
+
+
+@dataclass(frozen=True)
+class LMECalendarSession:
+    """Prompt dates of a single LME trading session, as generated by
+    `populate_primary_curve_datetimes` including broken dates.
+    """
+
+    session_date: date
+    cash: datetime
+    three_month: datetime
+    weeklies: List[datetime]
+    monthlies: List[datetime]
+    tom: Optional[datetime] = None
+    broken_dates: List[datetime] = field(default_factory=list)
+
+    def gen_prompt_list(self) -> List[datetime]:
+        prompt_set = set(
+            [self.cash, self.three_month]
+            + self.weeklies
+            + self.monthlies
+            + self.broken_dates
+        )
+        if self.tom is not None:
+            prompt_set.add(self.tom)
+        return sorted(list(prompt_set))
+
+
+@dataclass
+class _SessionRow:
+    tom: np.datetime64
+    cash: np.datetime64
+    three_month: np.datetime64
+    weeklies: np.ndarray
+    monthlies: np.ndarray
+    broken_dates: np.ndarray
+
+
+class LMECalendarTable:
+    """Materialised LME calendar holding the prompt dates of every trading
+    session in a window, so generating them becomes a lookup by session date.
+
+    Sessions are only recomputed when missing from the window or when within
+    reach of a holiday that has been added, removed or changed closure flag
+    since they were computed. The table is persisted as a compressed columnar
+    `.npz` file.
+    """
+
+    def __init__(self, forward_months: int = LME_CALENDAR_TABLE_FORWARD_MONTHS):
+        self.forward_months = forward_months
+        self.holidays: Dict[date, bool] = {}
+        self._sessions: Dict[date, _SessionRow] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @property
+    def session_dates(self) -> List[date]:
+        return sorted(self._sessions.keys())
+
+    def _compute_session(
+        self,
+        session_date: date,
+        holiday_calendar: date_calc_funcs.LMEHolidayCalendar,
+    ) -> _SessionRow:
+        lme_futures_curve = date_calc_funcs.populate_primary_curve_datetimes(
+            holiday_calendar,
+            holiday_calendar,
+            forward_months=self.forward_months,
+            _current_datetime=get_session_open_datetime(session_date),
+        )
+        lme_futures_curve.populate_broken_datetimes()
+        return _SessionRow(
+            tom=(
+                np.datetime64(lme_futures_curve.tom.date(), "D")
+                if lme_futures_curve.tom is not None
+                else np.datetime64("NaT", "D")
+            ),
+            cash=np.datetime64(lme_futures_curve.cash.date(), "D"),
+            three_month=np.datetime64(lme_futures_curve.three_month.date(), "D"),
+            weeklies=_prompt_datetimes_to_days(lme_futures_curve.weeklies),
+            monthlies=_prompt_datetimes_to_days(lme_futures_curve.monthlies),
+            broken_dates=_prompt_datetimes_to_days(lme_futures_curve.broken_dates),
+        )
+
+    def _get_invalidated_session_dates(self, holidays: Dict[date, bool]) -> List[date]:
+        changed_holiday_dates = {
+            holiday_date
+            for holiday_date in self.holidays.keys() | holidays.keys()
+            if self.holidays.get(holiday_date) != holidays.get(holiday_date)
+        }
+        invalidated_session_dates = []
+        for session_date in self._sessions:
+            for changed_holiday_date in changed_holiday_dates:
+                if (
+                    changed_holiday_date - _HOLIDAY_INVALIDATION_SESSIONS_BEFORE
+                    <= session_date
+                    <= changed_holiday_date + _HOLIDAY_INVALIDATION_SESSIONS_AFTER
+                ):
+                    invalidated_session_dates.append(session_date)
+                    break
+        return invalidated_session_dates
+
+    def sync(
+        self,
+        product_holidays: List[Holiday],
+        first_session_date: date,
+        last_session_date: date,
+    ) -> int:
+        """Brings the table up to date with `product_holidays` and rolls its
+        window forward to cover `first_session_date` through
+        `last_session_date` inclusive, sessions before the window are dropped.
+
+        :param product_holidays: Holidays of the product the calendar is for,
+        non-prompts are taken to be the holiday dates
+        :type product_holidays: List[Holiday]
+        :param first_session_date: First session date to hold
+        :type first_session_date: date
+        :param last_session_date: Last session date to hold
+        :type last_session_date: date
+        :return: Number of sessions computed
+        :rtype: int
+        """
+        holidays = {
+            holiday.holiday_date: bool(holiday.is_closure_date)
+            for holiday in product_holidays
+        }
+        with self._lock:
+            for session_date in self._get_invalidated_session_dates(holidays):
+                del self._sessions[session_date]
+            self.holidays = holidays
+            for session_date in list(self._sessions.keys()):
+                if not first_session_date <= session_date <= last_session_date:
+                    del self._sessions[session_date]
+
+            holiday_calendar = date_calc_funcs.LMEHolidayCalendar(product_holidays)
+            sessions_computed = 0
+            session_date = first_session_date
+            while session_date <= last_session_date:
+                if session_date not in self._sessions:
+                    self._sessions[session_date] = self._compute_session(
+                        session_date, holiday_calendar
+                    )
+                    sessions_computed += 1
+                session_date += timedelta(days=1)
+
+        logging.info(
+            "Computed %s of %s LME calendar sessions", sessions_computed, len(self)
+        )
+        return sessions_computed
+
+    def get_session(
+        self, session_date: date, forward_months: Optional[int] = None
+    ) -> LMECalendarSession:
+        """Looks up the prompt dates of a trading session.
+
+        :param session_date: Date of the trading session, datetimes are first
+        converted with `get_lme_session_date`
+        :type session_date: date
+        :param forward_months: Number of monthly prompts to return, defaults to
+        all those held
+        :type forward_months: Optional[int], optional
+        :raises KeyError: Session is outside the table's window
+        :raises ValueError: More monthly prompts were requested than are held
+        :return: Prompt dates of the session
+        :rtype: LMECalendarSession
+        """
+        if isinstance(session_date, datetime):
+            session_date = date_calc_funcs.get_lme_session_date(session_date)
+        if forward_months is None:
+            forward_months = self.forward_months
+        elif forward_months > self.forward_months:
+            raise ValueError(
+                f"Calendar table only holds {self.forward_months} monthly prompts, "
+                f"{forward_months} requested"
+            )
+        session_row = self._sessions[session_date]
+        return LMECalendarSession(
+            session_date=session_date,
+            cash=_day_to_prompt_datetime(session_row.cash),
+            three_month=_day_to_prompt_datetime(session_row.three_month),
+            weeklies=list(map(_day_to_prompt_datetime, session_row.weeklies)),
+            monthlies=list(
+                map(_day_to_prompt_datetime, session_row.monthlies[:forward_months])
+            ),
+            tom=(
+                None
+                if np.isnat(session_row.tom)
+                else _day_to_prompt_datetime(session_row.tom)
+            ),
+            broken_dates=list(map(_day_to_prompt_datetime, session_row.broken_dates)),
+        )
+
+    def save(self, table_path: str):
+        with self._lock:
+            session_dates = sorted(self._sessions.keys())
+            session_rows = [
+                self._sessions[session_date] for session_date in session_dates
+            ]
+            holiday_dates = sorted(self.holidays.keys())
+            ragged_columns = {}
+            for column_name in ("weeklies", "broken_dates"):
+                column_values = [
+                    getattr(session_row, column_name) for session_row in session_rows
+                ]
+                ragged_columns[f"{column_name}_offsets"] = np.cumsum(
+                    [0] + [len(values) for values in column_values]
+                )
+                ragged_columns[column_name] = (
+                    np.concatenate(column_values)
+                    if len(column_values) > 0
+                    else np.array([], dtype="datetime64[D]")
+                )
+            table_columns = {
+                "format_version": np.array(_CALENDAR_TABLE_FORMAT_VERSION),
+                "forward_months": np.array(self.forward_months),
+                "holiday_dates": np.array(holiday_dates, dtype="datetime64[D]"),
+                "holiday_is_closure": np.array(
+                    [self.holidays[holiday_date] for holiday_date in holiday_dates],
+                    dtype=bool,
+                ),
+                "session_dates": np.array(session_dates, dtype="datetime64[D]"),
+                "tom": np.array(
+                    [row.tom for row in session_rows], dtype="datetime64[D]"
+                ),
+                "cash": np.array(
+                    [row.cash for row in session_rows], dtype="datetime64[D]"
+                ),
+                "three_month": np.array(
+                    [row.three_month for row in session_rows], dtype="datetime64[D]"
+                ),
+                "monthlies": np.array(
+                    [row.monthlies for row in session_rows], dtype="datetime64[D]"
+                ).reshape(len(session_rows), self.forward_months),
+                **ragged_columns,
+            }
+        # written alongside then moved into place so readers never see a partial file
+        table_dir = os.path.dirname(os.path.abspath(table_path))
+        os.makedirs(table_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=table_dir, suffix=".part", delete=False
+        ) as table_file:
+            np.savez_compressed(table_file, **table_columns)
+        os.replace(table_file.name, table_path)
+
+    @classmethod
+    def load(cls, table_path: str) -> "LMECalendarTable":
+        """Loads a table saved with `save`.
+
+        :param table_path: Path of the saved table
+        :type table_path: str
+        :raises ValueError: Table was saved in an unsupported format
+        :return: Loaded calendar table
+        :rtype: LMECalendarTable
+        """
+        with np.load(table_path) as table_columns:
+            if int(table_columns["format_version"]) != _CALENDAR_TABLE_FORMAT_VERSION:
+                raise ValueError(f"Unsupported calendar table format in {table_path}")
+            calendar_table = cls(forward_months=int(table_columns["forward_months"]))
+            calendar_table.holidays = dict(
+                zip(
+                    table_columns["holiday_dates"].tolist(),
+                    table_columns["holiday_is_closure"].tolist(),
+                )
+            )
+            weekly_offsets = table_columns["weeklies_offsets"]
+            broken_offsets = table_columns["broken_dates_offsets"]
+            for i, session_date in enumerate(table_columns["session_dates"].tolist()):
+                calendar_table._sessions[session_date] = _SessionRow(
+                    tom=table_columns["tom"][i],
+                    cash=table_columns["cash"][i],
+                    three_month=table_columns["three_month"][i],
+                    weeklies=table_columns["weeklies"][
+                        weekly_offsets[i] : weekly_offsets[i + 1]
+                    ],
+                    monthlies=table_columns["monthlies"][i],
+                    broken_dates=table_columns["broken_dates"][
+                        broken_offsets[i] : broken_offsets[i + 1]
+                    ],
+                )
+        return calendar_table
+
+
+def _load_lme_calendar_table(table_path: Optional[str]) -> LMECalendarTable:
+    if table_path is None:
+        logging.warning(
+            "`LME_CALENDAR_TABLE_PATH` is not set, the LME calendar table won't "
+            "be persisted and is being synced from cold"
+        )
+        return LMECalendarTable()
+    try:
+        calendar_table = LMECalendarTable.load(table_path)
+    except FileNotFoundError:
+        logging.warning(
+            "No saved LME calendar table at `%s`, syncing from cold", table_path
+        )
+        return LMECalendarTable()
+    except (OSError, KeyError, ValueError):
+        logging.warning(
+            "Unable to load LME calendar table at `%s`, syncing from cold",
+            table_path,
+            exc_info=True,
+        )
+        return LMECalendarTable()
+    if calendar_table.forward_months != LME_CALENDAR_TABLE_FORWARD_MONTHS:
+        logging.warning(
+            "LME calendar table at `%s` holds %s forward months rather than %s, "
+            "syncing from cold",
+            table_path,
+            calendar_table.forward_months,
+            LME_CALENDAR_TABLE_FORWARD_MONTHS,
+        )
+        return LMECalendarTable()
+    logging.info(
+        "Loaded LME calendar table of %s sessions from `%s`",
+        len(calendar_table),
+        table_path,
+    )
+    return calendar_table
+
+
+_lme_calendar_table: Optional[LMECalendarTable] = None
+_lme_calendar_table_lock = threading.Lock()
+
+
+def get_lme_calendar_table(
+    product_holidays: List[Holiday],
+    current_datetime: Optional[datetime] = None,
+    table_path: Optional[str] = LME_CALENDAR_TABLE_PATH,
+    years: int = LME_CALENDAR_TABLE_YEARS,
+) -> Tuple[LMECalendarTable, date]:
+    """Returns the process wide calendar table synced to `product_holidays`
+    and rolled forward to cover `years` of sessions from the current one,
+    loading it from `table_path` the first time and saving it back there
+    whenever any sessions had to be computed.
+
+    :param product_holidays: Holidays of the product the calendar is for
+    :type product_holidays: List[Holiday]
+    :param current_datetime: The current datetime, defaults to now
+    :type current_datetime: Optional[datetime], optional
+    :param table_path: Path the table is persisted to, if None the table is
+    only held in memory, defaults to LME_CALENDAR_TABLE_PATH
+    :type table_path: Optional[str], optional
+    :param years: Number of years of sessions to hold
+    :type years: int, optional
+    :return: The calendar table, and the current session date
+    :rtype: Tuple[LMECalendarTable, date]
+    """
+    global _lme_calendar_table
+    if not isinstance(current_datetime, datetime):
+        current_datetime = datetime.now(tz=_EUROPE_LONDON_TZ)
+    current_session_date = date_calc_funcs.get_lme_session_date(current_datetime)
+    with _lme_calendar_table_lock:
+        if _lme_calendar_table is None:
+            _lme_calendar_table = _load_lme_calendar_table(table_path)
+        calendar_table = _lme_calendar_table
+
+    sessions_computed = calendar_table.sync(
+        product_holidays,
+        current_session_date,
+        current_session_date + relativedelta.relativedelta(years=years),
+    )
+    if sessions_computed > 0 and table_path is not None:
+        try:
+            calendar_table.save(table_path)
+        except OSError:
+            logging.exception("Unable to save LME calendar table to `%s`", table_path)
+    return calendar_table, current_session_date
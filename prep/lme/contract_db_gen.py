@@ -1,18 +1,19 @@
-import json
+import dataclasses
 import logging
+import os
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import AbstractSet, Any, Dict, FrozenSet, List, Tuple
 
 import sqlalchemy
 import upedata.dynamic_data as upedynamic
-import upedata.enums as upeenums
 import upedata.static_data as upestatic
-import upedata.template_language.parser as upeparse
 from dateutil.relativedelta import WE, relativedelta
 from sqlalchemy import orm
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from prep.exceptions import ProductNotFound
+from prep.helpers import display_name_template_utils, lme_option_spec_utils
 from prep.lme import contract_param_gen, date_calc_funcs
 
 LME_PRODUCT_NAMES = ["AHD", "CAD", "PBD", "ZSD", "NID"]
@@ -38,6 +39,19 @@ LME_FUTURE_3M_FEED_ASSOC = {
         GEORGIA_LME_PRODUCT_NAMES_BASE, CQG_3M_FEEDS
     )
 }
+# writes the futures of all LME products together in one insert per table,
+# rather than three inserts for each product, opt in until proven in production
+LME_STATIC_DATA_BATCH_PRODUCTS = os.getenv(
+    "LME_STATIC_DATA_BATCH_PRODUCTS", "false"
+).lower() in ("t", "true", "y", "yes", "1")
+# plans the static data missing from the database and logs it, without writing
+LME_STATIC_DATA_DRY_RUN = os.getenv("LME_STATIC_DATA_DRY_RUN", "false").lower() in (
+    "t",
+    "true",
+    "y",
+    "yes",
+    "1",
+)
 LME_PRODUCT_NAME_MAP = {
     lme_product_name[0:2]: lme_metal_name
     for lme_product_name, lme_metal_name in zip(
@@ -46,19 +60,51 @@ LME_PRODUCT_NAME_MAP = {
 }
 
 
-def add_futures_to_database(
-    expiry_dts: List[datetime],
-    product_symbol: str,
-    db_session: orm.Session,
-) -> List[str]:
+@dataclass(frozen=True)
+class ProductStaticDataCounts:
+    futures_added: int
+    options_added: int
+
+
+@dataclass(frozen=True)
+class ExistingContracts:
+    future_symbols: FrozenSet[str]
+    option_symbols: FrozenSet[str]
+    option_expiries: FrozenSet[Tuple[str, datetime]]
+
+
+@dataclass(frozen=True)
+class LMEStaticDataPlan:
+    products_future_params: Dict[str, List[Dict[str, Any]]]
+    vol_surface_params: List[Dict[str, Any]]
+    option_params: List[Dict[str, Any]]
+
+    def get_product_counts(self) -> Dict[str, ProductStaticDataCounts]:
+        """Returns the number of futures and options planned for each product.
+
+        :return: Number of futures and options planned for each product
+        :rtype: Dict[str, ProductStaticDataCounts]
+        """
+        options_planned = dict.fromkeys(self.products_future_params, 0)
+        for option_param in self.option_params:
+            options_planned[option_param["product_symbol"]] = (
+                options_planned.get(option_param["product_symbol"], 0) + 1
+            )
+        return {
+            product_symbol: ProductStaticDataCounts(
+                futures_added=len(self.products_future_params.get(product_symbol, [])),
+                options_added=product_options_planned,
+            )
+            for product_symbol, product_options_planned in options_planned.items()
+        }
+
+
+def generate_product_future_params(
+    expiry_dts: List[datetime], product_symbol: str
+) -> List[Dict[str, Any]]:
     short_code = product_symbol.split("-")[1]
     multiplier = LME_FUTURE_MULTIPLIERS[short_code]
-    base_feed_id = LME_FUTURE_3M_FEED_ASSOC[short_code]
     future_params = []
-    price_feed_assocs = []
-    price_feeds = contract_param_gen.generate_future_price_feeds_params(
-        base_feed_id, "cqg"
-    )
     for expiry_dt in expiry_dts:
         future_params.append(
             contract_param_gen.generate_future_params(
@@ -74,6 +120,21 @@ def add_futures_to_database(
                 f"{short_code} {expiry_dt.strftime(r'%Y-%m-%d')}".upper(),
             )
         )
+    return future_params
+
+
+def add_futures_to_database(
+    expiry_dts: List[datetime],
+    product_symbol: str,
+    db_session: orm.Session,
+) -> List[str]:
+    short_code = product_symbol.split("-")[1]
+    base_feed_id = LME_FUTURE_3M_FEED_ASSOC[short_code]
+    future_params = generate_product_future_params(expiry_dts, product_symbol)
+    price_feed_assocs = []
+    price_feeds = contract_param_gen.generate_future_price_feeds_params(
+        base_feed_id, "cqg"
+    )
 
     insert_futures_r_fut_sym = (
         pg_insert(upestatic.Future)
@@ -110,117 +171,457 @@ def add_futures_to_database(
     return list(inserted_future_symbols)
 
 
+def generate_products_future_params(
+    products_future_expiries: List[Tuple[str, List[datetime]]],
+    existing_future_symbols: AbstractSet[str] = frozenset(),
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Generates the params of the futures for every expiry of every product
+    given, skipping any in `existing_future_symbols` and any generated for
+    an earlier product.
+
+    :param products_future_expiries: Each product symbol and its future expiries
+    :type products_future_expiries: List[Tuple[str, List[datetime]]]
+    :param existing_future_symbols: Symbols of futures already in the database,
+    defaults to frozenset()
+    :type existing_future_symbols: AbstractSet[str], optional
+    :return: Future params for each product
+    :rtype: Dict[str, List[Dict[str, Any]]]
+    """
+    products_future_params: Dict[str, List[Dict[str, Any]]] = {}
+    future_symbols = set(existing_future_symbols)
+    for product_symbol, expiry_dts in products_future_expiries:
+        products_future_params[product_symbol] = []
+        for future_param in generate_product_future_params(expiry_dts, product_symbol):
+            if future_param["symbol"] not in future_symbols:
+                future_symbols.add(future_param["symbol"])
+                products_future_params[product_symbol].append(future_param)
+    return products_future_params
+
+
+def insert_products_futures(
+    products_future_params: Dict[str, List[Dict[str, Any]]],
+    db_session: orm.Session,
+) -> Dict[str, List[str]]:
+    """Inserts the futures of every product given, along with their price
+    feeds and price feed associations, in one multi-row insert per table
+    regardless of the number of products.
+
+    Price feeds shared between products are only inserted once, and as with
+    `add_futures_to_database` are only inserted for products that gained
+    futures.
+
+    :param products_future_params: Future params for each product
+    :type products_future_params: Dict[str, List[Dict[str, Any]]]
+    :param db_session: Session to insert the futures through
+    :type db_session: orm.Session
+    :return: Symbols of the futures inserted for each product
+    :rtype: Dict[str, List[str]]
+    """
+    new_future_symbols: Dict[str, List[str]] = {
+        product_symbol: [] for product_symbol in products_future_params
+    }
+    future_product_symbols = {
+        future_param["symbol"]: product_symbol
+        for product_symbol, future_params in products_future_params.items()
+        for future_param in future_params
+    }
+    if len(future_product_symbols) == 0:
+        return new_future_symbols
+
+    inserted_future_symbols = (
+        db_session.execute(
+            pg_insert(upestatic.Future)
+            .values(
+                [
+                    future_param
+                    for future_params in products_future_params.values()
+                    for future_param in future_params
+                ]
+            )
+            .on_conflict_do_nothing()
+            .returning(upestatic.Future.symbol)
+        )
+        .scalars()
+        .all()
+    )
+    logging.debug(inserted_future_symbols)
+    if len(inserted_future_symbols) == 0:
+        return new_future_symbols
+
+    price_feeds: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    price_feed_assocs = []
+    for new_future_symbol in inserted_future_symbols:
+        product_symbol = future_product_symbols[new_future_symbol]
+        new_future_symbols[product_symbol].append(new_future_symbol)
+        base_feed_id = LME_FUTURE_3M_FEED_ASSOC[product_symbol.split("-")[1]]
+        for price_feed in contract_param_gen.generate_future_price_feeds_params(
+            base_feed_id, "cqg"
+        ):
+            price_feeds.setdefault(
+                (price_feed["feed_id"], price_feed["origin"]), price_feed
+            )
+        price_feed_assocs.extend(
+            contract_param_gen.generate_future_price_feed_associations_params(
+                new_future_symbol, base_feed_id, "cqg"
+            )
+        )
+
+    db_session.execute(
+        pg_insert(upestatic.PriceFeed)
+        .values(list(price_feeds.values()))
+        .on_conflict_do_nothing()
+    )
+    db_session.execute(
+        pg_insert(upestatic.FuturePriceFeedAssociation)
+        .values(price_feed_assocs)
+        .on_conflict_do_nothing()
+    )
+
+    return new_future_symbols
+
+
+def _get_option_display_name_field_values(
+    option_param: Dict[str, Any], product_field_values: Dict[str, Any]
+) -> Dict[str, Any]:
+    option_field_values = {
+        f"<option>.{field_name}": field_value
+        for field_name, field_value in option_param.items()
+    }
+    option_field_values.update(product_field_values)
+    # LME options are named for the monthly future expiring in their month
+    option_field_values["<option>.underlying_future.expiry"] = option_param[
+        "expiry"
+    ] + relativedelta(day=1, weekday=WE(3), hour=19, minute=0)
+    return option_field_values
+
+
+def generate_new_option_params(
+    products_option_expiries: List[
+        Tuple[
+            upestatic.Product,
+            lme_option_spec_utils.LMEOptionProductSpec,
+            List[datetime],
+        ]
+    ],
+    existing_option_expiries: AbstractSet[Tuple[str, datetime]],
+    existing_option_symbols: AbstractSet[str] = frozenset(),
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Generates the vol surface and option params for every option expiry
+    of each product not already in `existing_option_expiries`, with display
+    names rendered from their precompiled templates. Options whose symbol is
+    in `existing_option_symbols`, or was generated for an earlier expiry,
+    are skipped along with their vol surface.
+
+    :param products_option_expiries: Each product, its option specification
+    and its option expiries
+    :type products_option_expiries: List[ Tuple[upestatic.Product,
+    lme_option_spec_utils.LMEOptionProductSpec, List[datetime]] ]
+    :param existing_option_expiries: Product symbol and expiry of each option
+    already in the database
+    :type existing_option_expiries: AbstractSet[Tuple[str, datetime]]
+    :param existing_option_symbols: Symbols of options already in the
+    database, defaults to frozenset()
+    :type existing_option_symbols: AbstractSet[str], optional
+    :return: Vol surface params and the option params using each, without
+    their `vol_surface_id`
+    :rtype: Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]
+    """
+    vol_surface_params = []
+    option_params = []
+    option_symbols = set(existing_option_symbols)
+    for product, option_spec, expiry_dts in products_option_expiries:
+        display_name_template = (
+            display_name_template_utils.compile_display_name_template(
+                option_spec.display_name
+            )
+        )
+        product_field_values = {
+            f"<option>.product.{field_name}": field_value
+            for field_name, field_value in product.to_dict().items()
+        }
+        for expiry_dt in dict.fromkeys(expiry_dts):
+            if (product.symbol, expiry_dt) in existing_option_expiries:
+                continue
+            und_future_expiry = expiry_dt + relativedelta(days=14)
+            option_param = contract_param_gen.generate_option_params(
+                product.symbol,
+                None,  # type: ignore
+                f"{product.symbol} f {und_future_expiry.strftime(r'%y-%m-%d')}",
+                option_spec.get_strike_intervals(),
+                option_spec.time_type,
+                option_spec.multiplier,
+                option_spec.vol_type,
+                expiry_dt,
+                None,
+            )
+            if option_param["symbol"] in option_symbols:
+                continue
+            option_symbols.add(option_param["symbol"])
+            option_param["display_name"] = display_name_template.render_generation_time(
+                _get_option_display_name_field_values(
+                    option_param, product_field_values
+                )
+            )
+            del option_param["vol_surface_id"]
+            vol_surface_params.append(
+                contract_param_gen.generate_vol_surface(
+                    option_spec.vol_surface.model_type,
+                    expiry_dt,
+                    dict(option_spec.vol_surface.params),
+                )
+            )
+            option_params.append(option_param)
+    return vol_surface_params, option_params
+
+
+def insert_options_with_vol_surfaces(
+    vol_surface_params: List[Dict[str, Any]],
+    option_params: List[Dict[str, Any]],
+    db_session: orm.Session,
+) -> List[Tuple[str, str]]:
+    """Inserts each option with its own new vol surface in a single
+    statement, the vol surfaces being inserted by a CTE with ids drawn from
+    their sequence so each option can be joined to its own.
+
+    :param vol_surface_params: Vol surface params for each option
+    :type vol_surface_params: List[Dict[str, Any]]
+    :param option_params: Option params, without their `vol_surface_id`
+    :type option_params: List[Dict[str, Any]]
+    :param db_session: Session to insert the options through
+    :type db_session: orm.Session
+    :return: Product symbol and symbol of each option inserted
+    :rtype: List[Tuple[str, str]]
+    """
+    logging.debug(option_params)
+    if len(option_params) == 0:
+        return []
+
+    option_table = upestatic.Option.__table__
+    vol_surface_table = upedynamic.VolSurface.__table__
+    option_columns = [
+        option_table.c[column_name] for column_name in option_params[0].keys()
+    ]
+    new_option_values = sqlalchemy.values(
+        sqlalchemy.column("model_type", vol_surface_table.c.model_type.type),
+        sqlalchemy.column("params", vol_surface_table.c.params.type),
+        *(
+            sqlalchemy.column(option_column.name, option_column.type)
+            for option_column in option_columns
+        ),
+        name="new_option_values",
+    ).data(
+        [
+            (
+                vol_surface_param["model_type"],
+                vol_surface_param["params"],
+                *option_param.values(),
+            )
+            for vol_surface_param, option_param in zip(
+                vol_surface_params, option_params
+            )
+        ]
+    )
+    new_options = sqlalchemy.select(
+        new_option_values,
+        sqlalchemy.func.nextval(
+            sqlalchemy.func.pg_get_serial_sequence(
+                vol_surface_table.name, vol_surface_table.c.vol_surface_id.name
+            )
+        ).label("vol_surface_id"),
+    ).cte("new_options")
+    inserted_vol_surfaces = (
+        pg_insert(upedynamic.VolSurface)
+        .from_select(
+            ["vol_surface_id", "model_type", "expiry", "params"],
+            sqlalchemy.select(
+                new_options.c.vol_surface_id,
+                new_options.c.model_type,
+                new_options.c.expiry,
+                new_options.c.params,
+            ),
+        )
+        .returning(upedynamic.VolSurface.vol_surface_id)
+        .cte("inserted_vol_surfaces")
+    )
+    insert_options = (
+        pg_insert(upestatic.Option)
+        .from_select(
+            [*option_params[0].keys(), "vol_surface_id"],
+            sqlalchemy.select(
+                # VALUES columns come out as their plain postgres types, enums as text
+                *(
+                    sqlalchemy.cast(
+                        new_options.c[option_column.name], option_column.type
+                    )
+                    for option_column in option_columns
+                ),
+                inserted_vol_surfaces.c.vol_surface_id,
+            ).join_from(
+                new_options,
+                inserted_vol_surfaces,
+                new_options.c.vol_surface_id == inserted_vol_surfaces.c.vol_surface_id,
+            ),
+        )
+        .on_conflict_do_nothing()
+        .returning(upestatic.Option.product_symbol, upestatic.Option.symbol)
+    )
+    return list(db_session.execute(insert_options).tuples())
+
+
 def add_options_to_database(
     expiry_dts: List[datetime],
     product: upestatic.Product,
-    option_data: Dict[str, Any],
+    option_spec: lme_option_spec_utils.LMEOptionProductSpec,
     db_session: orm.Session,
 ) -> List[str]:
-    placeholder_future = upestatic.Future()
-    vol_surface_params = []
-    option_params = []
-    multiplier = option_data["multiplier"]
-    strike_intervals = option_data["strike_intervals"]
-    time_type = upeenums.TimeType(option_data["time_type"])
-    vol_type = upeenums.VolType(option_data["vol_type"])
-
-    model_type = option_data["vol_surface"]["model_type"]
-    model_params = option_data["vol_surface"]["params"]
+    """Adds the options, and a vol surface for each, that are missing for
+    every expiry of a single product, inserting the vol surfaces and then
+    the options that use them in two statements.
 
-    full_expiry_set = set(expiry_dts)
-    new_expiry_dts = (
-        sqlalchemy.select(upestatic.Option.expiry)
+    :param expiry_dts: Option expiries of the product
+    :type expiry_dts: List[datetime]
+    :param product: Product to add the options of
+    :type product: upestatic.Product
+    :param option_spec: Option specification of the product
+    :type option_spec: lme_option_spec_utils.LMEOptionProductSpec
+    :param db_session: Session to add the options through
+    :type db_session: orm.Session
+    :return: Symbols of the options added
+    :rtype: List[str]
+    """
+    existing_option_expiries = db_session.execute(
+        sqlalchemy.select(upestatic.Option.product_symbol, upestatic.Option.expiry)
         .where(upestatic.Option.product_symbol == product.symbol)
         .where(upestatic.Option.expiry.in_(expiry_dts))
+    ).tuples()
+    vol_surface_params, option_params = generate_new_option_params(
+        [(product, option_spec, expiry_dts)], set(existing_option_expiries)
     )
-    new_expiry_dts = set(db_session.execute(new_expiry_dts).scalars().all())
-    new_expiry_dts = full_expiry_set.difference(new_expiry_dts)
-
-    logging.debug(new_expiry_dts)
-    logging.debug(option_data)
-    vol_surface_params = [
-        contract_param_gen.generate_vol_surface(model_type, expiry_dt, model_params)
-        for expiry_dt in new_expiry_dts
-    ]
+    logging.debug(option_params)
     if len(vol_surface_params) == 0:
         return []
 
-    insert_vol_surfaces = (
+    inserted_vol_surface_data = db_session.execute(
         pg_insert(upedynamic.VolSurface)
         .values(vol_surface_params)
         .on_conflict_do_nothing()
         .returning(upedynamic.VolSurface.vol_surface_id, upedynamic.VolSurface.expiry)
-    )
-    inserted_vol_surface_data = db_session.execute(insert_vol_surfaces).tuples().all()
+    ).tuples()
+    # a product's options have one expiry each, so their vol surfaces too
+    vol_surface_ids = {
+        vol_surface_expiry: vol_surface_id
+        for vol_surface_id, vol_surface_expiry in inserted_vol_surface_data
+    }
+    for option_param in option_params:
+        option_param["vol_surface_id"] = vol_surface_ids[option_param["expiry"]]
 
-    option_params = []
-    for vol_surface_id, vol_surface_expiry in inserted_vol_surface_data:
-        # this isn't great, if someone can bring themselves to rewrite
-        # the parser chunk of upedata that'd allow the simplification
-        # of this code and removal of transient objects that exist to
-        # generate a single string :/
-        # I blame orm for not allowing on-conflict statements at time
-        # of writing... very rude
-        und_future_expiry = vol_surface_expiry + relativedelta(days=14)
-        und_future_symbol = (
-            f"{product.symbol} f {und_future_expiry.strftime(r'%y-%m-%d')}"
+    return list(
+        db_session.execute(
+            pg_insert(upestatic.Option)
+            .values(option_params)
+            .on_conflict_do_nothing()
+            .returning(upestatic.Option.symbol)
         )
-        option_param = contract_param_gen.generate_option_params(
-            product.symbol,
-            vol_surface_id,
-            und_future_symbol,
-            strike_intervals,
-            time_type,
-            multiplier,
-            vol_type,
-            vol_surface_expiry,
-            None,
-        )
-        logging.debug(option_param)
-        placeholder_future.expiry = option_param["expiry"] + relativedelta(
-            day=1, weekday=WE(3), hour=19, minute=0
-        )
-        option_obj = upestatic.Option(
-            symbol=option_param["symbol"],
-            multiplier=option_param["multiplier"],
-            strike_intervals=option_param["strike_intervals"],
-            expiry=option_param["expiry"],
-            display_name=option_data["display_name"],
-            product_symbol=option_param["product_symbol"],
-            underlying_future_symbol=option_param["underlying_future_symbol"],
-            vol_surface_id=option_param["vol_surface_id"],
-            vol_type=option_param["vol_type"],
-            time_type=option_param["time_type"],
-            product=product,
-            underlying_future=placeholder_future,
-        )
-        option_obj = upeparse.substitute_derivative_generation_time(option_obj)
-        option_param["display_name"] = option_obj.display_name
-        option_params.append(option_param)
+        .scalars()
+        .all()
+    )
 
-    insert_options = (
-        pg_insert(upestatic.Option).values(option_params).on_conflict_do_nothing()
-    ).returning(upestatic.Option.symbol)
 
-    new_options = db_session.execute(insert_options).scalars().all()
+def get_existing_contracts(
+    product_symbols: List[str], db_session: orm.Session
+) -> ExistingContracts:
+    """Loads the symbols of the futures and options, and the expiries of the
+    options, already in the database for the products given, in one query.
 
-    return list(new_options)
+    :param product_symbols: Symbols of the products to load contracts for
+    :type product_symbols: List[str]
+    :param db_session: Session to query through
+    :type db_session: orm.Session
+    :return: Index of the existing contracts of the products
+    :rtype: ExistingContracts
+    """
+    future_symbols = set()
+    option_symbols = set()
+    option_expiries = set()
+    existing_contracts = sqlalchemy.union_all(
+        sqlalchemy.select(
+            sqlalchemy.literal(False).label("is_option"),
+            upestatic.Future.product_symbol,
+            upestatic.Future.symbol,
+            upestatic.Future.expiry,
+        ).where(upestatic.Future.product_symbol.in_(product_symbols)),
+        sqlalchemy.select(
+            sqlalchemy.literal(True).label("is_option"),
+            upestatic.Option.product_symbol,
+            upestatic.Option.symbol,
+            upestatic.Option.expiry,
+        ).where(upestatic.Option.product_symbol.in_(product_symbols)),
+    )
+    for is_option, product_symbol, symbol, expiry in db_session.execute(
+        existing_contracts
+    ).tuples():
+        if is_option:
+            option_symbols.add(symbol)
+            option_expiries.add((product_symbol, expiry))
+        else:
+            future_symbols.add(symbol)
+    return ExistingContracts(
+        frozenset(future_symbols), frozenset(option_symbols), frozenset(option_expiries)
+    )
 
 
-def update_lme_static_data(pg_session: orm.Session, months_ahead=20):
-    with open("./prep/helpers/data_files/lme_option_base_data.json") as fp:
-        option_spec_data = json.load(fp)
-    for product_symbol, prod_specific_op_data in option_spec_data["specific"].items():
-        prod_specific_op_data |= option_spec_data["shared"]
-        product = pg_session.get(upestatic.Product, product_symbol)
+def get_products_contract_expiries(
+    pg_session: orm.Session, months_ahead=20
+) -> Tuple[
+    List[Tuple[str, List[datetime]]],
+    List[
+        Tuple[
+            upestatic.Product,
+            lme_option_spec_utils.LMEOptionProductSpec,
+            List[datetime],
+        ]
+    ],
+]:
+    """Generates the future and option expiries for the coming `months_ahead`
+    months of every LME product in the option specification data.
+
+    :param pg_session: Session to load the products through
+    :type pg_session: orm.Session
+    :param months_ahead: Number of months of monthly futures and options to
+    generate, defaults to 20
+    :type months_ahead: int, optional
+    :return: Each product symbol and its future expiries, and each product,
+    its option specification and its option expiries
+    :rtype: Tuple[ List[Tuple[str, List[datetime]]], List[Tuple[upestatic.Product,
+    lme_option_spec_utils.LMEOptionProductSpec, List[datetime]]], ]
+    """
+    option_spec = lme_option_spec_utils.get_lme_option_spec()
+    products: Dict[str, upestatic.Product] = {
+        product.symbol: product
+        for product in pg_session.execute(
+            sqlalchemy.select(upestatic.Product)
+            .where(upestatic.Product.symbol.in_(option_spec.products.keys()))
+            .options(orm.selectinload(upestatic.Product.holidays))
+        ).scalars()
+    }
+
+    products_future_expiries = []
+    products_option_expiries = []
+    for product_symbol, product_option_spec in option_spec.products.items():
+        product = products.get(product_symbol)
         if product is None:
             raise ProductNotFound(
                 f"Unable to find `{product_symbol}` in products table"
             )
-        holiday_dates = [holiday.holiday_date for holiday in product.holidays]
-        lme_futures_curve = date_calc_funcs.populate_primary_curve_datetimes(
-            holiday_dates, product.holidays, forward_months=months_ahead
+        holiday_calendar = date_calc_funcs.LMEHolidayCalendar(product.holidays)
+        # LME metals share a calendar so this is usually only generated once
+        lme_futures_curve = (
+            date_calc_funcs.get_lme_futures_curve_cache().get_primary_curve(
+                holiday_calendar, holiday_calendar, forward_months=months_ahead
+            )
         )
+        # cached curves are shared, so broken dates are populated on a copy
+        lme_futures_curve = dataclasses.replace(lme_futures_curve)
         lme_futures_curve.populate_broken_datetimes()
         futures_prompt_list = lme_futures_curve.gen_prompt_list()
 
@@ -229,12 +630,160 @@ def update_lme_static_data(pg_session: orm.Session, months_ahead=20):
             for future_expiry in lme_futures_curve.monthlies
         ]
 
-        new_futures = add_futures_to_database(
-            futures_prompt_list, product.symbol, pg_session
+        products_future_expiries.append((product.symbol, futures_prompt_list))
+        products_option_expiries.append(
+            (product, product_option_spec, option_expiry_dts)
+        )
+    return products_future_expiries, products_option_expiries
+
+
+def plan_lme_static_data(pg_session: orm.Session, months_ahead=20) -> LMEStaticDataPlan:
+    """Plans exactly the futures and options, with their vol surfaces, that
+    are missing from the database for the coming `months_ahead` months of
+    every LME product, checking the generated contracts against an index of
+    the existing ones loaded in a single query.
+
+    :param pg_session: Session to load the products and existing contracts
+    through, nothing is written
+    :type pg_session: orm.Session
+    :param months_ahead: Number of months of monthly futures and options to
+    generate, defaults to 20
+    :type months_ahead: int, optional
+    :return: Params of the contracts missing from the database
+    :rtype: LMEStaticDataPlan
+    """
+    products_future_expiries, products_option_expiries = get_products_contract_expiries(
+        pg_session, months_ahead=months_ahead
+    )
+    existing_contracts = get_existing_contracts(
+        [product_symbol for product_symbol, _ in products_future_expiries],
+        pg_session,
+    )
+    vol_surface_params, option_params = generate_new_option_params(
+        products_option_expiries,
+        existing_contracts.option_expiries,
+        existing_contracts.option_symbols,
+    )
+    return LMEStaticDataPlan(
+        products_future_params=generate_products_future_params(
+            products_future_expiries, existing_contracts.future_symbols
+        ),
+        vol_surface_params=vol_surface_params,
+        option_params=option_params,
+    )
+
+
+def apply_lme_static_data_plan(
+    plan: LMEStaticDataPlan, pg_session: orm.Session
+) -> Dict[str, ProductStaticDataCounts]:
+    """Writes the contracts of `plan`, along with their price feeds, skipping
+    any added since it was made.
+
+    :param plan: Params of the contracts to add
+    :type plan: LMEStaticDataPlan
+    :param pg_session: Session to add the static data through, committing
+    is left to the caller
+    :type pg_session: orm.Session
+    :return: Number of futures and options added for each product
+    :rtype: Dict[str, ProductStaticDataCounts]
+    """
+    new_future_symbols = insert_products_futures(
+        plan.products_future_params, pg_session
+    )
+    options_added = dict.fromkeys(plan.products_future_params, 0)
+    for product_symbol, _ in insert_options_with_vol_surfaces(
+        plan.vol_surface_params, plan.option_params, pg_session
+    ):
+        options_added[product_symbol] = options_added.get(product_symbol, 0) + 1
+    return {
+        product_symbol: ProductStaticDataCounts(
+            futures_added=len(new_future_symbols.get(product_symbol, [])),
+            options_added=product_options_added,
         )
-        logging.info("Added %s futures for %s", len(new_futures), product.symbol)
+        for product_symbol, product_options_added in options_added.items()
+    }
+
+
+def update_lme_static_data(
+    pg_session: orm.Session,
+    months_ahead=20,
+    batch_products=LME_STATIC_DATA_BATCH_PRODUCTS,
+    dry_run=LME_STATIC_DATA_DRY_RUN,
+) -> Dict[str, ProductStaticDataCounts]:
+    """Adds the futures and options, with their vol surfaces and price
+    feeds, for the coming `months_ahead` months of every LME product
+    in the option specification data.
+
+    :param pg_session: Session to add the static data through, committing
+    is left to the caller
+    :type pg_session: orm.Session
+    :param months_ahead: Number of months of monthly futures and options to
+    generate, defaults to 20
+    :type months_ahead: int, optional
+    :param batch_products: Whether to plan the missing contracts of all
+    products together and write only those, in one insert per table, rather
+    than product by product, defaults to LME_STATIC_DATA_BATCH_PRODUCTS
+    :type batch_products: bool, optional
+    :param dry_run: Whether to only log the contracts that would be added,
+    without writing anything, defaults to LME_STATIC_DATA_DRY_RUN
+    :type dry_run: bool, optional
+    :return: Number of futures and options added, or that would be added on
+    a dry run, for each product
+    :rtype: Dict[str, ProductStaticDataCounts]
+    """
+    if dry_run:
+        plan = plan_lme_static_data(pg_session, months_ahead=months_ahead)
+        for future_params in plan.products_future_params.values():
+            for future_param in future_params:
+                logging.info("Would add future %s", future_param["symbol"])
+        for option_param in plan.option_params:
+            logging.info("Would add option %s", option_param["symbol"])
+        product_static_data_counts = plan.get_product_counts()
+        for product_symbol, static_data_counts in product_static_data_counts.items():
+            logging.info(
+                "Would add %s futures and %s options for %s",
+                static_data_counts.futures_added,
+                static_data_counts.options_added,
+                product_symbol,
+            )
+        return product_static_data_counts
+
+    if batch_products:
+        product_static_data_counts = apply_lme_static_data_plan(
+            plan_lme_static_data(pg_session, months_ahead=months_ahead), pg_session
+        )
+    else:
+        (
+            products_future_expiries,
+            products_option_expiries,
+        ) = get_products_contract_expiries(pg_session, months_ahead=months_ahead)
+        new_future_symbols = {
+            product_symbol: add_futures_to_database(
+                futures_prompt_list, product_symbol, pg_session
+            )
+            for product_symbol, futures_prompt_list in products_future_expiries
+        }
+        new_option_symbols = {
+            product.symbol: add_options_to_database(
+                option_expiry_dts, product, product_option_spec, pg_session
+            )
+            for product, product_option_spec, option_expiry_dts in (
+                products_option_expiries
+            )
+        }
+        product_static_data_counts = {
+            product_symbol: ProductStaticDataCounts(
+                futures_added=len(new_future_symbols[product_symbol]),
+                options_added=len(new_option_symbols[product_symbol]),
+            )
+            for product_symbol in new_future_symbols
+        }
 
-        new_options = add_options_to_database(
-            option_expiry_dts, product, prod_specific_op_data, pg_session
+    for product_symbol, static_data_counts in product_static_data_counts.items():
+        logging.info(
+            "Added %s futures and %s options for %s",
+            static_data_counts.futures_added,
+            static_data_counts.options_added,
+            product_symbol,
         )
-        logging.info("Added %s options for %s", len(new_options), product.symbol)
+    return product_static_data_counts
@@ -1,14 +1,33 @@
-import copy
+import hashlib
 import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
 from dataclasses import dataclass, field
-from datetime import date, datetime, time
-from typing import Dict, List, Optional
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
+import numpy as np
 from dateutil import easter, relativedelta
 from upedata.static_data import Holiday
 from zoneinfo import ZoneInfo
 
 _DEFAULT_FORWARD_MONTHS = 18
+# days a 3M guess rolling into the next month may step back before giving up
+_MAX_3M_STEPS_BACK = 10
+
+# number of distinct curves kept by the curve cache, <= 0 disables it
+LME_FUTURES_CURVE_CACHE_SIZE = int(os.getenv("LME_FUTURES_CURVE_CACHE_SIZE", "16"))
+
+# `np.busdaycalendar` weekmasks, Monday first
+_ALL_DAYS_WEEKMASK = "1111111"
+_NON_SUNDAY_WEEKMASK = "1111110"
+_WEEKDAYS_WEEKMASK = "1111100"
+
+# bits of the per-day flags held by `LMEHolidayCalendar`
+_CLOSURE_DAY_FLAG = 0b01
+_NON_SETTLEMENT_DAY_FLAG = 0b10
 
 
 @dataclass
@@ -78,8 +97,269 @@ def get_good_friday_date(year: int) -> date:
     return easter.easter(year) - relativedelta.relativedelta(days=2)
 
 
+def roll_to_lme_prompt_dates(
+    dates_to_roll: np.ndarray,
+    non_prompts: Iterable[date],
+    good_friday_date: date,
+) -> np.ndarray:
+    """Vectorised application of the LME rulebook rolling each date to the
+    valid prompt it maps to, as used to build the LME prompt map.
+
+    Each rule is a single roll over a `np.busdaycalendar` with the
+    non-prompts as holidays and a weekmask for the days it may land on.
+
+    :param dates_to_roll: Dates to roll
+    :type dates_to_roll: np.ndarray
+    :param non_prompts: LME non-prompt dates
+    :type non_prompts: Iterable[date]
+    :param good_friday_date: Next Good Friday date, treated as a non-prompt
+    even when absent from `non_prompts`
+    :type good_friday_date: date
+    :return: Valid prompt date for each date in `dates_to_roll`, as `datetime64[D]`
+    :rtype: np.ndarray
+    """
+    dates_to_roll = np.asarray(dates_to_roll, dtype="datetime64[D]")
+    non_prompt_days = np.unique(np.array(list(non_prompts), dtype="datetime64[D]"))
+    good_friday_day = np.datetime64(good_friday_date, "D")
+    non_prompt_calendar = np.busdaycalendar(
+        weekmask=_ALL_DAYS_WEEKMASK, holidays=non_prompt_days
+    )
+    non_prompt_or_good_friday_calendar = np.busdaycalendar(
+        weekmask=_ALL_DAYS_WEEKMASK,
+        holidays=np.append(non_prompt_days, good_friday_day),
+    )
+    non_sunday_calendar = np.busdaycalendar(
+        weekmask=_NON_SUNDAY_WEEKMASK, holidays=non_prompt_days
+    )
+    settlement_calendar = np.busdaycalendar(
+        weekmask=_WEEKDAYS_WEEKMASK, holidays=non_prompt_days
+    )
+
+    # valid dates roll forward past Sundays and non-prompts, those landing on a
+    # Saturday roll back to the Friday if it's valid, else forward to a weekday
+    prompt_guesses = np.busday_offset(
+        dates_to_roll, 0, roll="forward", busdaycal=non_sunday_calendar
+    )
+    is_saturday_guess = _get_weekdays(prompt_guesses) == 5
+    is_friday_valid = np.is_busday(
+        prompt_guesses - 1, busdaycal=non_prompt_or_good_friday_calendar
+    )
+    prompt_guesses = np.where(
+        is_saturday_guess & is_friday_valid, prompt_guesses - 1, prompt_guesses
+    )
+    prompt_guesses = np.where(
+        is_saturday_guess & ~is_friday_valid,
+        np.busday_offset(
+            prompt_guesses, 0, roll="forward", busdaycal=settlement_calendar
+        ),
+        prompt_guesses,
+    )
+
+    # non-prompts roll forward to a valid weekday, save for Good Friday and a
+    # weekday Christmas which roll back
+    month_starts = dates_to_roll.astype("datetime64[M]")
+    is_weekday_christmas = (
+        (month_starts.astype(np.int64) % 12 == 11)
+        & (
+            (dates_to_roll - month_starts.astype("datetime64[D]")).astype(np.int64)
+            == 24
+        )
+        & np.isin(_get_weekdays(dates_to_roll), (1, 2, 3, 4))
+    )
+    non_prompt_rolls = np.select(
+        [dates_to_roll == good_friday_day, is_weekday_christmas],
+        [
+            np.busday_offset(
+                dates_to_roll,
+                0,
+                roll="backward",
+                busdaycal=non_prompt_or_good_friday_calendar,
+            ),
+            np.busday_offset(
+                dates_to_roll, 0, roll="backward", busdaycal=non_prompt_calendar
+            ),
+        ],
+        np.busday_offset(
+            dates_to_roll, 0, roll="forward", busdaycal=settlement_calendar
+        ),
+    )
+    is_non_prompt = ~np.is_busday(dates_to_roll, busdaycal=non_prompt_calendar)
+    return np.where(is_non_prompt, non_prompt_rolls, prompt_guesses)
+
+
+def _get_weekdays(days: np.ndarray) -> np.ndarray:
+    # 1970-01-01 was a Thursday
+    return (days.astype(np.int64) + 3) % 7
+
+
+class LMEHolidayCalendar:
+    """Holiday lookups for an LME product, built once from its `Holiday`s.
+
+    Closure and non-settlement days are held as bits of a flag byte per day,
+    indexed by date ordinal, so checking a date is a single index with no ORM
+    attribute access.
+    """
+
+    def __init__(self, product_holidays: Iterable[Holiday]):
+        holiday_flags: Dict[date, int] = {}
+        for holiday in product_holidays:
+            holiday_flags[holiday.holiday_date] = holiday_flags.get(
+                holiday.holiday_date, 0
+            ) | (
+                _CLOSURE_DAY_FLAG
+                if holiday.is_closure_date
+                else _NON_SETTLEMENT_DAY_FLAG
+            )
+
+        self.holiday_dates: List[date] = sorted(holiday_flags.keys())
+        self.holiday_days = np.array(self.holiday_dates, dtype="datetime64[D]")
+        self.closure_days = np.array(
+            [
+                holiday_date
+                for holiday_date, day_flags in holiday_flags.items()
+                if day_flags & _CLOSURE_DAY_FLAG
+            ],
+            dtype="datetime64[D]",
+        )
+        self.closure_days.sort()
+        if self.holiday_dates:
+            self._first_ordinal = self.holiday_dates[0].toordinal()
+            self._day_flags = bytearray(
+                self.holiday_dates[-1].toordinal() - self._first_ordinal + 1
+            )
+        else:
+            self._first_ordinal = 0
+            self._day_flags = bytearray()
+        for holiday_date, day_flags in holiday_flags.items():
+            self._day_flags[holiday_date.toordinal() - self._first_ordinal] = day_flags
+
+    def __len__(self) -> int:
+        return len(self.holiday_dates)
+
+    def _get_day_flags(self, date_to_check: date) -> int:
+        day_offset = date_to_check.toordinal() - self._first_ordinal
+        if 0 <= day_offset < len(self._day_flags):
+            return self._day_flags[day_offset]
+        return 0
+
+    def is_closure_date(self, date_to_check: date) -> bool:
+        return bool(self._get_day_flags(date_to_check) & _CLOSURE_DAY_FLAG)
+
+    def is_non_settlement_date(self, date_to_check: date) -> bool:
+        return bool(self._get_day_flags(date_to_check) & _NON_SETTLEMENT_DAY_FLAG)
+
+    def is_business_day(self, date_to_check: date) -> bool:
+        """Returns whether `date_to_check` is an LME Business Day, a weekday
+        that isn't a full closure.
+
+        :param date_to_check: Date to check
+        :type date_to_check: date
+        :return: Whether the date is a Business Day
+        :rtype: bool
+        """
+        return date_to_check.weekday() < 5 and not self.is_closure_date(date_to_check)
+
+    def is_settlement_business_day(self, date_to_check: date) -> bool:
+        """Returns whether `date_to_check` is an LME Settlement Business Day,
+        a Business Day that isn't a non-settlement day.
+
+        :param date_to_check: Date to check
+        :type date_to_check: date
+        :return: Whether the date is a Settlement Business Day
+        :rtype: bool
+        """
+        return date_to_check.weekday() < 5 and self._get_day_flags(date_to_check) == 0
+
+    def iter_holiday_closure_flags(self) -> Iterator[Tuple[date, bool]]:
+        """Yields each holiday date with whether it is a full closure, in date
+        order, a date held as both a closure and non-settlement day is
+        yielded once for each.
+
+        :return: Holiday dates and their closure flags
+        :rtype: Iterator[Tuple[date, bool]]
+        """
+        for holiday_date in self.holiday_dates:
+            day_flags = self._get_day_flags(holiday_date)
+            if day_flags & _CLOSURE_DAY_FLAG:
+                yield holiday_date, True
+            if day_flags & _NON_SETTLEMENT_DAY_FLAG:
+                yield holiday_date, False
+
+
+def get_lme_holiday_calendar(
+    product_holidays: Union[Iterable[Holiday], LMEHolidayCalendar]
+) -> LMEHolidayCalendar:
+    """Returns `product_holidays` as an `LMEHolidayCalendar`, building one
+    only if it isn't already.
+
+    :param product_holidays: Product holidays or their calendar
+    :type product_holidays: Union[Iterable[Holiday], LMEHolidayCalendar]
+    :return: Holiday calendar of the product
+    :rtype: LMEHolidayCalendar
+    """
+    if isinstance(product_holidays, LMEHolidayCalendar):
+        return product_holidays
+    return LMEHolidayCalendar(product_holidays)
+
+
+class LMEPromptMap(Mapping):
+    """Read-only mapping of each date from the current date through the
+    horizon to the valid LME prompt it rolls to, computed in one vectorised
+    pass by `roll_to_lme_prompt_dates` and looked up by date ordinal.
+    """
+
+    def __init__(
+        self,
+        non_prompts: Union[Iterable[date], LMEHolidayCalendar],
+        current_datetime: Optional[datetime] = None,
+        horizon_months=4,
+    ):
+        if isinstance(non_prompts, LMEHolidayCalendar):
+            non_prompts = non_prompts.holiday_days
+        if not isinstance(current_datetime, datetime):
+            current_datetime = datetime.now(tz=ZoneInfo("Europe/London"))
+        good_friday_date = get_good_friday_date(current_datetime.year)
+        if current_datetime.date() > good_friday_date:
+            # in this case we've already passed easter friday so we'll use the one for next
+            # year in this prompt map
+            good_friday_date = get_good_friday_date(current_datetime.year + 1)
+
+        self.start_date = current_datetime.date()
+        self.end_date = (
+            current_datetime + relativedelta.relativedelta(months=horizon_months)
+        ).date()
+        self.prompt_days = roll_to_lme_prompt_dates(
+            np.arange(self.start_date, self.end_date, dtype="datetime64[D]"),
+            non_prompts,
+            good_friday_date,
+        )
+        self._start_ordinal = self.start_date.toordinal()
+        self._prompt_dates: List[date] = self.prompt_days.tolist()
+
+    def __getitem__(self, date_to_map: date) -> date:
+        # `datetime` subclasses `date` but never matched the previous dict keys
+        if not isinstance(date_to_map, date) or isinstance(date_to_map, datetime):
+            raise KeyError(date_to_map)
+        date_offset = date_to_map.toordinal() - self._start_ordinal
+        if not 0 <= date_offset < len(self._prompt_dates):
+            raise KeyError(date_to_map)
+        return self._prompt_dates[date_offset]
+
+    def __iter__(self) -> Iterator[date]:
+        return (
+            self.start_date + timedelta(days=date_offset)
+            for date_offset in range(len(self._prompt_dates))
+        )
+
+    def __len__(self) -> int:
+        return len(self._prompt_dates)
+
+    def to_dict(self) -> Dict[date, date]:
+        return dict(zip(self, self._prompt_dates))
+
+
 def get_lme_prompt_map(
-    non_prompts: List[date], _current_datetime=None
+    non_prompts: Union[List[date], LMEHolidayCalendar], _current_datetime=None
 ) -> Dict[date, date]:
     """Using a list of non-prompt dates and the LME rulebook, generates
     a mapping between dates and corresponding valid prompts that they will
@@ -88,82 +368,14 @@ def get_lme_prompt_map(
     This can then be used to calculate cash, 3M dates etc.
 
     :param non_prompts: List of dates corresponding to non-prompt dates on the
-    LME
-    :type non_prompts: List[date]
+    LME, or a holiday calendar whose holidays are the non-prompts
+    :type non_prompts: Union[List[date], LMEHolidayCalendar]
     :return: Map of Date -> Date where the input is any date from tomorrow through
     the next four months can be input and will map to a date that corresponds to
     a valid LME Settlement Business day
     :rtype: Dict[date, date]
     """
-    prompt_map: Dict[date, date] = {}
-    if not isinstance(_current_datetime, datetime):
-        now_dt = datetime.now(tz=ZoneInfo("Europe/London"))
-    else:
-        now_dt = _current_datetime
-    offset_1d = relativedelta.relativedelta(days=1)
-
-    next_good_friday_date = get_good_friday_date(now_dt.year)
-
-    if now_dt.date() > next_good_friday_date:
-        # in this case we've already passed easter friday so we'll use the one for next
-        # year in this prompt map
-        next_good_friday_date = get_good_friday_date(now_dt.year + 1)
-
-    possible_prompt_to_map = now_dt
-    while relativedelta.relativedelta(possible_prompt_to_map, now_dt).months < 4:
-        valid_prompt_guess = copy.copy(possible_prompt_to_map)
-
-        if valid_prompt_guess.date() not in non_prompts:
-            # here will just be checking weekends and making sure they roll in the correct
-            # direction
-            # Sunday handling logic
-            while (
-                valid_prompt_guess.weekday() == 6
-                or valid_prompt_guess.date() in non_prompts
-            ):
-                valid_prompt_guess += offset_1d
-            # Saturday handling logic
-            if valid_prompt_guess.weekday() == 5:
-                # good friday should always be in there but doesn't hurt to be a bit careful
-                if (valid_prompt_guess - offset_1d).date() not in non_prompts + [
-                    next_good_friday_date
-                ]:
-                    # for dates that fall on a saturday with a valid friday before, this friday
-                    # will be selected
-                    valid_prompt_guess -= offset_1d
-                else:
-                    # for dates that fall on a saturday without a valid friday before,
-                    # the date will roll forward until a valid date is found
-                    while (
-                        valid_prompt_guess.weekday() >= 5
-                        or valid_prompt_guess.date() in non_prompts
-                    ):
-                        valid_prompt_guess += offset_1d
-        else:
-            # and now the joys of non-prompts
-            if valid_prompt_guess.date() == next_good_friday_date:
-                while valid_prompt_guess.date() in non_prompts + [
-                    next_good_friday_date
-                ]:
-                    valid_prompt_guess -= offset_1d
-            elif (
-                valid_prompt_guess.month == 12
-                and valid_prompt_guess.day == 25
-                and valid_prompt_guess.weekday() in (1, 2, 3, 4)
-            ):
-                while valid_prompt_guess.date() in non_prompts:
-                    valid_prompt_guess -= offset_1d
-            else:
-                while (
-                    valid_prompt_guess.date() in non_prompts
-                    or valid_prompt_guess.weekday() >= 5
-                ):
-                    valid_prompt_guess += offset_1d
-
-        prompt_map[possible_prompt_to_map.date()] = valid_prompt_guess.date()
-        possible_prompt_to_map += offset_1d
-
-    return prompt_map
+    return LMEPromptMap(non_prompts, current_datetime=_current_datetime).to_dict()
 
 
 def get_3m_datetime(
@@ -184,24 +396,27 @@ def get_3m_datetime(
         current_datetime + relativedelta.relativedelta(months=3, hours=4, minutes=29)
     ).date()
     mapped_guess_3m_datetime = lme_prompt_map[guess_3m_datetime]
-    i = 1
 
-    while (
-        mapped_guess_3m_datetime.month != guess_3m_datetime.month
-        and mapped_guess_3m_datetime > guess_3m_datetime
-    ):
+    # a guess rolling forward into the next month steps back a day at a time
+    # until it rolls to a prompt within its own month
+    for days_back in range(1, _MAX_3M_STEPS_BACK + 1):
+        if not (
+            mapped_guess_3m_datetime.month != guess_3m_datetime.month
+            and mapped_guess_3m_datetime > guess_3m_datetime
+        ):
+            break
         mapped_guess_3m_datetime = lme_prompt_map[
-            guess_3m_datetime - relativedelta.relativedelta(days=i)
+            guess_3m_datetime - relativedelta.relativedelta(days=days_back)
         ]
-        if i > 10:
-            logging.error(
-                "Something has gone very wrong here, ended up stuck in a "
-                "loop trying to find a valid 3M date\n%s\n%s\n%s",
-                current_datetime,
-                guess_3m_datetime,
-                mapped_guess_3m_datetime,
-            )
-            break
+    else:
+        logging.error(
+            "Something has gone very wrong here, stepped back %s days without "
+            "finding a valid 3M date\n%s\n%s\n%s",
+            _MAX_3M_STEPS_BACK,
+            current_datetime,
+            guess_3m_datetime,
+            mapped_guess_3m_datetime,
+        )
 
     return datetime.combine(
         mapped_guess_3m_datetime, time(19, 0, tzinfo=ZoneInfo("Europe/London"))
@@ -209,7 +424,8 @@ def get_3m_datetime(
 
 
 def get_cash_datetime(
-    current_datetime: datetime, lme_product_holidays: List[Holiday]
+    current_datetime: datetime,
+    lme_product_holidays: Union[List[Holiday], LMEHolidayCalendar],
 ) -> datetime:
     """Calculates the cash date from the current datetime and a set of LME
     "holidays".
@@ -224,50 +440,38 @@ def get_cash_datetime(
     :param current_datetime: The current datetime
     :type current_datetime: datetime
     :param lme_product_holidays: A list of LME holidays, closure days,
-    non-settlement days, etc.
-    :type lme_product_holidays: List[Holiday]
+    non-settlement days, etc. or their `LMEHolidayCalendar`
+    :type lme_product_holidays: Union[List[Holiday], LMEHolidayCalendar]
     :return: The calculated cash date
     :rtype: date
     """
-    full_closure_dates = []
-    non_settlement_business_dates = []
+    holiday_calendar = get_lme_holiday_calendar(lme_product_holidays)
     business_days_passed = 0
-    current_datetime += relativedelta.relativedelta(hours=4, minutes=29)
-    for holiday in lme_product_holidays:
-        if holiday.is_closure_date:
-            full_closure_dates.append(holiday.holiday_date)
-        else:
-            non_settlement_business_dates.append(holiday.holiday_date)
+    current_date = (
+        current_datetime + relativedelta.relativedelta(hours=4, minutes=29)
+    ).date()
 
     loops = 0
     max_loops = 25
     while loops < max_loops:
-        if (
-            current_datetime.weekday() > 4
-            or current_datetime.date() in full_closure_dates
-        ):
-            loops += 1
-            current_datetime += relativedelta.relativedelta(days=1)
-            continue
-
-        if (
-            business_days_passed > 1
-            and current_datetime.date() not in non_settlement_business_dates
-        ):
-            # this is the definition of a cash date
-            break
+        if holiday_calendar.is_business_day(current_date):
+            if (
+                business_days_passed > 1
+                and not holiday_calendar.is_non_settlement_date(current_date)
+            ):
+                # this is the definition of a cash date
+                break
+            business_days_passed += 1
 
-        business_days_passed += 1
         loops += 1
-        current_datetime += relativedelta.relativedelta(days=1)
+        current_date += timedelta(days=1)
 
-    return current_datetime.replace(
-        hour=19, minute=0, second=0, microsecond=0, tzinfo=ZoneInfo("Europe/London")
-    )
+    return datetime.combine(current_date, time(19, 0, tzinfo=ZoneInfo("Europe/London")))
 
 
 def get_tom_datetime(
-    current_datetime: datetime, lme_product_holidays: List[Holiday]
+    current_datetime: datetime,
+    lme_product_holidays: Union[List[Holiday], LMEHolidayCalendar],
 ) -> Optional[datetime]:
     """Calculated the "Cash Today" or "TOM" date from the current datetime
     if there is one, else returns `None`.
@@ -283,47 +487,35 @@ def get_tom_datetime(
     :param current_datetime: The current datetime
     :type current_datetime: datetime
     :param lme_product_holidays: A list of LME holidays, closure days,
-    non-settlement days, etc.
-    :type lme_product_holidays: List[Holiday]
+    non-settlement days, etc. or their `LMEHolidayCalendar`
+    :type lme_product_holidays: Union[List[Holiday], LMEHolidayCalendar]
     :return: The calculated TOM date, if there is one, else None
     :rtype: Optional[date]
     """
-    full_closure_dates = []
-    non_settlement_business_dates = []
-    business_days_passed = 0
-    current_datetime += relativedelta.relativedelta(hours=4, minutes=29)
-    for holiday in lme_product_holidays:
-        if holiday.is_closure_date:
-            full_closure_dates.append(holiday.holiday_date)
-        else:
-            non_settlement_business_dates.append(holiday.holiday_date)
+    holiday_calendar = get_lme_holiday_calendar(lme_product_holidays)
+    current_date = (
+        current_datetime + relativedelta.relativedelta(hours=4, minutes=29)
+    ).date()
 
     loops = 0
     max_loops = 25
     business_days_passed = 0
     while loops < max_loops:
-        if (
-            current_datetime.weekday() > 4
-            or current_datetime.date() in full_closure_dates
-        ):
+        if not holiday_calendar.is_business_day(current_date):
             pass
-        elif current_datetime.date() in non_settlement_business_dates:
+        elif holiday_calendar.is_non_settlement_date(current_date):
             if business_days_passed != 0:
                 return None
             business_days_passed += 1
         elif business_days_passed != 0:
-            return current_datetime.replace(
-                hour=19,
-                minute=00,
-                second=0,
-                microsecond=0,
-                tzinfo=ZoneInfo("Europe/London"),
+            return datetime.combine(
+                current_date, time(19, 0, tzinfo=ZoneInfo("Europe/London"))
             )
         else:
             business_days_passed += 1
 
         loops += 1
-        current_datetime += relativedelta.relativedelta(days=1)
+        current_date += timedelta(days=1)
 
     return None
 
@@ -409,8 +601,8 @@ def get_all_valid_weekly_prompts(
 
 
 def populate_primary_curve_datetimes(
-    non_prompts: List[date],
-    product_holidays: List[Holiday],
+    non_prompts: Union[List[date], LMEHolidayCalendar],
+    product_holidays: Union[List[Holiday], LMEHolidayCalendar],
     forward_months=_DEFAULT_FORWARD_MONTHS,
     _current_datetime=None,
 ) -> LMEFuturesCurve:
@@ -419,10 +611,11 @@ def populate_primary_curve_datetimes(
     provide: TOM, CASH, 3M, weeklies, and monthlies with no guarantee
     of uniqueness of prompt between these fields.
 
-    :param non_prompts: List of all LME non-prompt dates
-    :type non_prompts: List[date]
-    :param product_holidays: List of all product holidays
-    :type product_holidays: List[Holiday]
+    :param non_prompts: List of all LME non-prompt dates, or a holiday calendar
+    whose holidays are the non-prompts
+    :type non_prompts: Union[List[date], LMEHolidayCalendar]
+    :param product_holidays: List of all product holidays, or their calendar
+    :type product_holidays: Union[List[Holiday], LMEHolidayCalendar]
     :param forward_months: Number of months of monthly futures to generate, also corresponds
     to the number of options generated as these are derivative of the monthly futures,
     defaults to 18
@@ -435,9 +628,10 @@ def populate_primary_curve_datetimes(
     lme_prompt_map = get_lme_prompt_map(
         non_prompts, _current_datetime=_current_datetime
     )
+    product_holiday_calendar = get_lme_holiday_calendar(product_holidays)
     lme_3m_datetime = get_3m_datetime(_current_datetime, lme_prompt_map)
-    lme_cash_datetime = get_cash_datetime(_current_datetime, product_holidays)
-    lme_tom_datetime = get_tom_datetime(_current_datetime, product_holidays)
+    lme_cash_datetime = get_cash_datetime(_current_datetime, product_holiday_calendar)
+    lme_tom_datetime = get_tom_datetime(_current_datetime, product_holiday_calendar)
     lme_weekly_datetimes = get_all_valid_weekly_prompts(
         _current_datetime, lme_prompt_map
     )
@@ -452,3 +646,128 @@ def populate_primary_curve_datetimes(
         lme_prompt_map,
         tom=lme_tom_datetime,
     )
+
+
+def get_lme_session_date(current_datetime: datetime) -> date:
+    """Returns the date of the LME trading session `current_datetime` falls
+    in, sessions run from 19:31 on one day through 19:30 on the next and take
+    the date of the latter.
+
+    :param current_datetime: The datetime to find the session of, naive
+    datetimes are assumed to be in London time
+    :type current_datetime: datetime
+    :return: Date of the trading session
+    :rtype: date
+    """
+    if current_datetime.tzinfo is not None:
+        current_datetime = current_datetime.astimezone(ZoneInfo("Europe/London"))
+    return (current_datetime + relativedelta.relativedelta(hours=4, minutes=29)).date()
+
+
+def get_holiday_fingerprint(
+    non_prompts: Union[Iterable[date], LMEHolidayCalendar],
+    product_holidays: Union[Iterable[Holiday], LMEHolidayCalendar],
+) -> str:
+    """Hashes non-prompts and product holidays, with their closure flags,
+    so identical calendars give the same fingerprint whatever their order.
+
+    :param non_prompts: LME non-prompt dates, or a holiday calendar whose
+    holidays are the non-prompts
+    :type non_prompts: Union[Iterable[date], LMEHolidayCalendar]
+    :param product_holidays: Product holidays, or their calendar
+    :type product_holidays: Union[Iterable[Holiday], LMEHolidayCalendar]
+    :return: Hex digest fingerprint of the calendar
+    :rtype: str
+    """
+    if isinstance(non_prompts, LMEHolidayCalendar):
+        non_prompts = non_prompts.holiday_dates
+    calendar_hash = hashlib.sha256()
+    for non_prompt in sorted(set(non_prompts)):
+        calendar_hash.update(non_prompt.isoformat().encode())
+    calendar_hash.update(b"|")
+    for holiday_date, is_closure_date in get_lme_holiday_calendar(
+        product_holidays
+    ).iter_holiday_closure_flags():
+        calendar_hash.update(f"{holiday_date.isoformat()}:{is_closure_date:d}".encode())
+    return calendar_hash.hexdigest()
+
+
+class LMEFuturesCurveCache:
+    """Bounded LRU cache of `LMEFuturesCurve`s keyed by holiday calendar
+    fingerprint, trading session date and `forward_months`, so products
+    sharing a calendar and repeat invocations within a session reuse one
+    curve.
+
+    A curve is generated for the datetime of the first call in its session,
+    cached curves are shared between callers so should be treated as read-only.
+    """
+
+    def __init__(self, max_size: int = LME_FUTURES_CURVE_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._curves: OrderedDict[
+            Tuple[str, date, int], LMEFuturesCurve
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_primary_curve(
+        self,
+        non_prompts: Union[List[date], LMEHolidayCalendar],
+        product_holidays: Union[List[Holiday], LMEHolidayCalendar],
+        forward_months=_DEFAULT_FORWARD_MONTHS,
+        _current_datetime=None,
+    ) -> LMEFuturesCurve:
+        """Cached equivalent of `populate_primary_curve_datetimes`.
+
+        :param non_prompts: List of all LME non-prompt dates, or a holiday
+        calendar whose holidays are the non-prompts
+        :type non_prompts: Union[List[date], LMEHolidayCalendar]
+        :param product_holidays: List of all product holidays, or their calendar
+        :type product_holidays: Union[List[Holiday], LMEHolidayCalendar]
+        :param forward_months: Number of months of monthly futures to generate,
+        defaults to 18
+        :type forward_months: int, optional
+        :return: Container for LME product future prompt datetimes
+        :rtype: LMEFuturesCurve
+        """
+        if not isinstance(_current_datetime, datetime):
+            _current_datetime = datetime.now(tz=ZoneInfo("Europe/London"))
+        product_holidays = get_lme_holiday_calendar(product_holidays)
+        cache_key = (
+            get_holiday_fingerprint(non_prompts, product_holidays),
+            get_lme_session_date(_current_datetime),
+            forward_months,
+        )
+        with self._lock:
+            lme_futures_curve = self._curves.get(cache_key)
+            if lme_futures_curve is not None:
+                self._curves.move_to_end(cache_key)
+                self.hits += 1
+                return lme_futures_curve
+            self.misses += 1
+
+        lme_futures_curve = populate_primary_curve_datetimes(
+            non_prompts,
+            product_holidays,
+            forward_months=forward_months,
+            _current_datetime=_current_datetime,
+        )
+        if self.max_size > 0:
+            with self._lock:
+                self._curves[cache_key] = lme_futures_curve
+                self._curves.move_to_end(cache_key)
+                while len(self._curves) > self.max_size:
+                    self._curves.popitem(last=False)
+        return lme_futures_curve
+
+    def clear(self):
+        with self._lock:
+            self._curves.clear()
+
+
+_lme_futures_curve_cache = LMEFuturesCurveCache()
+
+
+def get_lme_futures_curve_cache() -> LMEFuturesCurveCache:
+    return _lme_futures_curve_cache
@@ -1,6 +1,7 @@
 import logging
 import os
 from datetime import datetime
+from zoneinfo import ZoneInfo
 
 import pandas as pd
 import redis
@@ -11,7 +12,11 @@ from dateutil import relativedelta
 from upedata.static_data import Currency
 
 from prep import handy_dandy_variables
-from prep.helpers import lme_staticdata_utils, time_series_interpolation
+from prep.helpers import (
+    lme_staticdata_utils,
+    redis_payload_utils,
+    time_series_interpolation,
+)
 from prep.lme import contract_db_gen
 
 redis_dev_key_append = handy_dandy_variables.redis_key_append
@@ -39,6 +44,13 @@ PREP_GBP_RECENCY_KEY = os.getenv("PREP_GBP_RECENCY_KEY", "prep:health:rates:gbp"
 PREP_EUR_RECENCY_KEY = os.getenv("PREP_EUR_RECENCY_KEY", "prep:health:rates:eur")
 PREP_JPY_RECENCY_KEY = os.getenv("PREP_JPY_RECENCY_KEY", "prep:health:rates:jpy")
 
+# builds interest rate curves from the INR files just parsed rather than reading
+# them back from the database, only matches the database curves if the parsed
+# files hold the latest publication for every date on each curve
+LME_INR_CURVES_FROM_PARSED_FILES = os.getenv(
+    "LME_INR_CURVES_FROM_PARSED_FILES", "false"
+).lower() in ("t", "true", "y", "yes", "1")
+
 UPDATED_CURRENCY_TO_KEY = {
     "USD": PREP_USD_RECENCY_KEY,
     "GBP": PREP_GBP_RECENCY_KEY,
@@ -84,10 +96,14 @@ def update_exchange_rate_curves_from_lme(
 
 
 def update_currency_interest_curves_from_lme(
-    redis_conn: redis.Redis, engine: sqlalchemy.Engine, first_run=False
+    redis_conn: redis.Redis,
+    engine: sqlalchemy.Engine,
+    first_run=False,
+    curves_from_parsed_files=LME_INR_CURVES_FROM_PARSED_FILES,
 ) -> bool:
-    rate_curve_data = {
-        currency_iso_sym: {"legacy": {}, "new": {}}
+    # legacy and new JSON payloads for each currency's curve
+    rate_curve_payloads = {
+        currency_iso_sym: ("{}", "{}")
         for currency_iso_sym in list(UPDATED_CURRENCY_TO_KEY.keys())
     }
 
@@ -104,52 +120,79 @@ def update_currency_interest_curves_from_lme(
         (
             most_recent_rate_datetime,
             updated_currencies,
+            interest_rates,
         ) = lme_staticdata_utils.update_lme_interest_rate_static_data(
             session, most_recent_datetime=num_to_pull_or_dt
         )
-        # selects the most recent set of interest rates published for specific
-        # currency and then returns the date they're forward to and the cont_rate
-        select_most_recent_inr_curve_stmt = sqlalchemy.text(
-            """
-                SELECT DISTINCT ON (to_date, currency_symbol, "source")
-                    to_date, continuous_rate
-                    FROM interest_rates
-                WHERE "source" = 'LME' AND to_date >= CURRENT_DATE - 1 AND currency_symbol = :currency_symbol
-                ORDER BY to_date, currency_symbol, "source", published_date DESC
-            """
-        )
         session.commit()
-        for curr_iso_sym, rate_data in rate_curve_data.items():
-            interest_rates = session.execute(
-                select_most_recent_inr_curve_stmt,
-                {"currency_symbol": curr_iso_sym.lower()},
+        # only updated currencies get their curves pushed, so there's no need
+        # to fetch the rest
+        updated_currency_symbols = sorted(
+            updated_currency_iso.lower() for updated_currency_iso in updated_currencies
+        )
+        if len(updated_currency_symbols) == 0:
+            interest_rate_df = pd.DataFrame(
+                columns=["currency_symbol", "to_date", "continuous_rate"]
             )
-            interest_rate_df = pd.DataFrame.from_records(
-                interest_rates,
-                columns=["to_date", "continuous_rate"],
+        elif curves_from_parsed_files:
+            interest_rate_df = (
+                lme_staticdata_utils.build_most_recent_interest_rate_curves(
+                    interest_rates,
+                    datetime.now(tz=ZoneInfo("Europe/London")).date()
+                    - relativedelta.relativedelta(days=1),
+                )
             )
-            interest_rate_df.loc[:, "continuous_rate"] = pd.to_numeric(
-                interest_rate_df.loc[:, "continuous_rate"], downcast="float"
+            interest_rate_df = interest_rate_df.loc[
+                interest_rate_df["currency_symbol"].isin(updated_currency_symbols)
+            ]
+        else:
+            # selects the most recent set of interest rates published for each
+            # currency and then returns the date they're forward to and the cont_rate
+            select_most_recent_inr_curves_stmt = sqlalchemy.text(
+                """
+                    SELECT DISTINCT ON (currency_symbol, to_date, "source")
+                        currency_symbol, to_date, continuous_rate
+                        FROM interest_rates
+                    WHERE "source" = 'LME' AND to_date >= CURRENT_DATE - 1 AND currency_symbol = ANY(:currency_symbols)
+                    ORDER BY currency_symbol, to_date, "source", published_date DESC
+                """
             )
-            interest_rate_df.index = pd.DatetimeIndex(
-                data=pd.to_datetime(interest_rate_df["to_date"].to_list())
+            interest_rates_result = session.execute(
+                select_most_recent_inr_curves_stmt,
+                {"currency_symbols": updated_currency_symbols},
+            )
+            interest_rate_df = pd.DataFrame.from_records(
+                interest_rates_result,
+                columns=["currency_symbol", "to_date", "continuous_rate"],
             )
+            session.commit()
 
-            interped_interest_rate_df = (
-                time_series_interpolation.interpolate_on_time_series_df(
-                    interest_rate_df,
-                    "continuous_rate",
-                    "interp_cont_rate",
-                )
+    if len(interest_rate_df) > 0:
+        interest_rate_df["continuous_rate"] = pd.to_numeric(
+            interest_rate_df["continuous_rate"], downcast="float"
+        )
+        interest_rate_df.index = pd.DatetimeIndex(
+            data=pd.to_datetime(interest_rate_df["to_date"].to_list())
+        )
+        interped_interest_rate_df = (
+            time_series_interpolation.interpolate_on_grouped_time_series_df(
+                interest_rate_df,
+                "currency_symbol",
+                "continuous_rate",
+                "interp_cont_rate",
+            )
+        )
+        for currency_symbol, currency_curve_df in interped_interest_rate_df.groupby(
+            level=0, sort=False
+        ):
+            currency_curve_df = currency_curve_df.droplevel(0)
+            rate_curve_payloads[
+                currency_symbol.upper()
+            ] = redis_payload_utils.serialise_legacy_and_new_curve_payloads(
+                currency_curve_df.index,  # type: ignore
+                currency_curve_df["interp_cont_rate"].to_numpy(),
+                "Interest Rate",
             )
-            for interest_rate_row_data in interped_interest_rate_df.itertuples():
-                rate_data["legacy"][
-                    interest_rate_row_data.Index.strftime(r"%Y%m%d")  # type: ignore
-                ] = {"Interest Rate": interest_rate_row_data.interp_cont_rate}
-                rate_data["new"][interest_rate_row_data.Index.strftime(r"%Y%m%d")] = (  # type: ignore
-                    interest_rate_row_data.interp_cont_rate
-                )
-        session.commit()
 
     redis_pipeline = redis_conn.pipeline()
     most_recent_dt_Ymd = most_recent_rate_datetime.strftime(r"%Y%m%d")
@@ -157,11 +200,11 @@ def update_currency_interest_curves_from_lme(
     for updated_currency_iso in updated_currencies:
         redis_pipeline.set(
             f"{updated_currency_iso.upper()}Rate{redis_dev_key_append}",
-            ujson.dumps(rate_curve_data[updated_currency_iso.upper()]["legacy"]),
+            rate_curve_payloads[updated_currency_iso.upper()][0],
         )
         redis_pipeline.set(
             f"prep:cont_interest_rate:{updated_currency_iso.lower()}{redis_dev_key_append}",
-            ujson.dumps(rate_curve_data[updated_currency_iso.upper()]["new"]),
+            rate_curve_payloads[updated_currency_iso.upper()][1],
         )
         redis_pipeline.set(
             UPDATED_CURRENCY_TO_KEY[updated_currency_iso.upper()]
@@ -222,13 +265,13 @@ def update_future_closing_prices_from_lme(
                     product_specific_df, "price", "interpolated_price"
                 )
             )
-            underlying_close_data = {}  # date: interpolated_price
-            for row in interpolated_product_curve_df.itertuples():
-                underlying_close_data[row.Index.to_pydatetime().strftime(r"%Y%m%d")] = (  # type: ignore
-                    round(row.interpolated_price, 2)  # type: ignore
-                )
             redis_pipeline.set(
-                redis_key + redis_dev_key_append, ujson.dumps(underlying_close_data)
+                redis_key + redis_dev_key_append,
+                redis_payload_utils.serialise_curve_payload(
+                    interpolated_product_curve_df.index,  # type: ignore
+                    interpolated_product_curve_df["interpolated_price"].to_numpy(),
+                    value_decimals=2,
+                ),
             )
         redis_pipeline.set(
             LME_FCP_RECENCY_KEY + redis_dev_key_append,
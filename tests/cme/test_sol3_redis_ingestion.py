@@ -1,9 +1,13 @@
 import logging
+import os
+import queue
+import time
 from datetime import date, datetime
 from dateutil.relativedelta import relativedelta
 
 import pytest
 import json
+import redis
 
 # from dateutil import relativedelta
 from upedata.static_data import Holiday
@@ -86,3 +90,380 @@ def test_filter_for_valid_redis_keys():
 )
 def test_process_CME_redis_data(key, raw_data, expected_result):
     assert sol3_redis_ingestion.process_CME_redis_data(key, raw_data) == expected_result
+
+
+def test_fetch_active_cme_redis_data(mocker):
+    current_date = datetime.now()
+    past_date = (current_date - relativedelta(years=1)).strftime("%Y-%m")
+    future_date = (current_date + relativedelta(years=1)).strftime("%Y-%m")
+    active_keys = [
+        f"sol3:XCME:HXE-{future_date}",
+        f"sol3:XCME:H1W-{future_date}",
+        f"sol3:XCME:AX-{future_date}",
+    ]
+    redis_conn = mocker.MagicMock()
+    redis_conn.scan_iter.return_value = iter(
+        [
+            active_keys[0],
+            f"sol3:XCME:HXE-{past_date}",
+            active_keys[1],
+            f"sol3:XCME:ABC-{future_date}",
+            active_keys[0],  # SCAN may return a key more than once
+            active_keys[2],
+        ]
+    )
+    pipeline = redis_conn.pipeline.return_value
+    pipeline.execute.return_value = [["hxe", None], ["ax"]]
+
+    active_cme_redis_data = sol3_redis_ingestion.fetch_active_cme_redis_data(
+        redis_conn, scan_count=5000, mget_chunk_size=2
+    )
+
+    assert active_cme_redis_data == [
+        (active_keys[0], "hxe"),
+        (active_keys[1], None),
+        (active_keys[2], "ax"),
+    ]
+    redis_conn.scan_iter.assert_called_once_with("sol3:XCME*", count=5000)
+    redis_conn.pipeline.assert_called_once_with(transaction=False)
+    assert [call.args[0] for call in pipeline.mget.call_args_list] == [
+        active_keys[:2],
+        active_keys[2:],
+    ]
+    pipeline.execute.assert_called_once()
+    redis_conn.get.assert_not_called()
+
+
+def test_fetch_active_cme_redis_data_no_keys(mocker):
+    redis_conn = mocker.MagicMock()
+    redis_conn.scan_iter.return_value = iter(["sol3:XCME:HXE-2000-01"])
+
+    assert sol3_redis_ingestion.fetch_active_cme_redis_data(redis_conn) == []
+    redis_conn.pipeline.assert_not_called()
+
+
+def test_sol3_payload_hash_cache(mocker):
+    redis_conn = mocker.MagicMock()
+    redis_conn.hgetall.return_value = {
+        "sol3:XCME:HXE-2025-06": sol3_redis_ingestion.get_payload_hash(
+            "hxe", date(2025, 5, 1)
+        ),
+        "sol3:XCME:HXE-2025-05": "expired",
+    }
+    payload_hash_cache = sol3_redis_ingestion.Sol3PayloadHashCache("hashes")
+
+    (
+        changed_redis_data,
+        changed_payload_hashes,
+    ) = payload_hash_cache.get_changed_redis_data(
+        redis_conn,
+        [
+            ("sol3:XCME:HXE-2025-06", "hxe"),
+            ("sol3:XCME:AX-2025-06", "ax"),
+            ("sol3:XCME:H1W-2025-06", None),
+        ],
+        date(2025, 5, 1),
+    )
+    # loaded from redis on a cold start, unchanged and missing payloads skipped
+    redis_conn.hgetall.assert_called_once_with("hashes")
+    assert changed_redis_data == [("sol3:XCME:AX-2025-06", "ax")]
+
+    payload_hash_cache.record_payload_hashes(
+        redis_conn,
+        changed_payload_hashes,
+        ["sol3:XCME:HXE-2025-06", "sol3:XCME:AX-2025-06", "sol3:XCME:H1W-2025-06"],
+    )
+    pipeline = redis_conn.pipeline.return_value
+    pipeline.hset.assert_called_once_with("hashes", mapping=changed_payload_hashes)
+    pipeline.hdel.assert_called_once_with("hashes", "sol3:XCME:HXE-2025-05")
+
+    changed_redis_data, _ = payload_hash_cache.get_changed_redis_data(
+        redis_conn,
+        [("sol3:XCME:HXE-2025-06", "hxe"), ("sol3:XCME:AX-2025-06", "ax")],
+        date(2025, 5, 1),
+    )
+    assert changed_redis_data == []
+    # curves are written again each day even when unchanged
+    changed_redis_data, _ = payload_hash_cache.get_changed_redis_data(
+        redis_conn, [("sol3:XCME:AX-2025-06", "ax")], date(2025, 5, 2)
+    )
+    assert changed_redis_data == [("sol3:XCME:AX-2025-06", "ax")]
+    redis_conn.hgetall.assert_called_once()
+
+
+def test_push_redis_data_to_postgres_unchanged(mocker):
+    mocker.patch.object(
+        sol3_redis_ingestion,
+        "fetch_active_cme_redis_data",
+        return_value=[("sol3:XCME:HXE-2025-06", "{}")],
+    )
+    payload_hash_cache = sol3_redis_ingestion.Sol3PayloadHashCache("hashes")
+    mocker.patch.object(
+        sol3_redis_ingestion,
+        "get_sol3_payload_hash_cache",
+        return_value=payload_hash_cache,
+    )
+    redis_conn = mocker.MagicMock()
+    redis_conn.hgetall.return_value = {
+        "sol3:XCME:HXE-2025-06": sol3_redis_ingestion.get_payload_hash(
+            "{}", datetime.now().date()
+        )
+    }
+    engine = mocker.MagicMock()
+
+    status = sol3_redis_ingestion.push_redis_data_to_postgres(
+        redis_conn, engine, detect_changes=True
+    )
+
+    assert status == "No changed data to push to Postgres"
+    engine.connect.assert_not_called()
+    redis_conn.pipeline.assert_not_called()
+
+
+def test_sol3_keyspace_listener_listen(mocker):
+    future_date = (datetime.now() + relativedelta(years=1)).strftime("%Y-%m")
+    hxe_key = f"sol3:XCME:HXE-{future_date}"
+    ax_key = f"sol3:XCME:AX-{future_date}"
+    clock = {"now": 0.0}
+    mocker.patch.object(
+        sol3_redis_ingestion.time, "monotonic", side_effect=lambda: clock["now"]
+    )
+
+    def keyspace_message(key, event):
+        return {
+            "type": "pmessage",
+            "pattern": "__keyspace@0__:sol3:XCME*",
+            "channel": f"__keyspace@0__:{key}",
+            "data": event,
+        }
+
+    # each message arrives at the given time, None once the timeout elapses
+    messages = [
+        (0.0, {"type": "psubscribe", "channel": "__keyspace@0__:sol3:XCME*"}),
+        (0.1, keyspace_message(hxe_key, "set")),
+        (0.2, keyspace_message(hxe_key, "set")),  # burst coalesced
+        (0.3, keyspace_message(f"sol3:XCME:ABC-{future_date}", "set")),
+        (0.4, keyspace_message(ax_key, "del")),
+        (0.5, keyspace_message(ax_key, "set")),
+        (5.0, keyspace_message(ax_key, "set")),
+        (9.8, keyspace_message(hxe_key, "set")),  # still pending when stopped
+    ]
+
+    def get_message(timeout):
+        if len(messages) > 0 and messages[0][0] <= clock["now"] + timeout:
+            clock["now"], message = messages.pop(0)
+            if len(messages) == 0:
+                keyspace_listener.stop()
+            return message
+        clock["now"] += timeout
+        return None
+
+    redis_conn = mocker.MagicMock()
+    redis_conn.connection_pool.connection_kwargs = {"db": 0}
+    pubsub = redis_conn.pubsub.return_value
+    pubsub.get_message.side_effect = get_message
+    fetch_active_cme_redis_data = mocker.patch.object(
+        sol3_redis_ingestion,
+        "fetch_active_cme_redis_data",
+        return_value=[(hxe_key, "{}")],
+    )
+    fetch_times = []
+
+    def fetch_cme_redis_data(redis_conn, keys):
+        fetch_times.append(clock["now"])
+        return [(key, "{}") for key in keys]
+
+    fetch_cme_redis_data = mocker.patch.object(
+        sol3_redis_ingestion,
+        "fetch_cme_redis_data",
+        side_effect=fetch_cme_redis_data,
+    )
+    write_cme_redis_data_to_postgres = mocker.patch.object(
+        sol3_redis_ingestion,
+        "write_cme_redis_data_to_postgres",
+        side_effect=lambda redis_conn, engine, cme_redis_data, **kwargs: len(
+            cme_redis_data
+        ),
+    )
+    keyspace_listener = sol3_redis_ingestion.Sol3KeyspaceListener(
+        redis_conn, mocker.MagicMock(), max_batch_latency_seconds=1, max_batch_size=10
+    )
+
+    keyspace_listener.listen()
+
+    pubsub.psubscribe.assert_called_once_with("__keyspace@0__:sol3:XCME*")
+    # caught up with a poll once subscribed
+    fetch_active_cme_redis_data.assert_called_once_with(redis_conn)
+    assert write_cme_redis_data_to_postgres.call_args_list[0].kwargs["active_keys"] == [
+        hxe_key
+    ]
+    assert [call.args[1] for call in fetch_cme_redis_data.call_args_list] == [
+        [hxe_key, ax_key],
+        [ax_key],
+        [hxe_key],
+    ]
+    assert write_cme_redis_data_to_postgres.call_count == 4
+    assert keyspace_listener.take_result() == (
+        sol3_redis_ingestion.KeyspaceIngestionResult(
+            batches_written=4, keys_touched=5, curves_written=5
+        )
+    )
+    assert keyspace_listener.take_result() == (
+        sol3_redis_ingestion.KeyspaceIngestionResult(0, 0, 0)
+    )
+    # each batch is written once its first key has waited the max latency,
+    # the last as the listener stops
+    assert fetch_times == pytest.approx([1.1, 6.0, 9.8])
+    pubsub.close.assert_called_once()
+
+
+def test_sol3_keyspace_listener_resubscribes_after_failure(mocker):
+    keyspace_listener = sol3_redis_ingestion.Sol3KeyspaceListener(
+        mocker.MagicMock(), mocker.MagicMock(), retry_seconds=0
+    )
+
+    def fail_then_stop():
+        if listen.call_count == 1:
+            raise redis.ConnectionError("Connection reset by peer")
+        keyspace_listener._stop_event.set()
+
+    listen = mocker.patch.object(
+        keyspace_listener, "listen", side_effect=fail_then_stop
+    )
+
+    assert keyspace_listener.start()
+    wait_deadline = time.monotonic() + 5
+    while keyspace_listener.is_running and time.monotonic() < wait_deadline:
+        time.sleep(0.01)
+
+    assert listen.call_count == 2
+    assert not keyspace_listener.is_running
+
+
+@pytest.fixture()
+def local_redis_conn():
+    redis_conn = redis.Redis(
+        host=os.getenv("REDIS_TEST_HOST", "localhost"),
+        port=int(os.getenv("REDIS_TEST_PORT", "6379")),
+        db=int(os.getenv("REDIS_TEST_DB", "15")),
+        socket_connect_timeout=1,
+        decode_responses=True,
+    )
+    try:
+        redis_conn.ping()
+    except redis.ConnectionError:
+        pytest.skip("No redis server available to test against")
+    notify_keyspace_events = redis_conn.config_get("notify-keyspace-events")[
+        "notify-keyspace-events"
+    ]
+    redis_conn.config_set("notify-keyspace-events", "K$")
+    yield redis_conn
+    redis_conn.config_set("notify-keyspace-events", notify_keyspace_events)
+    redis_conn.close()
+
+
+def test_sol3_keyspace_listener_local_redis(mocker, local_redis_conn):
+    future_date = (datetime.now() + relativedelta(years=1)).strftime("%Y-%m")
+    polled_key = f"sol3:XCME:HXE-{future_date}"
+    notified_key = f"sol3:XCME:AX-{future_date}"
+    written_redis_data = queue.Queue()
+
+    def write_cme_redis_data_to_postgres(redis_conn, engine, cme_redis_data, **kwargs):
+        for redis_data in cme_redis_data:
+            written_redis_data.put(redis_data)
+        return len(cme_redis_data)
+
+    def wait_for_written(expected_redis_data):
+        wait_deadline = time.monotonic() + 10
+        while time.monotonic() < wait_deadline:
+            try:
+                if written_redis_data.get(timeout=0.1) == expected_redis_data:
+                    return
+            except queue.Empty:
+                pass
+        pytest.fail(f"{expected_redis_data} was never written")
+
+    mocker.patch.object(
+        sol3_redis_ingestion,
+        "write_cme_redis_data_to_postgres",
+        side_effect=write_cme_redis_data_to_postgres,
+    )
+    keyspace_listener = sol3_redis_ingestion.Sol3KeyspaceListener(
+        local_redis_conn, mocker.MagicMock(), max_batch_latency_seconds=0.1
+    )
+    try:
+        # written before listening, so only picked up by the catch up poll
+        local_redis_conn.set(polled_key, "polled")
+        assert keyspace_listener.start()
+        wait_for_written((polled_key, "polled"))
+
+        local_redis_conn.set(notified_key, "notified")
+        wait_for_written((notified_key, "notified"))
+    finally:
+        keyspace_listener.stop(timeout=5)
+        local_redis_conn.delete(polled_key, notified_key)
+
+    assert not keyspace_listener.is_running
+    assert keyspace_listener.take_result().batches_written >= 2
+
+
+@pytest.mark.parametrize(
+    ["key", "expected_result"],
+    [
+        ("sol3:XCME:HXE-2025-06", ("HXE", 2025 * 12 + 6)),
+        ("sol3:XCME:H5W-2025-12", ("H5W", 2025 * 12 + 12)),
+        ("sol3:XCME:HXE-2025-13", None),
+        ("sol3:XCME:HXE-2025-06:dev", None),
+        ("sol3:XCME-2025-06", None),
+    ],
+)
+def test_parse_sol3_cme_key(key, expected_result):
+    assert sol3_redis_ingestion.parse_sol3_cme_key(key) == expected_result
+
+
+def test_is_valid_redis_key_configured_symbols(mocker):
+    current_date = datetime(2025, 6, 15)
+    mocker.patch.object(sol3_redis_ingestion, "SOL3_CME_SYMBOLS", frozenset(["ABC"]))
+
+    assert sol3_redis_ingestion.is_valid_redis_key(
+        "sol3:XCME:ABC-2025-06", current_date
+    )
+    assert not sol3_redis_ingestion.is_valid_redis_key(
+        "sol3:XCME:ABC-2025-05", current_date
+    )
+    assert not sol3_redis_ingestion.is_valid_redis_key(
+        "sol3:XCME:HXE-2025-06", current_date
+    )
+
+
+def test_process_CME_redis_data_sorts_strikes():
+    curve_data = sol3_redis_ingestion.process_CME_redis_data(
+        "sol3:XCME:HXE-2025-06",
+        json.dumps(
+            {
+                "300": {"v": 0.7, "dvds": 0.3},
+                "1e2": {"v": "0.5", "d2vd2s": 0.2},
+                "200.5": {"v": 0.6},
+            }
+        ),
+    )
+
+    assert curve_data["strikes"] == [100.0, 200.5, 300.0]
+    assert curve_data["volatilities"] == [0.5, 0.6, 0.7]
+    assert curve_data["dvds"] == [0.0, 0.0, 0.3]
+    assert curve_data["d2vd2s"] == [0.2, 0.0, 0.0]
+    assert all(
+        type(value) is float
+        for column_name in ["strikes", "volatilities", "dvds", "d2vd2s"]
+        for value in curve_data[column_name]
+    )
+
+
+def test_process_CME_redis_data_nan_payload():
+    # not valid strict JSON, but still accepted as it was by `json.loads`
+    curve_data = sol3_redis_ingestion.process_CME_redis_data(
+        "sol3:XCME:HXE-2025-06", '{"100": {"v": NaN}, "200": {"v": 0.5}}'
+    )
+
+    assert curve_data["strikes"] == [100.0, 200.0]
+    assert curve_data["volatilities"][1] == 0.5
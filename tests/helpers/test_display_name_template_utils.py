@@ -0,0 +1,131 @@
+from datetime import datetime
+
+import pytest
+import upedata.static_data as upestatic
+import upedata.template_language.parser as upeparse
+import upedata.template_language.utils as upeutils
+from zoneinfo import ZoneInfo
+
+from prep.helpers import display_name_template_utils
+
+LME_OPTION_DISPLAY_NAME_TEMPLATE = (
+    r"#{<option>.product.short_name}£o"
+    r"#{map_month_year_coded(<option>.underlying_future.expiry)}£"
+    r" @{strike}£ @{call_or_put}£"
+)
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        LME_OPTION_DISPLAY_NAME_TEMPLATE,
+        r"#{<option>.product.long_name}£ #{map_yyyy_mm_dd(<option>.expiry)}£",
+        r"#{map_month_year_coded_plus_one_month(<option>.underlying_future.expiry)}£",
+        r"plain name with no statements",
+    ],
+)
+@pytest.mark.parametrize(
+    "underlying_future_expiry",
+    [
+        datetime(2024, 1, 17, 19, 0, tzinfo=ZoneInfo("Europe/London")),
+        datetime(2025, 12, 17, 19, 0, tzinfo=ZoneInfo("Europe/London")),
+    ],
+)
+def test_compiled_template_matches_upedata_parser(
+    template: str, underlying_future_expiry: datetime
+):
+    option_expiry = underlying_future_expiry.replace(day=3, hour=1, minute=1)
+    product = upestatic.Product(
+        symbol="xlme-lad-usd", short_name="lad", long_name="aluminium"
+    )
+    option = upestatic.Option(
+        symbol="xlme-lad-usd o 24-01-03 a",
+        expiry=option_expiry,
+        display_name=template,
+        product=product,
+        underlying_future=upestatic.Future(expiry=underlying_future_expiry),
+    )
+    expected_display_name = upeparse.substitute_derivative_generation_time(
+        option
+    ).display_name
+
+    compiled_template = display_name_template_utils.compile_display_name_template(
+        template
+    )
+    assert (
+        compiled_template.render_generation_time(
+            {
+                "<option>.expiry": option_expiry,
+                "<option>.product.short_name": "lad",
+                "<option>.product.long_name": "aluminium",
+                "<option>.underlying_future.expiry": underlying_future_expiry,
+            }
+        )
+        == expected_display_name
+    )
+
+
+def test_compile_display_name_template_is_cached():
+    assert display_name_template_utils.compile_display_name_template(
+        LME_OPTION_DISPLAY_NAME_TEMPLATE
+    ) is display_name_template_utils.compile_display_name_template(
+        LME_OPTION_DISPLAY_NAME_TEMPLATE
+    )
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        r"#{unknown_function(<option>.expiry)}£",
+        r"#{map_yyyy_mm_dd(<option>.expiry, <option>.expiry)}£",
+        r"#{map_yyyy_mm_dd(expiry)}£",
+        r"#{<trade>.expiry}£",
+    ],
+)
+def test_compile_display_name_template_bad_statement(template: str):
+    with pytest.raises(upeparse.BadTemplateStatement):
+        display_name_template_utils.CompiledDisplayNameTemplate(template)
+
+
+def test_render_generation_time_missing_data():
+    compiled_template = display_name_template_utils.compile_display_name_template(
+        LME_OPTION_DISPLAY_NAME_TEMPLATE
+    )
+    with pytest.raises(upeparse.BadInputObject):
+        compiled_template.render_generation_time(
+            {
+                "<option>.product.short_name": None,
+                "<option>.underlying_future.expiry": datetime(2024, 1, 17),
+            }
+        )
+
+
+def test_upedata_template_function_registry():
+    # compiled templates resolve functions from a private upedata registry,
+    # an upgrade of the pinned wheel changing it must be caught here
+    assert set(upeutils._LOCAL_FUNCTIONS) == {
+        "map_month_year_coded",
+        "map_month_year_coded_plus_one_month",
+        "map_yyyy_mm_dd",
+        "map_yy_mm_dd",
+    }
+    for local_func_data in upeutils._LOCAL_FUNCTIONS.values():
+        assert callable(local_func_data["callable"])
+        assert len(local_func_data["signature"][0]) == 1
+
+
+def test_upedata_tokenize_output():
+    tokenized_template = upeparse.tokenize(LME_OPTION_DISPLAY_NAME_TEMPLATE)
+
+    assert tokenized_template.subtracted_string == (
+        "{gen_stmt_0}o{gen_stmt_1} {late_stmt_2} {late_stmt_3}"
+    )
+    assert tokenized_template.generation_time_operations["gen_stmt_0"] == (
+        "#{<option>.product.short_name}£"
+    )
+    assert tokenized_template.generation_time_operations["gen_stmt_1"] == (
+        "#{map_month_year_coded(<option>.underlying_future.expiry)}£"
+    )
+    assert tokenized_template.late_evaluation_dynamic_stmts["late_stmt_3"] == (
+        "@{call_or_put}£"
+    )
@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+
+from prep.helpers import lme_file_schemas
+
+SAMPLE_LME_FILES = {
+    "INR": "tests/rjo_sftp_simulator/LMEPrices/20230524_INR_r.csv",
+    "EXR": "tests/rjo_sftp_simulator/LMEPrices/20230524_EXR_r.csv",
+    "FCP": "tests/rjo_sftp_simulator/LMEPrices/20230926_FCP_r.csv",
+    "CLO": "tests/rjo_sftp_simulator/LMEPrices/20230929_CLO_r.csv",
+}
+
+
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+@pytest.mark.parametrize("file_type", ["INR", "EXR", "FCP", "CLO"])
+def test_lme_file_schema_read_csv(file_type: str, engine: str):
+    if engine == "pyarrow" and not lme_file_schemas.PYARROW_AVAILABLE:
+        pytest.skip("pyarrow is not installed")
+    file_schema = lme_file_schemas.get_lme_file_schema(file_type)
+    assert file_schema is not None
+
+    schema_df = file_schema.read_csv(SAMPLE_LME_FILES[file_type], engine=engine)
+    inferred_df = pd.read_csv(
+        SAMPLE_LME_FILES[file_type], parse_dates=list(file_schema.date_columns)
+    )
+
+    assert list(schema_df.columns) == [
+        lme_file_schemas.normalise_column_name(column_name)
+        for column_name in file_schema.usecols
+    ]
+    assert len(schema_df) == len(inferred_df)
+    for date_column in file_schema.date_columns:
+        schema_column = schema_df[date_column.lower()]
+        assert pd.api.types.is_datetime64_any_dtype(schema_column)
+        assert (schema_column == inferred_df[date_column]).all()
+    for categorical_column in file_schema.categorical_columns:
+        schema_column = schema_df[categorical_column.lower()]
+        assert isinstance(schema_column.dtype, pd.CategoricalDtype)
+    for column_name, column_dtype in file_schema.dtypes.items():
+        schema_column = schema_df[column_name.lower()]
+        assert schema_column.dtype == pd.api.types.pandas_dtype(column_dtype)
+
+
+def test_lme_file_schema_read_csv_filtered():
+    file_schema = lme_file_schemas.get_lme_file_schema("CLO")
+    assert file_schema is not None
+
+    def is_lme_option(clo_chunk: pd.DataFrame) -> pd.Series:
+        return clo_chunk["contract_type"] == "LMEOption"
+
+    filtered_df = file_schema.read_csv_filtered(
+        SAMPLE_LME_FILES["CLO"], is_lme_option, chunksize=1000
+    )
+    full_df = file_schema.read_csv(SAMPLE_LME_FILES["CLO"], engine="c")
+    expected_df = full_df.loc[is_lme_option(full_df)].reset_index(drop=True)
+
+    assert len(filtered_df) == len(expected_df) > 0
+    assert (filtered_df["strike"] == expected_df["strike"]).all()
+    assert pd.api.types.is_datetime64_any_dtype(filtered_df["report_date"])
+    assert isinstance(filtered_df["contract"].dtype, pd.CategoricalDtype)
+
+
+def test_get_lme_file_schema_unknown_type():
+    assert lme_file_schemas.get_lme_file_schema("XYZ") is None
+    assert lme_file_schemas.get_lme_file_schema("clo") is not None
@@ -0,0 +1,118 @@
+import dataclasses
+import json
+import os
+
+import pytest
+import upedata.enums as upeenums
+from upedata.static_data.option import strike_unpacker
+
+from prep.helpers import lme_option_spec_utils, lme_staticdata_utils
+
+OPTION_SPEC_DATA = {
+    "shared": {"time_type": 1, "vol_type": 1, "display_name": "#{<option>.symbol}£"},
+    "specific": {
+        "xlme-lad-usd": {
+            "vol_surface": {
+                "model_type": "delta_spline_wing",
+                "params": {"50 Delta": 0.2},
+            },
+            "strike_intervals": [[1200, 25], [5000, -1]],
+            "multiplier": 25,
+        }
+    },
+}
+
+
+def write_option_spec(path, option_spec_data, mtime_ns):
+    with open(path, "w") as fp:
+        json.dump(option_spec_data, fp)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_lme_option_spec_from_dict():
+    option_spec = lme_option_spec_utils.LMEOptionSpec.from_dict(OPTION_SPEC_DATA)
+
+    product_option_spec = option_spec.products["xlme-lad-usd"]
+    assert product_option_spec.time_type == upeenums.TimeType(1)
+    assert product_option_spec.vol_type == upeenums.VolType(1)
+    assert product_option_spec.display_name == "#{<option>.symbol}£"
+    assert product_option_spec.strike_intervals == ((1200, 25), (5000, -1))
+    assert product_option_spec.get_strike_intervals() == [[1200, 25], [5000, -1]]
+    assert product_option_spec.strikes == tuple(
+        strike_unpacker([[1200, 25], [5000, -1]])
+    )
+    assert product_option_spec.strikes[0] == 1200.0
+    assert product_option_spec.strikes[-1] == 5000.0
+    # the shared specification isn't merged into the source by mutation
+    assert "time_type" not in OPTION_SPEC_DATA["specific"]["xlme-lad-usd"]
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        product_option_spec.multiplier = 6  # type: ignore
+    with pytest.raises(TypeError):
+        option_spec.products["xlme-lcu-usd"] = product_option_spec  # type: ignore
+    with pytest.raises(TypeError):
+        product_option_spec.vol_surface.params["50 Delta"] = 0.3  # type: ignore
+
+
+@pytest.mark.parametrize(
+    "strike_intervals",
+    [[[1200, 25], [5000, 25]], [[1200, 0], [5000, -1]], [[5000, 25], [1200, -1]], []],
+)
+def test_lme_option_product_spec_bad_strike_intervals(strike_intervals):
+    with pytest.raises(ValueError):
+        lme_option_spec_utils.LMEOptionProductSpec.from_dict(
+            "xlme-lad-usd",
+            {
+                **OPTION_SPEC_DATA["shared"],
+                **OPTION_SPEC_DATA["specific"]["xlme-lad-usd"],
+                "strike_intervals": strike_intervals,
+            },
+        )
+
+
+def test_lme_option_product_spec_missing_field():
+    with pytest.raises(ValueError, match="xlme-lad-usd"):
+        lme_option_spec_utils.LMEOptionProductSpec.from_dict(
+            "xlme-lad-usd", OPTION_SPEC_DATA["specific"]["xlme-lad-usd"]
+        )
+
+
+def test_lme_option_spec_loader_reloads_on_modification(tmp_path):
+    option_spec_path = tmp_path / "lme_option_base_data.json"
+    write_option_spec(option_spec_path, OPTION_SPEC_DATA, 1_000_000_000)
+    lme_option_spec_loader = lme_option_spec_utils.LMEOptionSpecLoader(
+        str(option_spec_path)
+    )
+
+    option_spec = lme_option_spec_loader.get_option_spec()
+    assert lme_option_spec_loader.get_option_spec() is option_spec
+
+    modified_option_spec_data = json.loads(json.dumps(OPTION_SPEC_DATA))
+    modified_option_spec_data["specific"]["xlme-lad-usd"]["multiplier"] = 6
+    write_option_spec(option_spec_path, modified_option_spec_data, 2_000_000_000)
+
+    reloaded_option_spec = lme_option_spec_loader.get_option_spec()
+    assert reloaded_option_spec is not option_spec
+    assert reloaded_option_spec.products["xlme-lad-usd"].multiplier == 6
+
+
+def test_get_lme_option_spec_bundled_file():
+    option_spec = lme_option_spec_utils.get_lme_option_spec()
+
+    assert lme_option_spec_utils.get_lme_option_spec() is option_spec
+    assert set(option_spec.products) == {
+        "xlme-lcu-usd",
+        "xlme-lad-usd",
+        "xlme-lzh-usd",
+        "xlme-pbd-usd",
+        "xlme-lnd-usd",
+    }
+
+
+def test_fetch_lme_option_specification_data_returns_copy():
+    option_spec_data = lme_staticdata_utils.fetch_lme_option_specification_data()
+    option_spec_data["specific"].clear()
+
+    assert len(
+        lme_staticdata_utils.fetch_lme_option_specification_data()["specific"]
+    ) == len(lme_option_spec_utils.get_lme_option_spec().products)
@@ -1,3 +1,14 @@
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+from dateutil.relativedelta import WE, relativedelta
+from upedata import enums as upe_enums
+from upedata.dynamic_data import InterestRate
+from zoneinfo import ZoneInfo
+
+from prep.helpers import lme_file_schemas, lme_staticdata_utils
+
 # import logging
 # import os
 # from datetime import datetime
@@ -427,3 +438,80 @@
 #         assert (
 #             closing_price.close_date <= most_recent_closing_price_dt.date()
 #         ), "Close date was more recent than most recent file"
+
+
+@pytest.mark.parametrize(
+    "forward_month", [202310, 202311, 202402, 202412, 202501, 202506]
+)
+def test_get_first_wednesday_expiries(forward_month: int):
+    expected_expiry = datetime.strptime(f"{forward_month}01", r"%Y%m%d") + (
+        relativedelta(weekday=WE(1))
+    )
+    expiries = lme_staticdata_utils.get_first_wednesday_expiries(
+        pd.Series([forward_month, forward_month], dtype="Int64")
+    )
+    assert list(expiries) == [expected_expiry, expected_expiry]
+
+
+def test_build_lme_option_closing_price_columns():
+    clo_schema = lme_file_schemas.get_lme_file_schema("CLO")
+    assert clo_schema is not None
+    clo_df = clo_schema.read_csv_filtered(
+        "tests/rjo_sftp_simulator/LMEPrices/20230929_CLO_r.csv",
+        lme_staticdata_utils.is_lme_option_closing_row,
+        chunksize=5000,
+    )
+
+    closing_price_columns = lme_staticdata_utils.build_lme_option_closing_price_columns(
+        datetime(2023, 9, 29),
+        clo_df,
+        datetime(2023, 9, 29, 19, tzinfo=ZoneInfo("Europe/London")),
+    )
+
+    assert list(closing_price_columns.columns) == [
+        column.name
+        for column in lme_staticdata_utils.OptionClosingPrice.__table__.columns
+    ]
+    assert len(closing_price_columns) > 0
+    assert (closing_price_columns["close_date"] == date(2023, 9, 29)).all()
+    assert (
+        closing_price_columns["option_symbol"]
+        .str.fullmatch(r"xlme-(lad|lcu|pbd|lzh|lnd)-usd o \d{2}-\d{2}-\d{2} a")
+        .all()
+    )
+    first_row = closing_price_columns.iloc[0]
+    assert first_row["option_symbol"] == "xlme-lad-usd o 23-10-04 a"
+    assert first_row["call_or_put"] is upe_enums.CallOrPut.CALL
+    assert set(closing_price_columns["call_or_put"]) == {
+        upe_enums.CallOrPut.CALL,
+        upe_enums.CallOrPut.PUT,
+    }
+
+
+def test_build_most_recent_interest_rate_curves():
+    interest_rates = [
+        InterestRate(
+            published_date=pd.Timestamp(published_date),
+            to_date=pd.Timestamp(to_date),
+            currency_symbol=currency_symbol,
+            source="LME",
+            continuous_rate=continuous_rate,
+        )
+        for published_date, to_date, currency_symbol, continuous_rate in [
+            ("2023-09-27", "2023-09-27", "usd", 0.051),
+            ("2023-09-27", "2023-09-28", "usd", 0.052),
+            ("2023-09-28", "2023-09-28", "usd", 0.0531234567),
+            ("2023-09-28", "2023-09-29", "usd", 0.054),
+            ("2023-09-28", "2023-09-29", "eur", 0.034),
+        ]
+    ]
+    curves_df = lme_staticdata_utils.build_most_recent_interest_rate_curves(
+        interest_rates, date(2023, 9, 28)
+    )
+
+    assert list(curves_df.columns) == ["currency_symbol", "to_date", "continuous_rate"]
+    assert list(curves_df.itertuples(index=False, name=None)) == [
+        ("eur", pd.Timestamp("2023-09-29"), 0.034),
+        ("usd", pd.Timestamp("2023-09-28"), 0.0531235),
+        ("usd", pd.Timestamp("2023-09-29"), 0.054),
+    ]
@@ -0,0 +1,183 @@
+import uuid
+from datetime import date
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+import sqlalchemy
+import upedata.enums as upe_enums
+from sqlalchemy.dialects import postgresql
+from upedata.dynamic_data import ExchangeRate, OptionClosingPrice
+
+from prep.helpers import pg_copy_utils
+
+
+@pytest.mark.parametrize(
+    ["column_name", "expected_staging_type"],
+    [
+        ("close_date", "date"),
+        ("option_symbol", "text"),
+        ("option_strike", "numeric"),
+        ("call_or_put", "text"),
+        ("close_delta", "numeric"),
+    ],
+)
+def test_get_staging_column_type(column_name: str, expected_staging_type: str):
+    staging_type, _ = pg_copy_utils.get_staging_column_type(
+        OptionClosingPrice.__table__.columns[column_name]
+    )
+    assert staging_type == expected_staging_type
+
+
+def test_get_staging_column_type_float():
+    staging_type, value_converter = pg_copy_utils.get_staging_column_type(
+        sqlalchemy.Column("rate", sqlalchemy.Float)
+    )
+    assert staging_type == "float8"
+    assert value_converter(Decimal("1.5")) == 1.5
+
+
+def test_get_staging_column_type_unsupported():
+    with pytest.raises(ValueError):
+        pg_copy_utils.get_staging_column_type(
+            sqlalchemy.Column("blob", sqlalchemy.LargeBinary)
+        )
+
+
+@pytest.mark.parametrize(
+    ["column_name", "value", "expected_staged_value"],
+    [
+        ("close_date", pd.Timestamp("2023-09-29"), date(2023, 9, 29)),
+        ("close_date", date(2023, 9, 29), date(2023, 9, 29)),
+        ("close_date", pd.NaT, None),
+        ("call_or_put", upe_enums.CallOrPut.PUT, "PUT"),
+        ("call_or_put", -1, "PUT"),
+        ("call_or_put", "CALL", "CALL"),
+        ("option_strike", 2150.1, Decimal("2150.1")),
+        ("option_strike", Decimal("2150.1"), Decimal("2150.1")),
+        ("option_strike", 2150, Decimal("2150")),
+        ("option_strike", None, None),
+    ],
+)
+def test_staging_value_conversion(column_name: str, value, expected_staged_value):
+    _, value_converter = pg_copy_utils.get_staging_column_type(
+        OptionClosingPrice.__table__.columns[column_name]
+    )
+    assert value_converter(value) == expected_staged_value
+
+
+def test_copy_insert_on_conflict_do_nothing_no_rows(mocker):
+    mock_session = mocker.MagicMock()
+    bulk_insert_result = pg_copy_utils.copy_insert_on_conflict_do_nothing(
+        mock_session, ExchangeRate, []
+    )
+    assert bulk_insert_result == pg_copy_utils.BulkInsertResult("exchange_rates", 0, 0)
+    assert bulk_insert_result.rows_skipped == 0
+    mock_session.connection.assert_not_called()
+
+
+OPTION_CLOSING_PRICE_ROWS = pd.DataFrame(
+    {
+        "close_date": [date(2023, 9, 29), date(2023, 9, 29)],
+        "option_symbol": ["xlme-lad-usd o 23-10-04 a", "xlme-lad-usd o 23-10-04 a"],
+        "option_strike": [2150.1, 2175.0],
+        "call_or_put": [upe_enums.CallOrPut.CALL, upe_enums.CallOrPut.PUT],
+        "close_price": [12.5, 40.25],
+        "close_volatility": [0.21, 0.2],
+        "close_delta": [0.5, -0.5],
+    }
+)
+OPTION_CLOSING_PRICE_COLUMNS = (
+    '"close_date", "option_symbol", "option_strike", "call_or_put", '
+    '"close_price", "close_volatility", "close_delta"'
+)
+STAGING_TABLE = '"_staging_option_closing_prices_00000000"'
+
+
+def test_copy_insert_on_conflict_do_nothing(mocker):
+    mocker.patch.object(pg_copy_utils.uuid, "uuid4", return_value=uuid.UUID(int=0))
+    mock_session = mocker.MagicMock()
+    mock_connection = mock_session.connection.return_value
+    mock_connection.dialect.driver = "psycopg"
+    mock_psycopg_connection = mock_connection.connection.driver_connection
+    mock_cursor = mock_psycopg_connection.cursor.return_value.__enter__.return_value
+    mock_cursor.rowcount = 1
+    mock_copy = mock_cursor.copy.return_value.__enter__.return_value
+
+    bulk_insert_result = pg_copy_utils.copy_insert_on_conflict_do_nothing(
+        mock_session, OptionClosingPrice, OPTION_CLOSING_PRICE_ROWS
+    )
+
+    assert bulk_insert_result == pg_copy_utils.BulkInsertResult(
+        "option_closing_prices", 2, 1
+    )
+    assert bulk_insert_result.rows_skipped == 1
+    executed_statements = [
+        call_args.args[0].as_string(None)
+        for call_args in mock_cursor.execute.call_args_list
+    ]
+    assert executed_statements == [
+        f"CREATE TEMP TABLE {STAGING_TABLE} "
+        '("close_date" date, "option_symbol" text, "option_strike" numeric, '
+        '"call_or_put" text, "close_price" numeric, "close_volatility" numeric, '
+        '"close_delta" numeric) ON COMMIT DROP',
+        'INSERT INTO "option_closing_prices" '
+        f"({OPTION_CLOSING_PRICE_COLUMNS}) "
+        'SELECT CAST("close_date" AS DATE), CAST("option_symbol" AS TEXT), '
+        'CAST("option_strike" AS NUMERIC(20, 8)), '
+        'CAST("call_or_put" AS call_or_put), '
+        'CAST("close_price" AS NUMERIC(20, 8)), '
+        'CAST("close_volatility" AS NUMERIC(12, 8)), '
+        'CAST("close_delta" AS NUMERIC(9, 8)) '
+        f"FROM {STAGING_TABLE} ON CONFLICT DO NOTHING",
+        f"DROP TABLE {STAGING_TABLE}",
+    ]
+    assert mock_cursor.copy.call_args.args[0].as_string(None) == (
+        f"COPY {STAGING_TABLE} ({OPTION_CLOSING_PRICE_COLUMNS}) "
+        "FROM STDIN (FORMAT BINARY)"
+    )
+    mock_copy.set_types.assert_called_once_with(
+        ["date", "text", "numeric", "text", "numeric", "numeric", "numeric"]
+    )
+    assert [call_args.args[0] for call_args in mock_copy.write_row.call_args_list] == [
+        [
+            date(2023, 9, 29),
+            "xlme-lad-usd o 23-10-04 a",
+            Decimal("2150.1"),
+            "CALL",
+            Decimal("12.5"),
+            Decimal("0.21"),
+            Decimal("0.5"),
+        ],
+        [
+            date(2023, 9, 29),
+            "xlme-lad-usd o 23-10-04 a",
+            Decimal("2175.0"),
+            "PUT",
+            Decimal("40.25"),
+            Decimal("0.2"),
+            Decimal("-0.5"),
+        ],
+    ]
+
+
+def test_copy_insert_on_conflict_do_nothing_executemany_fallback(mocker):
+    mock_session = mocker.MagicMock()
+    mock_connection = mock_session.connection.return_value
+    mock_connection.dialect.driver = "psycopg2"
+    mock_session.execute.return_value.rowcount = 2
+
+    bulk_insert_result = pg_copy_utils.copy_insert_on_conflict_do_nothing(
+        mock_session, OptionClosingPrice, OPTION_CLOSING_PRICE_ROWS
+    )
+
+    assert bulk_insert_result == pg_copy_utils.BulkInsertResult(
+        "option_closing_prices", 2, 2
+    )
+    assert bulk_insert_result.rows_skipped == 0
+    insert_statement, insert_rows = mock_session.execute.call_args.args
+    assert str(insert_statement.compile(dialect=postgresql.dialect())).endswith(
+        "ON CONFLICT DO NOTHING"
+    )
+    assert insert_rows == OPTION_CLOSING_PRICE_ROWS.to_dict("records")
+    mock_connection.connection.driver_connection.cursor.assert_not_called()
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+import ujson
+
+from prep.helpers import redis_payload_utils
+
+
+@pytest.fixture
+def daily_curve_df() -> pd.DataFrame:
+    curve_index = pd.date_range("2023-12-29", "2024-03-02")
+    return pd.DataFrame(
+        {"interp_value": np.linspace(2210.555, 2290.125, len(curve_index))},
+        index=curve_index,
+    )
+
+
+def test_format_curve_dates(daily_curve_df: pd.DataFrame):
+    assert (
+        redis_payload_utils.format_curve_dates(daily_curve_df.index)  # type: ignore
+        == daily_curve_df.index.strftime(r"%Y%m%d").to_list()
+    )
+
+
+def test_serialise_curve_payload_matches_row_loop(daily_curve_df: pd.DataFrame):
+    expected_curve_data = {}
+    for row in daily_curve_df.itertuples():
+        expected_curve_data[row.Index.strftime(r"%Y%m%d")] = round(  # type: ignore
+            row.interp_value, 2  # type: ignore
+        )
+
+    assert redis_payload_utils.serialise_curve_payload(
+        daily_curve_df.index,  # type: ignore
+        daily_curve_df["interp_value"].to_numpy(),
+        value_decimals=2,
+    ) == ujson.dumps(expected_curve_data)
+
+
+def test_serialise_legacy_and_new_curve_payloads_matches_row_loop(
+    daily_curve_df: pd.DataFrame,
+):
+    expected_legacy_data = {}
+    expected_new_data = {}
+    for row in daily_curve_df.itertuples():
+        expected_legacy_data[row.Index.strftime(r"%Y%m%d")] = {  # type: ignore
+            "Interest Rate": row.interp_value
+        }
+        expected_new_data[row.Index.strftime(r"%Y%m%d")] = row.interp_value  # type: ignore
+
+    (
+        legacy_payload,
+        new_payload,
+    ) = redis_payload_utils.serialise_legacy_and_new_curve_payloads(
+        daily_curve_df.index,  # type: ignore
+        daily_curve_df["interp_value"].to_numpy(),
+        "Interest Rate",
+    )
+    assert legacy_payload == ujson.dumps(expected_legacy_data)
+    assert new_payload == ujson.dumps(expected_new_data)
+
+
+def test_serialise_curve_payload_length_mismatch(daily_curve_df: pd.DataFrame):
+    with pytest.raises(ValueError):
+        redis_payload_utils.serialise_curve_payload(
+            daily_curve_df.index, np.zeros(3)  # type: ignore
+        )
@@ -0,0 +1,338 @@
+import dataclasses
+import os
+from datetime import datetime
+from typing import IO, List
+
+import pandas as pd
+import paramiko
+import pytest
+
+from prep.helpers import rjo_sftp_utils
+
+SFTP_SIMULATOR_ROOT = os.path.abspath("./tests/rjo_sftp_simulator")
+
+
+class MockTransport:
+    def __init__(self) -> None:
+        self.active = True
+        self.keepalive = 0
+
+    def is_active(self) -> bool:
+        return self.active
+
+    def set_keepalive(self, interval: int):
+        self.keepalive = interval
+
+
+class MockSFTPClient:
+    def __init__(self, transport: MockTransport) -> None:
+        self.transport = transport
+        self.listdir_calls = 0
+        self.getfo_calls = 0
+
+    def listdir_attr(self, path=".") -> List[paramiko.SFTPAttributes]:
+        self.listdir_calls += 1
+        return [
+            paramiko.SFTPAttributes.from_stat(
+                os.stat(f"{SFTP_SIMULATOR_ROOT}{path}/{filename}"), filename
+            )
+            for filename in os.listdir(SFTP_SIMULATOR_ROOT + path)
+        ]
+
+    def getfo(self, remotepath: str, fl: IO) -> int:
+        self.getfo_calls += 1
+        with open(SFTP_SIMULATOR_ROOT + remotepath, "rb") as remote_file:
+            return fl.write(remote_file.read())
+
+    def open(self, filename: str, mode="r", bufsize=-1) -> IO:
+        mock_sftp_file = open(SFTP_SIMULATOR_ROOT + filename, mode=mode)
+        mock_sftp_file.prefetch = lambda: None  # type: ignore
+        return mock_sftp_file
+
+    def close(self):
+        pass
+
+
+class MockSSHClient:
+    def __init__(self) -> None:
+        self.transport = MockTransport()
+        self.closed = False
+
+    def get_transport(self) -> MockTransport:
+        return self.transport
+
+    def open_sftp(self) -> MockSFTPClient:
+        return MockSFTPClient(self.transport)
+
+    def close(self):
+        self.closed = True
+        self.transport.active = False
+
+
+class CountingSSHClientFactory:
+    def __init__(self) -> None:
+        self.clients: List[MockSSHClient] = []
+
+    def __call__(self) -> MockSSHClient:
+        self.clients.append(MockSSHClient())
+        return self.clients[-1]
+
+
+@pytest.fixture()
+def ssh_client_factory():
+    return CountingSSHClientFactory()
+
+
+@pytest.fixture()
+def mock_session_pool(mocker, tmp_path, ssh_client_factory):
+    session_pool = rjo_sftp_utils.RJOSFTPSessionPool(
+        client_factory=ssh_client_factory  # type: ignore
+    )
+    mocker.patch.object(
+        rjo_sftp_utils, "get_rjo_sftp_session_pool", return_value=session_pool
+    )
+    mocker.patch.object(
+        rjo_sftp_utils,
+        "get_lme_directory_index",
+        return_value=rjo_sftp_utils.LMEDirectoryIndex(),
+    )
+    mocker.patch.object(
+        rjo_sftp_utils,
+        "get_lme_file_cache",
+        return_value=rjo_sftp_utils.LMEFileCache(str(tmp_path)),
+    )
+    mocker.patch.object(
+        rjo_sftp_utils,
+        "open_sftp_channel",
+        side_effect=lambda sftp_client: MockSFTPClient(sftp_client.transport),
+    )
+    return session_pool
+
+
+def test_session_pool_reuses_live_session(ssh_client_factory):
+    session_pool = rjo_sftp_utils.RJOSFTPSessionPool(
+        client_factory=ssh_client_factory, keepalive_interval=15  # type: ignore
+    )
+    with session_pool.borrow() as first_sftp_client:
+        pass
+    with session_pool.borrow() as second_sftp_client:
+        pass
+
+    assert first_sftp_client is second_sftp_client
+    assert len(ssh_client_factory.clients) == 1
+    assert ssh_client_factory.clients[0].transport.keepalive == 15
+
+
+def test_session_pool_drops_idle_sessions(ssh_client_factory):
+    session_pool = rjo_sftp_utils.RJOSFTPSessionPool(
+        client_factory=ssh_client_factory, idle_timeout=0.0  # type: ignore
+    )
+    with session_pool.borrow():
+        pass
+    with session_pool.borrow():
+        pass
+
+    assert len(ssh_client_factory.clients) == 2
+    assert ssh_client_factory.clients[0].closed
+
+
+def test_session_pool_reconnects_dropped_session(ssh_client_factory):
+    session_pool = rjo_sftp_utils.RJOSFTPSessionPool(
+        client_factory=ssh_client_factory  # type: ignore
+    )
+    with session_pool.borrow():
+        pass
+
+    def drop_first_connection(sftp_client: MockSFTPClient) -> str:
+        if sftp_client.transport is ssh_client_factory.clients[0].transport:
+            sftp_client.transport.active = False
+            raise EOFError("Server hung up")
+        return "reconnected"
+
+    assert session_pool.run(drop_first_connection) == "reconnected"  # type: ignore
+    assert len(ssh_client_factory.clients) == 2
+
+
+def test_session_pool_raises_operation_errors(ssh_client_factory):
+    session_pool = rjo_sftp_utils.RJOSFTPSessionPool(
+        client_factory=ssh_client_factory  # type: ignore
+    )
+
+    def missing_file(sftp_client: MockSFTPClient):
+        raise FileNotFoundError("No such file")
+
+    with pytest.raises(FileNotFoundError):
+        session_pool.run(missing_file)  # type: ignore
+    with session_pool.borrow():
+        pass
+    assert len(ssh_client_factory.clients) == 1
+
+
+def test_directory_index_shares_listing_between_file_types():
+    sftp_client = MockSFTPClient(MockTransport())
+    directory_index = rjo_sftp_utils.LMEDirectoryIndex(ttl=60.0)
+
+    exr_files = directory_index.get_files(sftp_client, "EXR")  # type: ignore
+    clo_files = directory_index.get_files(sftp_client, "CLO")  # type: ignore
+
+    assert sftp_client.listdir_calls == 1
+    assert len(exr_files) == 5
+    assert len(clo_files) == 11
+    assert exr_files[0].filename == "20230524_EXR_r.csv"
+    assert exr_files[0].file_datetime == datetime(2023, 5, 24)
+    assert exr_files[0].size > 0
+    assert [file_entry.file_datetime for file_entry in clo_files] == sorted(
+        [file_entry.file_datetime for file_entry in clo_files], reverse=True
+    )
+    assert directory_index.get_files(sftp_client, "XYZ") == []  # type: ignore
+
+
+def test_directory_index_relists_once_stale():
+    sftp_client = MockSFTPClient(MockTransport())
+    directory_index = rjo_sftp_utils.LMEDirectoryIndex(ttl=0.0)
+
+    directory_index.get_files(sftp_client, "INR")  # type: ignore
+    directory_index.get_files(sftp_client, "INR")  # type: ignore
+
+    assert sftp_client.listdir_calls == 2
+
+
+def test_file_cache_serves_repeat_fetches_locally(tmp_path):
+    sftp_client = MockSFTPClient(MockTransport())
+    lme_file_cache = rjo_sftp_utils.LMEFileCache(str(tmp_path))
+    file_entry = rjo_sftp_utils.LMEDirectoryIndex().get_files(
+        sftp_client, "EXR"  # type: ignore
+    )[0]
+
+    first_path = lme_file_cache.fetch(
+        sftp_client, "/LMEPrices", file_entry  # type: ignore
+    )
+    second_path = lme_file_cache.fetch(
+        sftp_client, "/LMEPrices", file_entry  # type: ignore
+    )
+
+    assert first_path == second_path
+    assert sftp_client.getfo_calls == 1
+    assert os.path.getsize(first_path) == file_entry.size
+
+
+def test_file_cache_misses_on_changed_file(tmp_path):
+    sftp_client = MockSFTPClient(MockTransport())
+    lme_file_cache = rjo_sftp_utils.LMEFileCache(str(tmp_path))
+    file_entry = rjo_sftp_utils.LMEDirectoryIndex().get_files(
+        sftp_client, "EXR"  # type: ignore
+    )[0]
+    lme_file_cache.fetch(sftp_client, "/LMEPrices", file_entry)  # type: ignore
+
+    republished_entry = dataclasses.replace(file_entry, mtime=file_entry.mtime + 60)
+    assert lme_file_cache.get(republished_entry) is None
+
+
+def test_file_cache_evicts_least_recently_used(tmp_path):
+    sftp_client = MockSFTPClient(MockTransport())
+    inr_entries = rjo_sftp_utils.LMEDirectoryIndex().get_files(
+        sftp_client, "INR"  # type: ignore
+    )[0:3]
+    lme_file_cache = rjo_sftp_utils.LMEFileCache(
+        str(tmp_path), max_bytes=2 * max(file_entry.size for file_entry in inr_entries)
+    )
+
+    first_path = lme_file_cache.fetch(
+        sftp_client, "/LMEPrices", inr_entries[0]  # type: ignore
+    )
+    os.utime(first_path, (0, 0))
+    second_path = lme_file_cache.fetch(
+        sftp_client, "/LMEPrices", inr_entries[1]  # type: ignore
+    )
+    os.utime(second_path, (1, 1))
+    # touching the first file makes the second the least recently used
+    assert lme_file_cache.get(inr_entries[0]) == first_path
+    lme_file_cache.fetch(sftp_client, "/LMEPrices", inr_entries[2])  # type: ignore
+
+    assert lme_file_cache.get(inr_entries[0]) is not None
+    assert lme_file_cache.get(inr_entries[1]) is None
+    assert lme_file_cache.get(inr_entries[2]) is not None
+
+
+@pytest.mark.parametrize(
+    ["base_file_name", "num_recent_or_since_dt", "expected_datetimes"],
+    [
+        ["EXR", 2, [datetime(2023, 5, 24), datetime(2023, 5, 23)]],
+        ["FCP", datetime(2023, 9, 25), [datetime(2023, 9, 26), datetime(2023, 9, 25)]],
+        ["INR", 0, None],
+    ],
+)
+def test_get_lme_overnight_data(
+    mock_session_pool, base_file_name, num_recent_or_since_dt, expected_datetimes
+):
+    file_datetimes, file_dfs = rjo_sftp_utils.get_lme_overnight_data(
+        base_file_name, num_recent_or_since_dt, ["REPORT_DATE", "FORWARD_DATE"]
+    )
+    if isinstance(num_recent_or_since_dt, datetime):
+        assert [
+            file_dt for file_dt in file_datetimes if file_dt >= num_recent_or_since_dt
+        ] == expected_datetimes
+    elif expected_datetimes is not None:
+        assert file_datetimes == expected_datetimes
+    assert file_datetimes == sorted(file_datetimes, reverse=True)
+    assert len(file_dfs) == len(file_datetimes)
+    for file_df in file_dfs:
+        assert "report_date" in file_df.columns
+
+
+@pytest.mark.parametrize("parse_processes", [0, 2])
+def test_fetch_lme_files_concurrently_keeps_order(mocker, tmp_path, parse_processes):
+    mocker.patch.object(
+        rjo_sftp_utils,
+        "get_lme_file_cache",
+        return_value=rjo_sftp_utils.LMEFileCache(str(tmp_path), max_bytes=0),
+    )
+    mocker.patch.object(
+        rjo_sftp_utils,
+        "open_sftp_channel",
+        side_effect=lambda sftp_client: MockSFTPClient(sftp_client.transport),
+    )
+    sftp_client = MockSFTPClient(MockTransport())
+    fcp_entries = rjo_sftp_utils.LMEDirectoryIndex().get_files(
+        sftp_client, "FCP"  # type: ignore
+    )
+
+    fcp_dfs = rjo_sftp_utils.fetch_lme_files_concurrently(
+        sftp_client,  # type: ignore
+        fcp_entries,
+        ["REPORT_DATE", "FORWARD_DATE"],
+        max_concurrency=3,
+        parse_processes=parse_processes,
+    )
+
+    assert len(fcp_dfs) == len(fcp_entries)
+    for file_entry, fcp_df in zip(fcp_entries, fcp_dfs):
+        assert (fcp_df["report_date"] == file_entry.file_datetime).all()
+
+
+def test_get_lme_overnight_data_streams_filtered_rows(mock_session_pool, tmp_path):
+    def is_lme_option(clo_chunk: pd.DataFrame) -> pd.Series:
+        return clo_chunk["contract_type"] == "LMEOption"
+
+    file_datetimes, file_dfs = rjo_sftp_utils.get_lme_overnight_data(
+        "CLO", 1, row_filter=is_lme_option
+    )
+    # a second pull is served from the copy cached while streaming the first
+    _, cached_file_dfs = rjo_sftp_utils.get_lme_overnight_data(
+        "CLO", 1, row_filter=is_lme_option
+    )
+
+    assert file_datetimes == [datetime(2023, 9, 29)]
+    assert len(file_dfs[0]) > 0
+    assert (file_dfs[0]["contract_type"] == "LMEOption").all()
+    assert len(cached_file_dfs[0]) == len(file_dfs[0])
+    cached_files = [cache_file.name for cache_file in tmp_path.iterdir()]
+    assert len(cached_files) == 1
+    assert cached_files[0].endswith("_20230929_CLO_r.csv")
+
+
+def test_get_lme_overnight_data_rejects_date_cols_outside_schema(mock_session_pool):
+    with pytest.raises(ValueError, match="FORWARD_DATE"):
+        rjo_sftp_utils.get_lme_overnight_data(
+            "CLO", 1, date_cols_to_parse=["REPORT_DATE", "FORWARD_DATE"]
+        )
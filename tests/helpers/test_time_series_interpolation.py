@@ -1,3 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from prep.helpers import time_series_interpolation
+
+
+def test_interpolate_on_grouped_time_series_df_matches_per_group():
+    grouped_df = pd.DataFrame(
+        {
+            "currency_symbol": ["usd"] * 4 + ["eur"] * 3,
+            "continuous_rate": [0.05, 0.051, 0.053, 0.052, 0.033, 0.034, 0.0345],
+        },
+        index=pd.to_datetime(
+            [
+                "2023-09-15",
+                "2023-09-18",
+                "2023-09-25",
+                "2023-10-02",
+                "2023-09-14",
+                "2023-09-20",
+                "2023-10-02",
+            ]
+        ),
+    )
+    output_df = time_series_interpolation.interpolate_on_grouped_time_series_df(
+        grouped_df, "currency_symbol", "continuous_rate", "interp_cont_rate"
+    )
+
+    for currency_symbol, currency_df in grouped_df.groupby("currency_symbol"):
+        expected_df = time_series_interpolation.interpolate_on_time_series_df(
+            currency_df, "continuous_rate", "interp_cont_rate"
+        )
+        output_rates = output_df.loc[currency_symbol, "interp_cont_rate"]
+        assert output_rates.index.equals(expected_df.index)
+        assert np.allclose(
+            output_rates.to_numpy(), expected_df["interp_cont_rate"].to_numpy()
+        )
+
+
+def test_interpolate_on_grouped_time_series_df_errors_on_non_dt_input():
+    input_df = pd.DataFrame(
+        {"currency_symbol": ["usd", "usd"], "continuous_rate": [0.003, 0.0033]}
+    )
+    with pytest.raises(ValueError):
+        _ = time_series_interpolation.interpolate_on_grouped_time_series_df(
+            input_df, "currency_symbol", "continuous_rate", "shouldnt_be_populated"
+        )
+
+
 # from prep.helpers import time_series_interpolation
 
 # import pandas as pd
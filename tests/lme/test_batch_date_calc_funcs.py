@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from zoneinfo import ZoneInfo
+
+from prep.lme import batch_date_calc_funcs, date_calc_funcs
+from tests.lme.test_lme_date_calculation_functions import (
+    LME_2023_THROUGH_2025_NON_PROMPTS,
+    MOCK_HOLIDAY_CALENDAR,
+    MOCK_HOLIDAYS,
+)
+
+
+def get_as_of_datetimes(first_datetime: datetime, last_datetime: datetime, step):
+    as_of_datetimes = []
+    while first_datetime < last_datetime:
+        as_of_datetimes.append(first_datetime)
+        first_datetime += step
+    return as_of_datetimes
+
+
+@pytest.mark.parametrize(
+    ["first_datetime", "last_datetime"],
+    [
+        # Easter, Christmas, and month ends throughout
+        [
+            datetime(2023, 12, 1, 0, 17, tzinfo=ZoneInfo("Europe/London")),
+            datetime(2024, 5, 1, tzinfo=ZoneInfo("Europe/London")),
+        ],
+        [
+            datetime(2024, 9, 1, 0, 17, tzinfo=ZoneInfo("Europe/London")),
+            datetime(2025, 4, 30, tzinfo=ZoneInfo("Europe/London")),
+        ],
+    ],
+)
+def test_primary_prompt_days_as_of_match_scalar_functions(
+    first_datetime, last_datetime
+):
+    as_of_datetimes = get_as_of_datetimes(
+        first_datetime, last_datetime, timedelta(hours=7, minutes=13)
+    )
+    primary_prompt_days = batch_date_calc_funcs.get_primary_prompt_days_as_of(
+        as_of_datetimes, LME_2023_THROUGH_2025_NON_PROMPTS, MOCK_HOLIDAYS
+    )
+
+    assert len(primary_prompt_days) == len(as_of_datetimes)
+    for i, as_of_datetime in enumerate(as_of_datetimes):
+        lme_prompt_map = date_calc_funcs.get_lme_prompt_map(
+            LME_2023_THROUGH_2025_NON_PROMPTS, _current_datetime=as_of_datetime
+        )
+        tom_datetime = date_calc_funcs.get_tom_datetime(as_of_datetime, MOCK_HOLIDAYS)
+        assert primary_prompt_days.three_month[i] == np.datetime64(
+            date_calc_funcs.get_3m_datetime(as_of_datetime, lme_prompt_map).date()
+        )
+        assert primary_prompt_days.cash[i] == np.datetime64(
+            date_calc_funcs.get_cash_datetime(as_of_datetime, MOCK_HOLIDAYS).date()
+        )
+        if tom_datetime is None:
+            assert np.isnat(primary_prompt_days.tom[i])
+        else:
+            assert primary_prompt_days.tom[i] == np.datetime64(tom_datetime.date())
+
+
+def test_primary_prompt_days_as_of_input_types():
+    as_of_datetimes = get_as_of_datetimes(
+        datetime(2024, 3, 20, 12, tzinfo=ZoneInfo("Europe/London")),
+        datetime(2024, 4, 10, tzinfo=ZoneInfo("Europe/London")),
+        timedelta(hours=5),
+    )
+    primary_prompt_days = batch_date_calc_funcs.get_primary_prompt_days_as_of(
+        as_of_datetimes, LME_2023_THROUGH_2025_NON_PROMPTS, MOCK_HOLIDAYS
+    )
+    for equivalent_datetimes in [
+        [as_of_datetime.replace(tzinfo=None) for as_of_datetime in as_of_datetimes],
+        pd.DatetimeIndex(as_of_datetimes).tz_convert("UTC"),
+        pd.DatetimeIndex(as_of_datetimes).tz_localize(None).to_numpy(),
+    ]:
+        equivalent_prompt_days = batch_date_calc_funcs.get_primary_prompt_days_as_of(
+            equivalent_datetimes, MOCK_HOLIDAY_CALENDAR, MOCK_HOLIDAY_CALENDAR
+        )
+        np.testing.assert_array_equal(
+            equivalent_prompt_days.tom, primary_prompt_days.tom
+        )
+        np.testing.assert_array_equal(
+            equivalent_prompt_days.cash, primary_prompt_days.cash
+        )
+        np.testing.assert_array_equal(
+            equivalent_prompt_days.three_month, primary_prompt_days.three_month
+        )
+
+
+def test_primary_prompt_days_as_of_no_datetimes():
+    primary_prompt_days = batch_date_calc_funcs.get_primary_prompt_days_as_of(
+        [], LME_2023_THROUGH_2025_NON_PROMPTS, MOCK_HOLIDAYS
+    )
+    assert len(primary_prompt_days) == 0
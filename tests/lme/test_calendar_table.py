@@ -0,0 +1,183 @@
+import logging
+from datetime import date, timedelta
+
+import pytest
+from upedata.static_data import Holiday
+
+from prep.lme import calendar_table, date_calc_funcs
+from tests.lme.test_lme_date_calculation_functions import (
+    LME_2023_THROUGH_2025_NON_PROMPTS,
+    MOCK_HOLIDAYS,
+)
+
+FIRST_SESSION_DATE = date(2024, 3, 1)
+LAST_SESSION_DATE = date(2024, 5, 31)
+
+
+@pytest.fixture
+def synced_calendar_table() -> calendar_table.LMECalendarTable:
+    lme_calendar_table = calendar_table.LMECalendarTable(forward_months=18)
+    lme_calendar_table.sync(MOCK_HOLIDAYS, FIRST_SESSION_DATE, LAST_SESSION_DATE)
+    return lme_calendar_table
+
+
+def test_calendar_table_matches_primary_curve(
+    synced_calendar_table: calendar_table.LMECalendarTable,
+):
+    assert len(synced_calendar_table) == 92
+    for session_date in synced_calendar_table.session_dates:
+        lme_futures_curve = date_calc_funcs.populate_primary_curve_datetimes(
+            LME_2023_THROUGH_2025_NON_PROMPTS,
+            MOCK_HOLIDAYS,
+            forward_months=18,
+            _current_datetime=calendar_table.get_session_open_datetime(session_date),
+        )
+        lme_futures_curve.populate_broken_datetimes()
+        calendar_session = synced_calendar_table.get_session(session_date)
+
+        assert calendar_session.tom == lme_futures_curve.tom
+        assert calendar_session.cash == lme_futures_curve.cash
+        assert calendar_session.three_month == lme_futures_curve.three_month
+        assert calendar_session.weeklies == lme_futures_curve.weeklies
+        assert calendar_session.monthlies == lme_futures_curve.monthlies
+        assert calendar_session.broken_dates == lme_futures_curve.broken_dates
+        assert calendar_session.gen_prompt_list() == lme_futures_curve.gen_prompt_list()
+
+
+def test_calendar_table_get_session(
+    synced_calendar_table: calendar_table.LMECalendarTable,
+):
+    session_open_datetime = calendar_table.get_session_open_datetime(date(2024, 4, 2))
+    assert synced_calendar_table.get_session(
+        session_open_datetime
+    ) == synced_calendar_table.get_session(date(2024, 4, 2))
+    assert (
+        len(
+            synced_calendar_table.get_session(
+                date(2024, 4, 2), forward_months=12
+            ).monthlies
+        )
+        == 12
+    )
+    with pytest.raises(ValueError):
+        synced_calendar_table.get_session(date(2024, 4, 2), forward_months=20)
+    with pytest.raises(KeyError):
+        synced_calendar_table.get_session(LAST_SESSION_DATE + timedelta(days=1))
+
+
+def test_calendar_table_save_and_load(
+    synced_calendar_table: calendar_table.LMECalendarTable, tmp_path
+):
+    table_path = str(tmp_path / "lme_calendar_table.npz")
+    synced_calendar_table.save(table_path)
+    loaded_calendar_table = calendar_table.LMECalendarTable.load(table_path)
+
+    assert loaded_calendar_table.forward_months == 18
+    assert loaded_calendar_table.holidays == synced_calendar_table.holidays
+    assert loaded_calendar_table.session_dates == synced_calendar_table.session_dates
+    for session_date in synced_calendar_table.session_dates:
+        assert loaded_calendar_table.get_session(
+            session_date
+        ) == synced_calendar_table.get_session(session_date)
+    assert (
+        loaded_calendar_table.sync(MOCK_HOLIDAYS, FIRST_SESSION_DATE, LAST_SESSION_DATE)
+        == 0
+    )
+
+
+def test_calendar_table_rolls_forward(
+    synced_calendar_table: calendar_table.LMECalendarTable,
+):
+    sessions_computed = synced_calendar_table.sync(
+        MOCK_HOLIDAYS,
+        FIRST_SESSION_DATE + timedelta(days=7),
+        LAST_SESSION_DATE + timedelta(days=7),
+    )
+    assert sessions_computed == 7
+    assert synced_calendar_table.session_dates[0] == FIRST_SESSION_DATE + timedelta(
+        days=7
+    )
+    assert synced_calendar_table.session_dates[-1] == LAST_SESSION_DATE + timedelta(
+        days=7
+    )
+
+
+@pytest.mark.parametrize("is_closure_date", [True, False])
+def test_calendar_table_recomputes_sessions_affected_by_holiday_changes(
+    synced_calendar_table: calendar_table.LMECalendarTable, is_closure_date: bool
+):
+    changed_holidays = MOCK_HOLIDAYS + [
+        Holiday(holiday_date=date(2024, 9, 10), is_closure_date=is_closure_date)
+    ]
+    sessions_computed = synced_calendar_table.sync(
+        changed_holidays, FIRST_SESSION_DATE, LAST_SESSION_DATE
+    )
+    rebuilt_calendar_table = calendar_table.LMECalendarTable(forward_months=18)
+    rebuilt_calendar_table.sync(changed_holidays, FIRST_SESSION_DATE, LAST_SESSION_DATE)
+
+    assert 0 < sessions_computed < len(rebuilt_calendar_table)
+    for session_date in rebuilt_calendar_table.session_dates:
+        assert synced_calendar_table.get_session(
+            session_date
+        ) == rebuilt_calendar_table.get_session(session_date)
+
+
+def test_get_lme_calendar_table_persists_table(mocker, tmp_path):
+    mocker.patch.object(calendar_table, "_lme_calendar_table", None)
+    mocker.patch.object(calendar_table, "LME_CALENDAR_TABLE_FORWARD_MONTHS", 18)
+    mocker.patch.object(calendar_table.LMECalendarTable.__init__, "__defaults__", (18,))
+    table_path = str(tmp_path / "lme_calendar_table.npz")
+    current_datetime = calendar_table.get_session_open_datetime(FIRST_SESSION_DATE)
+
+    lme_calendar_table, current_session_date = calendar_table.get_lme_calendar_table(
+        MOCK_HOLIDAYS, current_datetime=current_datetime, table_path=table_path, years=0
+    )
+    assert current_session_date == FIRST_SESSION_DATE
+    assert lme_calendar_table.session_dates == [FIRST_SESSION_DATE]
+    assert calendar_table.LMECalendarTable.load(table_path).session_dates == [
+        FIRST_SESSION_DATE
+    ]
+
+
+def test_get_lme_calendar_table_logs_cold_sync(mocker, tmp_path, caplog):
+    mocker.patch.object(calendar_table, "_lme_calendar_table", None)
+    mocker.patch.object(calendar_table, "LME_CALENDAR_TABLE_FORWARD_MONTHS", 18)
+    mocker.patch.object(calendar_table.LMECalendarTable.__init__, "__defaults__", (18,))
+    table_path = str(tmp_path / "lme_calendar_table.npz")
+    current_datetime = calendar_table.get_session_open_datetime(FIRST_SESSION_DATE)
+
+    with caplog.at_level(logging.WARNING):
+        calendar_table.get_lme_calendar_table(
+            MOCK_HOLIDAYS,
+            current_datetime=current_datetime,
+            table_path=table_path,
+            years=0,
+        )
+    assert f"No saved LME calendar table at `{table_path}`" in caplog.text
+
+    caplog.clear()
+    mocker.patch.object(calendar_table, "_lme_calendar_table", None)
+    with caplog.at_level(logging.WARNING):
+        calendar_table.get_lme_calendar_table(
+            MOCK_HOLIDAYS,
+            current_datetime=current_datetime,
+            table_path=table_path,
+            years=0,
+        )
+    assert caplog.text == ""
+
+
+def test_get_lme_calendar_table_without_path(mocker, tmp_path, caplog):
+    mocker.patch.object(calendar_table, "_lme_calendar_table", None)
+    mocker.patch.object(calendar_table, "LME_CALENDAR_TABLE_FORWARD_MONTHS", 18)
+    mocker.patch.object(calendar_table.LMECalendarTable.__init__, "__defaults__", (18,))
+    mock_save = mocker.patch.object(calendar_table.LMECalendarTable, "save")
+    current_datetime = calendar_table.get_session_open_datetime(FIRST_SESSION_DATE)
+
+    with caplog.at_level(logging.WARNING):
+        lme_calendar_table, _ = calendar_table.get_lme_calendar_table(
+            MOCK_HOLIDAYS, current_datetime=current_datetime, table_path=None, years=0
+        )
+    assert lme_calendar_table.session_dates == [FIRST_SESSION_DATE]
+    assert "`LME_CALENDAR_TABLE_PATH` is not set" in caplog.text
+    mock_save.assert_not_called()
@@ -0,0 +1,407 @@
+import dataclasses
+from datetime import datetime
+
+import upedata.enums as upeenums
+import upedata.static_data as upestatic
+from sqlalchemy.dialects import postgresql
+from zoneinfo import ZoneInfo
+
+from prep.helpers import lme_option_spec_utils
+from prep.lme import contract_db_gen, date_calc_funcs
+from tests.lme.test_lme_date_calculation_functions import (
+    MOCK_HOLIDAY_CALENDAR,
+    MOCK_HOLIDAYS,
+)
+
+OPTION_DATA = {
+    "time_type": 1,
+    "vol_type": 1,
+    "display_name": (
+        r"#{<option>.product.short_name}£o"
+        r"#{map_month_year_coded(<option>.underlying_future.expiry)}£"
+        r" @{strike}£ @{call_or_put}£"
+    ),
+    "vol_surface": {"model_type": "delta_spline_wing", "params": {"50 Delta": 0.2}},
+    "strike_intervals": [[1200, 25], [5000, -1]],
+    "multiplier": 25,
+}
+OPTION_SPEC = lme_option_spec_utils.LMEOptionProductSpec.from_dict(
+    "xlme-lad-usd", OPTION_DATA
+)
+OPTION_EXPIRY_DTS = [
+    datetime(2024, 3, 6, 1, 1, tzinfo=ZoneInfo("Europe/London")),
+    datetime(2024, 4, 3, 1, 1, tzinfo=ZoneInfo("Europe/London")),
+    datetime(2024, 5, 1, 1, 1, tzinfo=ZoneInfo("Europe/London")),
+]
+
+
+def test_generate_new_option_params():
+    products = [
+        upestatic.Product(symbol="xlme-lad-usd", short_name="lad"),
+        upestatic.Product(symbol="xlme-lcu-usd", short_name="lcu"),
+    ]
+    vol_surface_params, option_params = contract_db_gen.generate_new_option_params(
+        [(product, OPTION_SPEC, OPTION_EXPIRY_DTS) for product in products],
+        {
+            ("xlme-lad-usd", OPTION_EXPIRY_DTS[0]),
+            ("xlme-lcu-usd", OPTION_EXPIRY_DTS[2]),
+        },
+    )
+
+    assert [option_param["symbol"] for option_param in option_params] == [
+        "xlme-lad-usd o 24-04-03 a",
+        "xlme-lad-usd o 24-05-01 a",
+        "xlme-lcu-usd o 24-03-06 a",
+        "xlme-lcu-usd o 24-04-03 a",
+    ]
+    assert [option_param["display_name"] for option_param in option_params] == [
+        r"ladoj4 @{strike}£ @{call_or_put}£",
+        r"ladok4 @{strike}£ @{call_or_put}£",
+        r"lcuoh4 @{strike}£ @{call_or_put}£",
+        r"lcuoj4 @{strike}£ @{call_or_put}£",
+    ]
+    assert option_params[0]["underlying_future_symbol"] == "xlme-lad-usd f 24-04-17"
+    assert option_params[0]["time_type"] == upeenums.TimeType(1)
+    assert all("vol_surface_id" not in option_param for option_param in option_params)
+    assert [
+        vol_surface_param["expiry"] for vol_surface_param in vol_surface_params
+    ] == [option_param["expiry"] for option_param in option_params]
+    assert vol_surface_params[0]["params"] == {"50 Delta": 0.2}
+
+
+def test_generate_new_option_params_nothing_new():
+    product = upestatic.Product(symbol="xlme-lad-usd", short_name="lad")
+    vol_surface_params, option_params = contract_db_gen.generate_new_option_params(
+        [(product, OPTION_SPEC, OPTION_EXPIRY_DTS)],
+        {("xlme-lad-usd", expiry_dt) for expiry_dt in OPTION_EXPIRY_DTS},
+    )
+    assert vol_surface_params == []
+    assert option_params == []
+
+
+FUTURE_EXPIRY_DTS = [
+    datetime(2024, 3, 20, 19, 0, tzinfo=ZoneInfo("Europe/London")),
+    datetime(2024, 3, 21, 19, 0, tzinfo=ZoneInfo("Europe/London")),
+]
+
+
+def test_generate_product_future_params():
+    future_params = contract_db_gen.generate_product_future_params(
+        FUTURE_EXPIRY_DTS, "xlme-lnd-usd"
+    )
+    assert [future_param["symbol"] for future_param in future_params] == [
+        "xlme-lnd-usd f 24-03-20",
+        "xlme-lnd-usd f 24-03-21",
+    ]
+    assert [future_param["display_name"] for future_param in future_params] == [
+        "LND 2024-03-20",
+        "LND 2024-03-21",
+    ]
+    assert all(future_param["multiplier"] == 6 for future_param in future_params)
+
+
+def test_apply_lme_static_data_plan_futures(mocker):
+    db_session = mocker.MagicMock()
+    db_session.execute.return_value.scalars.return_value.all.return_value = [
+        "xlme-lad-usd f 24-03-21",
+        "xlme-lcu-usd f 24-03-20",
+        "xlme-lcu-usd f 24-03-21",
+    ]
+    plan = contract_db_gen.LMEStaticDataPlan(
+        products_future_params=contract_db_gen.generate_products_future_params(
+            [
+                ("xlme-lad-usd", FUTURE_EXPIRY_DTS),
+                ("xlme-lcu-usd", FUTURE_EXPIRY_DTS),
+                ("xlme-lzh-usd", FUTURE_EXPIRY_DTS),
+            ]
+        ),
+        vol_surface_params=[],
+        option_params=[],
+    )
+
+    product_static_data_counts = contract_db_gen.apply_lme_static_data_plan(
+        plan, db_session
+    )
+
+    assert product_static_data_counts == {
+        "xlme-lad-usd": contract_db_gen.ProductStaticDataCounts(
+            futures_added=1, options_added=0
+        ),
+        "xlme-lcu-usd": contract_db_gen.ProductStaticDataCounts(
+            futures_added=2, options_added=0
+        ),
+        "xlme-lzh-usd": contract_db_gen.ProductStaticDataCounts(
+            futures_added=0, options_added=0
+        ),
+    }
+    # futures, price feeds, then price feed associations
+    assert db_session.execute.call_count == 3
+    futures_insert, price_feeds_insert, price_feed_assocs_insert = [
+        call.args[0].compile() for call in db_session.execute.call_args_list
+    ]
+    assert len(futures_insert.params) == 6 * 6
+    price_feed_ids = {
+        param_value
+        for param_name, param_value in price_feeds_insert.params.items()
+        if param_name.startswith("feed_id")
+    }
+    assert price_feed_ids == {"X.US.LALZ", "X.US.LDKZ", "SPREAD_RELATIVE_TO_3M"}
+    assert len(price_feed_assocs_insert.params) == 3 * 2 * 4
+
+
+def test_apply_lme_static_data_plan_nothing_new(mocker):
+    db_session = mocker.MagicMock()
+    db_session.execute.return_value.scalars.return_value.all.return_value = []
+    plan = contract_db_gen.LMEStaticDataPlan(
+        products_future_params=contract_db_gen.generate_products_future_params(
+            [("xlme-lad-usd", FUTURE_EXPIRY_DTS)]
+        ),
+        vol_surface_params=[],
+        option_params=[],
+    )
+
+    product_static_data_counts = contract_db_gen.apply_lme_static_data_plan(
+        plan, db_session
+    )
+
+    assert product_static_data_counts == {
+        "xlme-lad-usd": contract_db_gen.ProductStaticDataCounts(
+            futures_added=0, options_added=0
+        )
+    }
+    # only the futures insert, nothing to hang price feeds or options off
+    assert db_session.execute.call_count == 1
+
+
+def test_get_existing_contracts(mocker):
+    db_session = mocker.MagicMock()
+    db_session.execute.return_value.tuples.return_value = [
+        (False, "xlme-lad-usd", "xlme-lad-usd f 24-03-20", FUTURE_EXPIRY_DTS[0]),
+        (True, "xlme-lad-usd", "xlme-lad-usd o 24-03-06 a", OPTION_EXPIRY_DTS[0]),
+    ]
+
+    existing_contracts = contract_db_gen.get_existing_contracts(
+        ["xlme-lad-usd"], db_session
+    )
+
+    # futures and options are indexed from a single query
+    assert db_session.execute.call_count == 1
+    assert existing_contracts.future_symbols == {"xlme-lad-usd f 24-03-20"}
+    assert existing_contracts.option_symbols == {"xlme-lad-usd o 24-03-06 a"}
+    assert existing_contracts.option_expiries == {
+        ("xlme-lad-usd", OPTION_EXPIRY_DTS[0])
+    }
+
+
+def test_plan_lme_static_data(mocker):
+    product = upestatic.Product(symbol="xlme-lad-usd", short_name="lad")
+    mocker.patch.object(
+        contract_db_gen,
+        "get_products_contract_expiries",
+        return_value=(
+            [("xlme-lad-usd", FUTURE_EXPIRY_DTS)],
+            [(product, OPTION_SPEC, OPTION_EXPIRY_DTS)],
+        ),
+    )
+    mocker.patch.object(
+        contract_db_gen,
+        "get_existing_contracts",
+        return_value=contract_db_gen.ExistingContracts(
+            future_symbols=frozenset({"xlme-lad-usd f 24-03-20"}),
+            option_symbols=frozenset({"xlme-lad-usd o 24-05-01 a"}),
+            option_expiries=frozenset({("xlme-lad-usd", OPTION_EXPIRY_DTS[0])}),
+        ),
+    )
+
+    plan = contract_db_gen.plan_lme_static_data(mocker.MagicMock())
+
+    assert [
+        future_param["symbol"]
+        for future_param in plan.products_future_params["xlme-lad-usd"]
+    ] == ["xlme-lad-usd f 24-03-21"]
+    assert [option_param["symbol"] for option_param in plan.option_params] == [
+        "xlme-lad-usd o 24-04-03 a"
+    ]
+    assert [
+        vol_surface_param["expiry"] for vol_surface_param in plan.vol_surface_params
+    ] == [OPTION_EXPIRY_DTS[1]]
+    assert plan.get_product_counts() == {
+        "xlme-lad-usd": contract_db_gen.ProductStaticDataCounts(
+            futures_added=1, options_added=1
+        )
+    }
+
+
+def test_update_lme_static_data_dry_run(mocker):
+    pg_session = mocker.MagicMock()
+    mocker.patch.object(
+        contract_db_gen,
+        "plan_lme_static_data",
+        return_value=contract_db_gen.LMEStaticDataPlan(
+            products_future_params={
+                "xlme-lad-usd": contract_db_gen.generate_product_future_params(
+                    FUTURE_EXPIRY_DTS, "xlme-lad-usd"
+                )
+            },
+            vol_surface_params=[],
+            option_params=[],
+        ),
+    )
+
+    product_static_data_counts = contract_db_gen.update_lme_static_data(
+        pg_session, dry_run=True
+    )
+
+    assert product_static_data_counts == {
+        "xlme-lad-usd": contract_db_gen.ProductStaticDataCounts(
+            futures_added=2, options_added=0
+        )
+    }
+    pg_session.execute.assert_not_called()
+
+
+def test_get_products_contract_expiries_leaves_cached_curve(mocker):
+    lme_futures_curve = date_calc_funcs.populate_primary_curve_datetimes(
+        MOCK_HOLIDAY_CALENDAR,
+        MOCK_HOLIDAY_CALENDAR,
+        forward_months=20,
+        _current_datetime=datetime(2024, 3, 20, 12, tzinfo=ZoneInfo("Europe/London")),
+    )
+    lme_futures_curve_cache = mocker.MagicMock()
+    lme_futures_curve_cache.get_primary_curve.return_value = lme_futures_curve
+    mocker.patch.object(
+        date_calc_funcs,
+        "get_lme_futures_curve_cache",
+        return_value=lme_futures_curve_cache,
+    )
+    pg_session = mocker.MagicMock()
+    pg_session.execute.return_value.scalars.return_value = [
+        upestatic.Product(symbol=product_symbol, holidays=MOCK_HOLIDAYS)
+        for product_symbol in lme_option_spec_utils.get_lme_option_spec().products
+    ]
+
+    products_future_expiries, _ = contract_db_gen.get_products_contract_expiries(
+        pg_session
+    )
+
+    # cached curves are shared so must be left as they were
+    assert lme_futures_curve.broken_dates == []
+    broken_date_curve = dataclasses.replace(lme_futures_curve)
+    broken_date_curve.populate_broken_datetimes()
+    assert len(broken_date_curve.broken_dates) > 0
+    assert all(
+        future_expiries == broken_date_curve.gen_prompt_list()
+        for _, future_expiries in products_future_expiries
+    )
+
+
+def test_add_options_to_database(mocker):
+    product = upestatic.Product(symbol="xlme-lad-usd", short_name="lad")
+    db_session = mocker.MagicMock()
+    existing_expiries_result = mocker.MagicMock()
+    existing_expiries_result.tuples.return_value = [
+        ("xlme-lad-usd", OPTION_EXPIRY_DTS[0])
+    ]
+    vol_surfaces_result = mocker.MagicMock()
+    vol_surfaces_result.tuples.return_value = [
+        (12, OPTION_EXPIRY_DTS[2]),
+        (11, OPTION_EXPIRY_DTS[1]),
+    ]
+    options_result = mocker.MagicMock()
+    options_result.scalars.return_value.all.return_value = [
+        "xlme-lad-usd o 24-04-03 a",
+        "xlme-lad-usd o 24-05-01 a",
+    ]
+    db_session.execute.side_effect = [
+        existing_expiries_result,
+        vol_surfaces_result,
+        options_result,
+    ]
+
+    new_option_symbols = contract_db_gen.add_options_to_database(
+        OPTION_EXPIRY_DTS, product, OPTION_SPEC, db_session
+    )
+
+    assert new_option_symbols == [
+        "xlme-lad-usd o 24-04-03 a",
+        "xlme-lad-usd o 24-05-01 a",
+    ]
+    # vol surfaces then options, each option joined to its vol surface by expiry
+    options_insert = db_session.execute.call_args_list[2].args[0].compile()
+    assert options_insert.params["vol_surface_id_m0"] == 11
+    assert options_insert.params["vol_surface_id_m1"] == 12
+    assert options_insert.params["symbol_m0"] == "xlme-lad-usd o 24-04-03 a"
+
+
+def test_insert_options_with_vol_surfaces(mocker):
+    product = upestatic.Product(symbol="xlme-lad-usd", short_name="lad")
+    vol_surface_params, option_params = contract_db_gen.generate_new_option_params(
+        [(product, OPTION_SPEC, OPTION_EXPIRY_DTS[:2])], set()
+    )
+    db_session = mocker.MagicMock()
+    db_session.execute.return_value.tuples.return_value = [
+        ("xlme-lad-usd", "xlme-lad-usd o 24-03-06 a")
+    ]
+
+    assert contract_db_gen.insert_options_with_vol_surfaces(
+        vol_surface_params, option_params, db_session
+    ) == [("xlme-lad-usd", "xlme-lad-usd o 24-03-06 a")]
+
+    # everything is written by the single statement
+    db_session.execute.assert_called_once()
+    insert_options = db_session.execute.call_args.args[0].compile(
+        dialect=postgresql.dialect()
+    )
+    insert_options_sql = " ".join(str(insert_options).split())
+    assert insert_options_sql.startswith("WITH new_options AS (SELECT")
+    # a vol surface id drawn from the sequence for each row of values
+    assert (
+        "nextval(pg_get_serial_sequence(%(pg_get_serial_sequence_1)s, "
+        "%(pg_get_serial_sequence_2)s)) AS vol_surface_id FROM (VALUES ("
+    ) in insert_options_sql
+    assert (
+        "inserted_vol_surfaces AS (INSERT INTO vol_surfaces (vol_surface_id, "
+        "model_type, expiry, params) SELECT new_options.vol_surface_id"
+    ) in insert_options_sql
+    assert "FROM new_options RETURNING vol_surfaces.vol_surface_id)" in (
+        insert_options_sql
+    )
+    # VALUES columns are text in postgres, so enums must be cast back
+    assert "CAST(new_options.time_type AS time_type)" in insert_options_sql
+    assert "CAST(new_options.vol_type AS vol_type)" in insert_options_sql
+    assert "CAST(new_options.expiry AS TIMESTAMP WITH TIME ZONE)" in insert_options_sql
+    # each option is joined to the vol surface inserted for its own row
+    assert insert_options_sql.endswith(
+        "FROM new_options JOIN inserted_vol_surfaces ON "
+        "inserted_vol_surfaces.vol_surface_id = new_options.vol_surface_id "
+        "ON CONFLICT DO NOTHING RETURNING options.product_symbol, options.symbol"
+    )
+
+    assert insert_options.params["pg_get_serial_sequence_1"] == "vol_surfaces"
+    assert insert_options.params["pg_get_serial_sequence_2"] == "vol_surface_id"
+    values_row_params = [
+        insert_options.params[f"param_{param_num}"] for param_num in range(1, 23)
+    ]
+    assert values_row_params[:11] == [
+        "delta_spline_wing",
+        {"50 Delta": 0.2},
+        "xlme-lad-usd o 24-03-06 a",
+        "xlme-lad-usd",
+        "xlme-lad-usd f 24-03-20",
+        [[1200, 25], [5000, -1]],
+        upeenums.TimeType(1),
+        25,
+        upeenums.VolType(1),
+        OPTION_EXPIRY_DTS[0],
+        r"ladoh4 @{strike}£ @{call_or_put}£",
+    ]
+    assert values_row_params[13] == "xlme-lad-usd o 24-04-03 a"
+    assert values_row_params[20] == OPTION_EXPIRY_DTS[1]
+    assert "param_23" not in insert_options.params
+
+
+def test_insert_options_with_vol_surfaces_nothing_new(mocker):
+    db_session = mocker.MagicMock()
+
+    assert contract_db_gen.insert_options_with_vol_surfaces([], [], db_session) == []
+    db_session.execute.assert_not_called()
@@ -1,5 +1,6 @@
 import logging
-from datetime import date, datetime
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List
 
 import pytest
 from dateutil import relativedelta
@@ -61,6 +62,49 @@ MOCK_HOLIDAYS = [
     )
     for str_date, weight_data, closure_data in BASE_HOLIDAY_DATA
 ]
+MOCK_HOLIDAY_CALENDAR = date_calc_funcs.LMEHolidayCalendar(MOCK_HOLIDAYS)
+
+
+def test_lme_holiday_calendar_lookups():
+    assert len(MOCK_HOLIDAY_CALENDAR) == len(BASE_HOLIDAY_DATA)
+    assert MOCK_HOLIDAY_CALENDAR.holiday_dates == sorted(
+        holiday.holiday_date for holiday in MOCK_HOLIDAYS
+    )
+    for holiday in MOCK_HOLIDAYS:
+        assert (
+            MOCK_HOLIDAY_CALENDAR.is_closure_date(holiday.holiday_date)
+            == holiday.is_closure_date
+        )
+        assert (
+            MOCK_HOLIDAY_CALENDAR.is_non_settlement_date(holiday.holiday_date)
+            != holiday.is_closure_date
+        )
+        assert not MOCK_HOLIDAY_CALENDAR.is_settlement_business_day(
+            holiday.holiday_date
+        )
+    # weekend, plain weekday, and dates either side of the holidays held
+    assert not MOCK_HOLIDAY_CALENDAR.is_business_day(date(2024, 3, 30))
+    assert MOCK_HOLIDAY_CALENDAR.is_settlement_business_day(date(2024, 3, 27))
+    assert MOCK_HOLIDAY_CALENDAR.is_settlement_business_day(date(2000, 1, 3))
+    assert MOCK_HOLIDAY_CALENDAR.is_settlement_business_day(date(2100, 1, 4))
+    # US Independence Day, a non-settlement Business Day
+    assert MOCK_HOLIDAY_CALENDAR.is_business_day(date(2024, 7, 4))
+    assert not MOCK_HOLIDAY_CALENDAR.is_settlement_business_day(date(2024, 7, 4))
+
+    assert date_calc_funcs.get_lme_holiday_calendar(MOCK_HOLIDAY_CALENDAR) is (
+        MOCK_HOLIDAY_CALENDAR
+    )
+    assert date_calc_funcs.get_lme_prompt_map(
+        MOCK_HOLIDAY_CALENDAR, _current_datetime=datetime(2024, 3, 20, 12)
+    ) == date_calc_funcs.get_lme_prompt_map(
+        [holiday.holiday_date for holiday in MOCK_HOLIDAYS],
+        _current_datetime=datetime(2024, 3, 20, 12),
+    )
+    assert date_calc_funcs.get_holiday_fingerprint(
+        MOCK_HOLIDAY_CALENDAR, MOCK_HOLIDAY_CALENDAR
+    ) == date_calc_funcs.get_holiday_fingerprint(
+        [holiday.holiday_date for holiday in MOCK_HOLIDAYS], MOCK_HOLIDAYS
+    )
 
 
 @pytest.mark.parametrize(
@@ -145,6 +189,105 @@ def test_lme_prompt_map_has_no_indirect_mappings(test_base_datetime):
     assert not encountered_indirect_mapping
 
 
+def get_rulebook_lme_prompt_map(
+    non_prompts: List[date], current_datetime: datetime
+) -> Dict[date, date]:
+    """Reference day by day walk of the LME rulebook the array backed
+    prompt map is checked against.
+    """
+    prompt_map: Dict[date, date] = {}
+    non_prompts_set = set(non_prompts)
+    offset_1d = timedelta(days=1)
+    next_good_friday_date = date_calc_funcs.get_good_friday_date(current_datetime.year)
+    if current_datetime.date() > next_good_friday_date:
+        next_good_friday_date = date_calc_funcs.get_good_friday_date(
+            current_datetime.year + 1
+        )
+    non_prompts_and_good_friday = non_prompts_set | {next_good_friday_date}
+
+    possible_prompt_to_map = current_datetime.date()
+    end_date = (current_datetime + relativedelta.relativedelta(months=4)).date()
+    while possible_prompt_to_map < end_date:
+        valid_prompt_guess = possible_prompt_to_map
+        if valid_prompt_guess not in non_prompts_set:
+            while (
+                valid_prompt_guess.weekday() == 6
+                or valid_prompt_guess in non_prompts_set
+            ):
+                valid_prompt_guess += offset_1d
+            if valid_prompt_guess.weekday() == 5:
+                if valid_prompt_guess - offset_1d not in non_prompts_and_good_friday:
+                    valid_prompt_guess -= offset_1d
+                else:
+                    while (
+                        valid_prompt_guess.weekday() >= 5
+                        or valid_prompt_guess in non_prompts_set
+                    ):
+                        valid_prompt_guess += offset_1d
+        elif valid_prompt_guess == next_good_friday_date:
+            while valid_prompt_guess in non_prompts_and_good_friday:
+                valid_prompt_guess -= offset_1d
+        elif (
+            valid_prompt_guess.month == 12
+            and valid_prompt_guess.day == 25
+            and valid_prompt_guess.weekday() in (1, 2, 3, 4)
+        ):
+            while valid_prompt_guess in non_prompts_set:
+                valid_prompt_guess -= offset_1d
+        else:
+            while (
+                valid_prompt_guess in non_prompts_set
+                or valid_prompt_guess.weekday() >= 5
+            ):
+                valid_prompt_guess += offset_1d
+
+        prompt_map[possible_prompt_to_map] = valid_prompt_guess
+        possible_prompt_to_map += offset_1d
+
+    return prompt_map
+
+
+@pytest.mark.parametrize(
+    "base_time",
+    [time(0, 0), time(19, 31, tzinfo=ZoneInfo("Europe/London"))],
+)
+def test_lme_prompt_map_matches_rulebook_every_day_2023_through_2025(
+    base_time: time,
+):
+    base_datetime = datetime.combine(date(2023, 1, 1), base_time)
+    mismatched_datetimes = []
+    while base_datetime.year < 2026:
+        lme_prompt_map = date_calc_funcs.get_lme_prompt_map(
+            LME_2023_THROUGH_2025_NON_PROMPTS, _current_datetime=base_datetime
+        )
+        rulebook_prompt_map = get_rulebook_lme_prompt_map(
+            LME_2023_THROUGH_2025_NON_PROMPTS, base_datetime
+        )
+        if list(lme_prompt_map.items()) != list(rulebook_prompt_map.items()):
+            mismatched_datetimes.append(base_datetime)
+        base_datetime += timedelta(days=1)
+
+    assert mismatched_datetimes == []
+
+
+def test_lme_prompt_map_lookups():
+    base_datetime = datetime(2024, 3, 20, 20, tzinfo=ZoneInfo("Europe/London"))
+    lme_prompt_map = date_calc_funcs.LMEPromptMap(
+        LME_2023_THROUGH_2025_NON_PROMPTS, base_datetime
+    )
+
+    assert lme_prompt_map.start_date == date(2024, 3, 20)
+    assert lme_prompt_map.end_date == date(2024, 7, 20)
+    assert len(lme_prompt_map) == 122
+    # Good Friday rolls back to the Thursday before, Easter Monday forward
+    assert lme_prompt_map[date(2024, 3, 29)] == date(2024, 3, 28)
+    assert lme_prompt_map[date(2024, 4, 1)] == date(2024, 4, 2)
+    assert lme_prompt_map[date(2024, 3, 30)] == date(2024, 4, 2)
+    assert lme_prompt_map.get(date(2024, 3, 19)) is None
+    assert lme_prompt_map.get(date(2024, 7, 20)) is None
+    assert datetime(2024, 3, 21) not in lme_prompt_map
+
+
 @pytest.mark.parametrize(
     ["base_datetime", "expected_3m_date"],
     [
@@ -184,6 +327,42 @@ def test_get_3m_date(base_datetime, expected_3m_date):
     assert calculated_3m_date == expected_3m_date
 
 
+def test_get_3m_date_steps_back_more_than_a_day():
+    # guess lands on Easter Sunday, the Saturday before also rolls into April
+    # so the guess has to step back twice
+    base_datetime = datetime(2023, 12, 30, 19, 31, tzinfo=ZoneInfo("Europe/London"))
+    lme_prompt_map = date_calc_funcs.get_lme_prompt_map(
+        LME_2023_THROUGH_2025_NON_PROMPTS, _current_datetime=base_datetime
+    )
+    assert lme_prompt_map[date(2024, 3, 31)] == date(2024, 4, 2)
+    assert lme_prompt_map[date(2024, 3, 30)] == date(2024, 4, 2)
+
+    assert date_calc_funcs.get_3m_datetime(base_datetime, lme_prompt_map) == (
+        datetime(2024, 3, 28, 19, 0, tzinfo=ZoneInfo("Europe/London"))
+    )
+
+
+def test_get_3m_date_gives_up_stepping_back(caplog):
+    base_datetime = datetime(2024, 1, 10, 12, 0, tzinfo=ZoneInfo("Europe/London"))
+    guess_3m_date = date(2024, 4, 10)
+    # every day stepped back to still rolls into May, only as many days as the
+    # limit are mapped so stepping back any further raises a `KeyError`
+    lme_prompt_map = {
+        guess_3m_date - timedelta(days=days_back): date(2024, 5, 1)
+        for days_back in range(11)
+    }
+
+    with caplog.at_level(logging.ERROR):
+        calculated_3m_date = date_calc_funcs.get_3m_datetime(
+            base_datetime, lme_prompt_map
+        )
+
+    assert calculated_3m_date == datetime(
+        2024, 5, 1, 19, 0, tzinfo=ZoneInfo("Europe/London")
+    )
+    assert "stepped back 10 days" in caplog.text
+
+
 @pytest.mark.parametrize(
     ["base_datetime", "expected_date"],
     [
@@ -241,6 +420,10 @@ def test_get_cash_date(base_datetime, expected_date):
     assert (
         date_calc_funcs.get_cash_datetime(base_datetime, MOCK_HOLIDAYS) == expected_date
     )
+    assert (
+        date_calc_funcs.get_cash_datetime(base_datetime, MOCK_HOLIDAY_CALENDAR)
+        == expected_date
+    )
 
 
 @pytest.mark.parametrize(
@@ -296,6 +479,10 @@ def test_get_tom_datetime(base_datetime, expected_datetime):
         date_calc_funcs.get_tom_datetime(base_datetime, MOCK_HOLIDAYS)
         == expected_datetime
     )
+    assert (
+        date_calc_funcs.get_tom_datetime(base_datetime, MOCK_HOLIDAY_CALENDAR)
+        == expected_datetime
+    )
 
 
 @pytest.mark.parametrize(
@@ -385,3 +572,89 @@ def test_get_all_valid_weekly_prompts(base_datetime: datetime):
         5,
         6,
     ), "Weekly prompts run to the six month out"
+
+
+@pytest.mark.parametrize(
+    ["base_datetime", "expected_session_date"],
+    [
+        (
+            datetime(2024, 3, 20, 19, 30, tzinfo=ZoneInfo("Europe/London")),
+            date(2024, 3, 20),
+        ),
+        (
+            datetime(2024, 3, 20, 19, 31, tzinfo=ZoneInfo("Europe/London")),
+            date(2024, 3, 21),
+        ),
+        (datetime(2024, 3, 20, 19, 31, tzinfo=ZoneInfo("UTC")), date(2024, 3, 21)),
+        (datetime(2024, 7, 1, 18, 31, tzinfo=ZoneInfo("UTC")), date(2024, 7, 2)),
+        (datetime(2024, 7, 1, 8), date(2024, 7, 1)),
+    ],
+)
+def test_get_lme_session_date(base_datetime: datetime, expected_session_date: date):
+    assert date_calc_funcs.get_lme_session_date(base_datetime) == expected_session_date
+
+
+def test_get_holiday_fingerprint_ignores_order():
+    assert date_calc_funcs.get_holiday_fingerprint(
+        LME_2023_THROUGH_2025_NON_PROMPTS, MOCK_HOLIDAYS
+    ) == date_calc_funcs.get_holiday_fingerprint(
+        LME_2023_THROUGH_2025_NON_PROMPTS[::-1], MOCK_HOLIDAYS[::-1]
+    )
+    flipped_closure_holidays = [
+        Holiday(
+            holiday_date=holiday.holiday_date,
+            holiday_weight=holiday.holiday_weight,
+            is_closure_date=not holiday.is_closure_date,
+        )
+        for holiday in MOCK_HOLIDAYS
+    ]
+    assert date_calc_funcs.get_holiday_fingerprint(
+        LME_2023_THROUGH_2025_NON_PROMPTS, MOCK_HOLIDAYS
+    ) != date_calc_funcs.get_holiday_fingerprint(
+        LME_2023_THROUGH_2025_NON_PROMPTS, flipped_closure_holidays
+    )
+
+
+def test_lme_futures_curve_cache_reuses_curves_within_session(mocker):
+    populate_spy = mocker.spy(date_calc_funcs, "populate_primary_curve_datetimes")
+    curve_cache = date_calc_funcs.LMEFuturesCurveCache(max_size=2)
+    session_start_dt = datetime(2024, 3, 20, 19, 35, tzinfo=ZoneInfo("Europe/London"))
+
+    first_curve = curve_cache.get_primary_curve(
+        LME_2023_THROUGH_2025_NON_PROMPTS,
+        MOCK_HOLIDAYS,
+        _current_datetime=session_start_dt,
+    )
+    same_session_curve = curve_cache.get_primary_curve(
+        LME_2023_THROUGH_2025_NON_PROMPTS[::-1],
+        MOCK_HOLIDAYS[::-1],
+        _current_datetime=session_start_dt + relativedelta.relativedelta(hours=12),
+    )
+    assert same_session_curve is first_curve
+    assert first_curve == date_calc_funcs.populate_primary_curve_datetimes(
+        LME_2023_THROUGH_2025_NON_PROMPTS,
+        MOCK_HOLIDAYS,
+        _current_datetime=session_start_dt,
+    )
+    assert (curve_cache.hits, curve_cache.misses) == (1, 1)
+
+    next_session_curve = curve_cache.get_primary_curve(
+        LME_2023_THROUGH_2025_NON_PROMPTS,
+        MOCK_HOLIDAYS,
+        _current_datetime=session_start_dt + relativedelta.relativedelta(days=1),
+    )
+    assert next_session_curve is not first_curve
+    curve_cache.get_primary_curve(
+        LME_2023_THROUGH_2025_NON_PROMPTS,
+        MOCK_HOLIDAYS,
+        forward_months=20,
+        _current_datetime=session_start_dt,
+    )
+    # the first curve is least recently used so is evicted
+    curve_cache.get_primary_curve(
+        LME_2023_THROUGH_2025_NON_PROMPTS,
+        MOCK_HOLIDAYS,
+        _current_datetime=session_start_dt,
+    )
+    assert (curve_cache.hits, curve_cache.misses) == (1, 4)
+    assert populate_spy.call_count == 5